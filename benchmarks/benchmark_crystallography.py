@@ -0,0 +1,277 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. py:currentmodule:: benchmark_crystallography
+   :synopsis: Benchmarks of the crystallography hot paths with a regression check.
+
+.. moduleauthor:: Hendrix Demers <hendrix.demers@mail.mcgill.ca>
+
+Benchmarks of the crystallography hot paths with a regression check.
+
+Usage::
+
+    $ python benchmarks/benchmark_crystallography.py --output results.json
+    $ python benchmarks/benchmark_crystallography.py --save-baseline benchmarks/baseline.json
+    $ python benchmarks/benchmark_crystallography.py --baseline benchmarks/baseline.json --threshold 0.25
+
+The results are written as JSON, one record per benchmark with its name, crystal system, batch size, the best time
+per call and the time per computed value. The pairwise benchmarks return (N, M) arrays, they only run up to
+:py:data:`PAIRWISE_MAXIMUM_SIZE` rows with at most :py:data:`PAIRWISE_COLUMNS` columns and the Gram matrix up to
+:py:data:`GRAM_MAXIMUM_SIZE` vectors, so their memory stays bounded at the largest batch sizes.
+
+With ``--baseline``, the script exits with status 1 when a benchmark is slower than the baseline by more than the
+threshold. The baseline depends on the machine, save it on the machine used for the comparison.
+"""
+
+###############################################################################
+# Copyright 2017 Hendrix Demers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###############################################################################
+
+# Standard library modules.
+import argparse
+import json
+import platform
+import sys
+import timeit
+
+# Third party modules.
+import numpy as np
+
+# Local modules.
+
+# Project modules.
+import electrondiffraction.crystallography.crystal_system as crystal_system
+import electrondiffraction.crystallography.direct_metric_tensor as direct_metric_tensor
+import electrondiffraction.crystallography.reciprocal_metric_tensor as reciprocal_metric_tensor
+import electrondiffraction.crystallography.vector as vector
+
+# Globals and constants variables.
+BATCH_SIZES = (1, 10, 100, 1000, 10000, 100000, 1000000)
+DEFAULT_THRESHOLD = 0.25
+DEFAULT_REPEAT = 3
+# Minimum duration of one timing repeat.
+MINIMUM_TIME_s = 0.02
+PAIRWISE_MAXIMUM_SIZE = 10000
+PAIRWISE_COLUMNS = 100
+GRAM_MAXIMUM_SIZE = 1000
+
+CRYSTALS = {
+    "triclinic": lambda: crystal_system.Triclinic(0.5, 0.6, 0.7, 1.2, 1.4, 1.7),
+    "monoclinic": lambda: crystal_system.Monoclinic(0.5, 0.6, 0.7, 1.8),
+    "hexagonal": lambda: crystal_system.Hexagonal(0.3, 0.5),
+    "rhombohedral": lambda: crystal_system.Rhombohedral(0.4, 1.2),
+    "orthorhombic": lambda: crystal_system.Orthorhombic(0.5, 0.6, 0.7),
+    "tetragonal": lambda: crystal_system.Tetragonal(0.5, 1.0),
+    "cubic": lambda: crystal_system.Cubic(0.4),
+}
+
+# Closed form tensor functions and the lattice parameters they take, in the order (a, b, c, alpha, beta, gamma).
+TENSOR_FUNCTIONS = {
+    "triclinic": (direct_metric_tensor.ga_nm2, reciprocal_metric_tensor.gra_1_nm2, (0, 1, 2, 3, 4, 5)),
+    "monoclinic": (direct_metric_tensor.gm_nm2, reciprocal_metric_tensor.grm_1_nm2, (0, 1, 2, 4)),
+    "hexagonal": (direct_metric_tensor.gh_nm2, reciprocal_metric_tensor.grh_1_nm2, (0, 2)),
+    "rhombohedral": (direct_metric_tensor.gr_nm2, reciprocal_metric_tensor.grr_1_nm2, (0, 3)),
+    "orthorhombic": (direct_metric_tensor.go_nm2, reciprocal_metric_tensor.gro_1_nm2, (0, 1, 2)),
+    "tetragonal": (direct_metric_tensor.gt_nm2, reciprocal_metric_tensor.grt_1_nm2, (0, 2)),
+    "cubic": (direct_metric_tensor.gc_nm2, reciprocal_metric_tensor.grc_1_nm2, (0,)),
+}
+
+
+def _scalar_benchmarks(crystal):
+    vector_p = np.array([1.0, 2.0, 0.0])
+    vector_q = np.array([3.0, 1.0, 1.0])
+
+    return {
+        "CrystalSystem.gij_nm2": lambda: crystal.gij_nm2,
+        "CrystalSystem.length_nm": lambda: crystal.length_nm(vector_p),
+        "CrystalSystem.dot_nm2": lambda: crystal.dot_nm2(vector_p, vector_q),
+        "CrystalSystem.angle_deg": lambda: crystal.angle_deg(vector_p, vector_q),
+        "vector.dot_product": lambda: vector.dot_product(crystal, vector_p, vector_q),
+        "vector.distance": lambda: vector.distance(crystal, vector_p, vector_p),
+        "vector.length": lambda: vector.length(crystal, vector_p),
+        "vector.distance_points": lambda: vector.distance_points(crystal, vector_p, vector_q),
+        "vector.angle_rad": lambda: vector.angle_rad(crystal, vector_p, vector_q),
+        "vector.angle2_rad": lambda: vector.angle2_rad(crystal, vector_p, vector_q),
+    }
+
+
+def _batch_benchmarks(crystal, size, random_state):
+    """
+    Batch benchmarks as name: (function, number of computed values).
+    """
+    vectors_p = random_state.uniform(-5.0, 5.0, (size, 3))
+    vectors_q = random_state.uniform(-5.0, 5.0, (size, 3))
+
+    benchmarks = {
+        "vector.dot_products": (lambda: vector.dot_products(crystal, vectors_p, vectors_q), size),
+        "vector.distances": (lambda: vector.distances(crystal, vectors_p, vectors_p), size),
+        "vector.lengths": (lambda: vector.lengths(crystal, vectors_p), size),
+        "vector.distances_points": (lambda: vector.distances_points(crystal, vectors_p, vectors_q), size),
+        "vector.angles_rad": (lambda: vector.angles_rad(crystal, vectors_p, vectors_q), size),
+    }
+
+    if size <= PAIRWISE_MAXIMUM_SIZE:
+        vectors_m = vectors_q[:PAIRWISE_COLUMNS]
+        number_pairs = size * len(vectors_m)
+        benchmarks.update({
+            "vector.dot_products_pairwise": (lambda: vector.dot_products_pairwise(crystal, vectors_p, vectors_m),
+                                             number_pairs),
+            "vector.distances_points_pairwise": (
+                lambda: vector.distances_points_pairwise(crystal, vectors_p, vectors_m), number_pairs),
+            "vector.angles_rad_pairwise": (lambda: vector.angles_rad_pairwise(crystal, vectors_p, vectors_m),
+                                           number_pairs),
+        })
+
+    if size <= GRAM_MAXIMUM_SIZE:
+        benchmarks["vector.gram_matrix"] = (lambda: vector.gram_matrix(crystal, vectors_p), size * size)
+
+    return benchmarks
+
+
+def _tensor_benchmarks(crystal_name, crystal, size, random_state):
+    direct_function, reciprocal_function, parameter_ids = TENSOR_FUNCTIONS[crystal_name]
+    lattice_parameters = (crystal.a_nm, crystal.b_nm, crystal.c_nm, crystal.alpha_rad, crystal.beta_rad,
+                          crystal.gamma_rad)
+    if size == 1:
+        parameters = [lattice_parameters[parameter_id] for parameter_id in parameter_ids]
+    else:
+        parameters = [lattice_parameters[parameter_id] * random_state.uniform(0.99, 1.01, size)
+                      for parameter_id in parameter_ids]
+    all_parameters = [lattice_parameter * np.ones(size) for lattice_parameter in lattice_parameters]
+
+    return {
+        "direct_metric_tensor." + direct_function.__name__: (lambda: direct_function(*parameters), size),
+        "reciprocal_metric_tensor." + reciprocal_function.__name__: (lambda: reciprocal_function(*parameters), size),
+        "reciprocal_metric_tensor.volume_nm3": (lambda: reciprocal_metric_tensor.volume_nm3(*all_parameters), size),
+    }
+
+
+def _time(function, repeat):
+    timer = timeit.Timer(function)
+
+    number = 1
+    while timer.timeit(number) < MINIMUM_TIME_s:
+        number *= 2
+
+    times_s = timer.repeat(repeat=repeat, number=number)
+
+    return min(times_s) / number
+
+
+def run_benchmarks(crystal_names=None, batch_sizes=BATCH_SIZES, repeat=DEFAULT_REPEAT, name_filter=None):
+    """
+    Run the benchmarks and return a list of result records.
+    """
+    if crystal_names is None:
+        crystal_names = sorted(CRYSTALS)
+
+    random_state = np.random.RandomState(20170214)
+    results = []
+
+    def add_results(crystal_name, size, benchmarks):
+        for name, (function, number_items) in sorted(benchmarks.items()):
+            if name_filter is not None and name_filter not in name:
+                continue
+            time_s = _time(function, repeat)
+            results.append({"name": name, "crystal": crystal_name, "size": size, "time_s": time_s,
+                            "items": number_items, "time_per_item_s": time_s / number_items})
+
+    for crystal_name in crystal_names:
+        crystal = CRYSTALS[crystal_name]()
+        scalar_benchmarks = _scalar_benchmarks(crystal)
+        add_results(crystal_name, 1, dict((name, (function, 1)) for name, function in scalar_benchmarks.items()))
+
+        for size in batch_sizes:
+            add_results(crystal_name, size, _batch_benchmarks(crystal, size, random_state))
+            add_results(crystal_name, size, _tensor_benchmarks(crystal_name, crystal, size, random_state))
+
+    return results
+
+
+def _key(result):
+    return result["name"], result["crystal"], result["size"]
+
+
+def compare_results(results, baseline_results, threshold=DEFAULT_THRESHOLD):
+    """
+    Benchmarks slower than the baseline by more than the relative threshold, as (result, ratio) pairs.
+    """
+    baseline_times_s = dict((_key(result), result["time_s"]) for result in baseline_results)
+
+    regressions = []
+    for result in results:
+        baseline_time_s = baseline_times_s.get(_key(result))
+        if baseline_time_s is None or baseline_time_s <= 0.0:
+            continue
+
+        ratio = result["time_s"] / baseline_time_s
+        if ratio > 1.0 + threshold:
+            regressions.append((result, ratio))
+
+    return regressions
+
+
+def _write_json(file_path, results):
+    document = {"python": platform.python_version(), "numpy": np.__version__, "machine": platform.machine(),
+                "results": results}
+    with open(file_path, "w") as json_file:
+        json.dump(document, json_file, indent=2, sort_keys=True)
+
+
+def _read_json(file_path):
+    with open(file_path) as json_file:
+        return json.load(json_file)["results"]
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description="Benchmark the crystallography hot paths.")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare the results to this JSON file")
+    parser.add_argument("--save-baseline", help="write the results as a new baseline JSON file")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="relative slowdown above which a benchmark fails (default %(default)s)")
+    parser.add_argument("--crystal", action="append", choices=sorted(CRYSTALS),
+                        help="crystal system to benchmark, can be repeated (default all)")
+    parser.add_argument("--max-size", type=int, default=BATCH_SIZES[-1],
+                        help="largest batch size (default %(default)s)")
+    parser.add_argument("--filter", help="only run the benchmarks with this text in their name")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT,
+                        help="number of timing repeats, the best is kept (default %(default)s)")
+    options = parser.parse_args(arguments)
+
+    batch_sizes = [size for size in BATCH_SIZES if size <= options.max_size]
+    results = run_benchmarks(options.crystal, batch_sizes, options.repeat, options.filter)
+
+    for result in results:
+        print("{name:40s} {crystal:12s} {size:>8d} {time_s:12.3e} s".format(**result))
+
+    if options.output:
+        _write_json(options.output, results)
+    if options.save_baseline:
+        _write_json(options.save_baseline, results)
+
+    if options.baseline:
+        regressions = compare_results(results, _read_json(options.baseline), options.threshold)
+        for result, ratio in regressions:
+            print("Slower than baseline by {:.0%}: {name} {crystal} {size}".format(ratio - 1.0, **result))
+        if regressions:
+            return 1
+
+    return 0
+
+
+if __name__ == '__main__':  # pragma: no cover
+    sys.exit(main())
@@ -8,6 +8,10 @@
 .. moduleauthor:: Hendrix Demers <hendrix.demers@mail.mcgill.ca>
 
 Crystallographic seven crystal systems.
+
+The lattice parameters tied by a crystal system, for example a, b and c of a cubic crystal, always keep the same
+value: setting one of them sets the others. The closed form reciprocal metric tensor of a system is used while its
+fixed angles keep their values, the general triclinic form is used when a fixed angle is modified.
 """
 
 ###############################################################################
@@ -28,6 +32,8 @@ Crystallographic seven crystal systems.
 
 # Standard library modules.
 from math import pi
+import math
+import time
 
 # Third party modules.
 import numpy as np
@@ -35,37 +41,196 @@ import numpy as np
 # Local modules.
 
 # Project modules.
+import electrondiffraction.crystallography.reciprocal_metric_tensor as reciprocal_metric_tensor
+import electrondiffraction.crystallography.vector as _vector
+import electrondiffraction.instrumentation as instrumentation
 
 # Globals and constants variables.
 
 
 class LatticeParameters(object):
-    a_nm = None
-    b_nm = None
-    c_nm = None
-    alpha_rad = None
-    beta_rad = None
-    gamma_rad = None
+    """
+    Immutable lattice parameters, usable as a dictionary or cache key.
+
+    Two instances are equal, and have the same hash, when their lengths round to the same multiple of
+    :py:attr:`LENGTH_TOLERANCE_NM` and their angles to the same multiple of :py:attr:`ANGLE_TOLERANCE_RAD`.
+    """
+    __slots__ = ("a_nm", "b_nm", "c_nm", "alpha_rad", "beta_rad", "gamma_rad", "key")
+
+    LENGTH_TOLERANCE_NM = 1.0e-7
+    ANGLE_TOLERANCE_RAD = 1.0e-8
+
+    def __init__(self, a_nm, b_nm, c_nm, alpha_rad, beta_rad, gamma_rad):
+        values = (float(a_nm), float(b_nm), float(c_nm), float(alpha_rad), float(beta_rad), float(gamma_rad))
+        for name, value in zip(self.__slots__, values):
+            object.__setattr__(self, name, value)
+
+        key = tuple(int(round(value / self.LENGTH_TOLERANCE_NM)) for value in values[:3]) + \
+            tuple(int(round(value / self.ANGLE_TOLERANCE_RAD)) for value in values[3:])
+        object.__setattr__(self, "key", key)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("LatticeParameters is immutable, use replace()")
+
+    def __delattr__(self, name):
+        raise AttributeError("LatticeParameters is immutable")
+
+    def __reduce__(self):
+        return LatticeParameters, self.astuple()
+
+    def __eq__(self, other):
+        if not isinstance(other, LatticeParameters):
+            return NotImplemented
+        return self.key == other.key
+
+    def __ne__(self, other):
+        is_equal = self.__eq__(other)
+        if is_equal is NotImplemented:
+            return is_equal
+        return not is_equal
+
+    def __hash__(self):
+        return hash(self.key)
+
+    def __repr__(self):
+        return "LatticeParameters(a_nm={!r}, b_nm={!r}, c_nm={!r}, alpha_rad={!r}, beta_rad={!r}, " \
+               "gamma_rad={!r})".format(*self.astuple())
+
+    def astuple(self):
+        return self.a_nm, self.b_nm, self.c_nm, self.alpha_rad, self.beta_rad, self.gamma_rad
+
+    def replace(self, **values):
+        """
+        New lattice parameters with some values replaced.
+        """
+        parameters = dict(zip(self.__slots__, self.astuple()))
+        parameters.update(values)
+
+        return LatticeParameters(**parameters)
+
+
+def _lattice_parameter(name):
+    """
+    Create a lattice parameter property that invalidates the cached tensors when its value changes.
+    """
+    def getter(self):
+        return getattr(self._lattice_parameters, name)
+
+    def setter(self, value):
+        self.update_lattice_parameters(**{name: value})
+
+    return property(getter, setter)
 
 
 class CrystalSystem(object):
-    a_nm = None
-    b_nm = None
-    c_nm = None
-    alpha_rad = None
-    beta_rad = None
-    gamma_rad = None
+    __slots__ = ("_lattice_parameters", "_cache")
 
     name = None
     symbol = None
 
-    def __init__(self, a_nm, b_nm, c_nm, alpha_rad, beta_rad, gamma_rad):
-        self.a_nm = a_nm
-        self.b_nm = b_nm
-        self.c_nm = c_nm
-        self.alpha_rad = alpha_rad
-        self.beta_rad = beta_rad
-        self.gamma_rad = gamma_rad
+    # Groups of lattice parameters with the same value and lattice parameters with a fixed value in the system.
+    tied_parameters = ()
+    fixed_parameters = ()
+
+    a_nm = _lattice_parameter("a_nm")
+    b_nm = _lattice_parameter("b_nm")
+    c_nm = _lattice_parameter("c_nm")
+    alpha_rad = _lattice_parameter("alpha_rad")
+    beta_rad = _lattice_parameter("beta_rad")
+    gamma_rad = _lattice_parameter("gamma_rad")
+
+    def __init__(self, a_nm, b_nm=None, c_nm=None, alpha_rad=None, beta_rad=None, gamma_rad=None):
+        """
+        Create a crystal system from its six lattice parameters or from a :py:class:`LatticeParameters`.
+        """
+        self._cache = {}
+        if isinstance(a_nm, LatticeParameters):
+            self._lattice_parameters = a_nm
+        else:
+            self._lattice_parameters = LatticeParameters(a_nm, b_nm, c_nm, alpha_rad, beta_rad, gamma_rad)
+
+    @classmethod
+    def from_lattice_parameters(cls, lattice_parameters):
+        """
+        Create a crystal system of this class without going through the constructor of the subclass.
+        """
+        cls._check_tied_parameters(lattice_parameters)
+
+        crystal = cls.__new__(cls)
+        CrystalSystem.__init__(crystal, lattice_parameters)
+
+        return crystal
+
+    @classmethod
+    def _check_tied_parameters(cls, lattice_parameters):
+        for names in cls.tied_parameters:
+            values = [getattr(lattice_parameters, name) for name in names]
+            tolerance = LatticeParameters.LENGTH_TOLERANCE_NM if names[0].endswith("_nm") else \
+                LatticeParameters.ANGLE_TOLERANCE_RAD
+            if max(values) - min(values) > tolerance:
+                raise ValueError("The lattice parameters {} of a {} crystal must be equal, got {}".format(
+                    ", ".join(names), cls.name, lattice_parameters))
+
+    def _has_fixed_parameters(self):
+        lattice_parameters = self._lattice_parameters
+        return all(abs(getattr(lattice_parameters, name) - value) <= LatticeParameters.ANGLE_TOLERANCE_RAD
+                   for name, value in self.fixed_parameters)
+
+    def __getstate__(self):
+        return self._lattice_parameters
+
+    def __setstate__(self, state):
+        self._lattice_parameters = state
+        self._cache = {}
+
+    @property
+    def lattice_parameters(self):
+        return self._lattice_parameters
+
+    @lattice_parameters.setter
+    def lattice_parameters(self, lattice_parameters):
+        self._check_tied_parameters(lattice_parameters)
+        if lattice_parameters.astuple() != self._lattice_parameters.astuple():
+            self._lattice_parameters = lattice_parameters
+            self._invalidate_cache()
+
+    def update_lattice_parameters(self, a_nm=None, b_nm=None, c_nm=None, alpha_rad=None, beta_rad=None,
+                                  gamma_rad=None):
+        """
+        Update several lattice parameters at once, the cached tensors are invalidated only once.
+
+        Parameters left to ``None`` are not modified, the parameters tied to a modified parameter take its value.
+        """
+        values = {"a_nm": a_nm, "b_nm": b_nm, "c_nm": c_nm,
+                  "alpha_rad": alpha_rad, "beta_rad": beta_rad, "gamma_rad": gamma_rad}
+        values = dict((name, value) for name, value in values.items() if value is not None)
+
+        for names in self.tied_parameters:
+            for name in names:
+                if name in values:
+                    values.update((tied_name, values.get(tied_name, values[name])) for tied_name in names)
+                    break
+
+        self.lattice_parameters = self._lattice_parameters.replace(**values)
+
+    def _invalidate_cache(self):
+        self._cache.clear()
+
+    def _get_cached(self, key, compute):
+        try:
+            return self._cache[key]
+        except KeyError:
+            if instrumentation.is_enabled():
+                start_s = time.perf_counter()
+                value = compute()
+                instrumentation.record(self, "CrystalSystem." + key, instrumentation.CATEGORY_TENSOR,
+                                       time.perf_counter() - start_s)
+            else:
+                value = compute()
+            if isinstance(value, np.ndarray):
+                value.flags.writeable = False
+            self._cache[key] = value
+            return value
 
     def _compute_direct_metric_tensor(self):
         g_ij_nm2 = np.zeros((3, 3))
@@ -80,63 +245,263 @@ class CrystalSystem(object):
 
         return g_ij_nm2
 
+    def _compute_reciprocal_metric_tensor(self):
+        if self._has_fixed_parameters():
+            return self._compute_system_reciprocal_metric_tensor()
+
+        return reciprocal_metric_tensor.gra_1_nm2(self.a_nm, self.b_nm, self.c_nm,
+                                                  self.alpha_rad, self.beta_rad, self.gamma_rad)
+
+    def _compute_system_reciprocal_metric_tensor(self):
+        return reciprocal_metric_tensor.gra_1_nm2(self.a_nm, self.b_nm, self.c_nm,
+                                                  self.alpha_rad, self.beta_rad, self.gamma_rad)
+
+    def _compute_volume_nm3(self):
+        return reciprocal_metric_tensor.volume_nm3(self.a_nm, self.b_nm, self.c_nm,
+                                                   self.alpha_rad, self.beta_rad, self.gamma_rad)
+
+    def _compute_direct_structure_matrix(self):
+        # Cartesian frame with a along x and b in the xy plane, the columns are the direct basis vectors.
+        cos_alpha = np.cos(self.alpha_rad)
+        cos_beta = np.cos(self.beta_rad)
+        cos_gamma = np.cos(self.gamma_rad)
+        sin_gamma = np.sin(self.gamma_rad)
+
+        a_nm = np.zeros((3, 3))
+        a_nm[0, 0] = self.a_nm
+        a_nm[0, 1] = self.b_nm * cos_gamma
+        a_nm[1, 1] = self.b_nm * sin_gamma
+        a_nm[0, 2] = self.c_nm * cos_beta
+        a_nm[1, 2] = self.c_nm * (cos_alpha - cos_beta * cos_gamma) / sin_gamma
+        a_nm[2, 2] = self.volume_nm3 / (self.a_nm * self.b_nm * sin_gamma)
+
+        return a_nm
+
+    def _compute_reciprocal_structure_matrix(self):
+        return np.linalg.inv(self.direct_structure_matrix_nm).T
+
+    def _compute_reciprocal_lattice_parameters(self):
+        g_star_1_nm2 = self.g_star_1_nm2
+
+        a_star_1_nm = np.sqrt(g_star_1_nm2[0, 0])
+        b_star_1_nm = np.sqrt(g_star_1_nm2[1, 1])
+        c_star_1_nm = np.sqrt(g_star_1_nm2[2, 2])
+        alpha_star_rad = np.arccos(g_star_1_nm2[1, 2] / (b_star_1_nm * c_star_1_nm))
+        beta_star_rad = np.arccos(g_star_1_nm2[0, 2] / (a_star_1_nm * c_star_1_nm))
+        gamma_star_rad = np.arccos(g_star_1_nm2[0, 1] / (a_star_1_nm * b_star_1_nm))
+
+        return a_star_1_nm, b_star_1_nm, c_star_1_nm, alpha_star_rad, beta_star_rad, gamma_star_rad
+
+    @instrumentation.instrumented(instrumentation.CATEGORY_VECTOR)
     def length_nm(self, vector):
-        value = np.sqrt(self.dot_nm2(vector, vector))
+        value = _vector._sqrt(self.dot_nm2(vector, vector))
 
         return value
 
+    @instrumentation.instrumented(instrumentation.CATEGORY_VECTOR)
     def dot_nm2(self, vector1, vector2):
+        value = _vector._dot_product_scalar(self, vector1, vector2)
+        if value is not None:
+            return value
+
         p = np.array(vector1)
         q = np.array(vector2)
         value = np.dot(p.T, np.dot(self.gij_nm2, q))
 
         return value
 
+    @instrumentation.instrumented(instrumentation.CATEGORY_ANGLE)
     def angle_deg(self, vector1, vector2):
         nominator = self.dot_nm2(vector1, vector2)
         denominator = self.length_nm(vector1) * self.length_nm(vector2)
-        theta_rad = np.arccos(nominator/denominator)
+        theta_rad = _vector._arccos(nominator/denominator)
+        if type(theta_rad) is float:
+            return math.degrees(theta_rad)
         theta_deg = np.degrees(theta_rad)
 
         return theta_deg
 
     @property
     def gij_nm2(self):
-        return self._compute_direct_metric_tensor()
+        """
+        Direct metric tensor, computed once and cached read-only until a lattice parameter changes.
+        """
+        return self._get_cached("gij_nm2", self._compute_direct_metric_tensor)
+
+    @property
+    def gij_components_nm2(self):
+        """
+        Independent components (g11, g22, g33, g12, g13, g23) of :py:attr:`gij_nm2` as Python floats, used by the
+        scalar fast path of single 3-vector operations.
+        """
+        try:
+            return self._cache["gij_components_nm2"]
+        except KeyError:
+            g_ij_nm2 = self.gij_nm2
+            components = (float(g_ij_nm2[0, 0]), float(g_ij_nm2[1, 1]), float(g_ij_nm2[2, 2]),
+                          float(g_ij_nm2[0, 1]), float(g_ij_nm2[0, 2]), float(g_ij_nm2[1, 2]))
+            self._cache["gij_components_nm2"] = components
+            return components
+
+    @property
+    def g_star_1_nm2(self):
+        """
+        Reciprocal metric tensor from the closed form of the crystal system, cached like :py:attr:`gij_nm2`.
+        """
+        return self._get_cached("g_star_1_nm2", self._compute_reciprocal_metric_tensor)
+
+    @property
+    def volume_nm3(self):
+        return self._get_cached("volume_nm3", self._compute_volume_nm3)
+
+    @property
+    def direct_structure_matrix_nm(self):
+        """
+        Direct structure matrix :math:`A`, :math:`A^T A = g`, converting fractional coordinates to Cartesian
+        coordinates.
+
+        The Cartesian frame has a along x and b in the xy plane, the columns are the direct basis vectors.
+        """
+        return self._get_cached("direct_structure_matrix_nm", self._compute_direct_structure_matrix)
+
+    @property
+    def reciprocal_structure_matrix_1_nm(self):
+        """
+        Reciprocal structure matrix :math:`B = (A^{-1})^T`, :math:`B^T B = g^*`, converting Miller indices to Cartesian
+        reciprocal vectors in the same frame as :py:attr:`direct_structure_matrix_nm`.
+        """
+        return self._get_cached("reciprocal_structure_matrix_1_nm", self._compute_reciprocal_structure_matrix)
+
+    @property
+    def reciprocal_lattice_parameters(self):
+        """
+        Reciprocal lattice parameters (a*, b*, c*, alpha*, beta*, gamma*) in 1/nm and radians.
+        """
+        return self._get_cached("reciprocal_lattice_parameters", self._compute_reciprocal_lattice_parameters)
+
+    @property
+    def a_star_1_nm(self):
+        return self.reciprocal_lattice_parameters[0]
+
+    @property
+    def b_star_1_nm(self):
+        return self.reciprocal_lattice_parameters[1]
+
+    @property
+    def c_star_1_nm(self):
+        return self.reciprocal_lattice_parameters[2]
+
+    @property
+    def alpha_star_rad(self):
+        return self.reciprocal_lattice_parameters[3]
+
+    @property
+    def beta_star_rad(self):
+        return self.reciprocal_lattice_parameters[4]
+
+    @property
+    def gamma_star_rad(self):
+        return self.reciprocal_lattice_parameters[5]
 
 
 class Triclinic(CrystalSystem):
+    __slots__ = ()
+
+    name = "triclinic"
+    symbol = "a"
+
     def __init__(self, a_nm, b_nm, c_nm, alpha_rad, beta_rad, gamma_rad):
         super().__init__(a_nm, b_nm, c_nm, alpha_rad, beta_rad, gamma_rad)
-        self.name = "triclinic"
-        self.symbol = "a"
 
 
 class Monoclinic(CrystalSystem):
+    __slots__ = ()
+
+    name = "monoclinic"
+    symbol = "m"
+
+    fixed_parameters = (("alpha_rad", pi/2.0), ("gamma_rad", pi/2.0))
+
     def __init__(self, a_nm, b_nm, c_nm, beta_rad):
         super().__init__(a_nm, b_nm, c_nm, pi/2.0, beta_rad, pi/2.0)
 
+    def _compute_system_reciprocal_metric_tensor(self):
+        return reciprocal_metric_tensor.grm_1_nm2(self.a_nm, self.b_nm, self.c_nm, self.beta_rad)
+
 
 class Hexagonal(CrystalSystem):
+    __slots__ = ()
+
+    name = "hexagonal"
+    symbol = "h"
+
+    tied_parameters = (("a_nm", "b_nm"),)
+    fixed_parameters = (("alpha_rad", pi/2.0), ("beta_rad", pi/2.0), ("gamma_rad", 2.0*pi/3.0))
+
     def __init__(self, a_nm, c_nm):
         super().__init__(a_nm, a_nm, c_nm, pi/2.0, pi/2.0, 2.0*pi/3.0)
 
+    def _compute_system_reciprocal_metric_tensor(self):
+        return reciprocal_metric_tensor.grh_1_nm2(self.a_nm, self.c_nm)
+
 
 class Rhombohedral(CrystalSystem):
+    __slots__ = ()
+
+    name = "rhombohedral"
+    symbol = "h"
+
+    tied_parameters = (("a_nm", "b_nm", "c_nm"), ("alpha_rad", "beta_rad", "gamma_rad"))
+
     def __init__(self, a_nm, alpha_rad):
         super().__init__(a_nm, a_nm, a_nm, alpha_rad, alpha_rad, alpha_rad)
 
+    def _compute_system_reciprocal_metric_tensor(self):
+        return reciprocal_metric_tensor.grr_1_nm2(self.a_nm, self.alpha_rad)
+
 
 class Orthorhombic(CrystalSystem):
+    __slots__ = ()
+
+    name = "orthorhombic"
+    symbol = "o"
+
+    fixed_parameters = (("alpha_rad", pi/2.0), ("beta_rad", pi/2.0), ("gamma_rad", pi/2.0))
+
     def __init__(self, a_nm, b_nm, c_nm):
         super().__init__(a_nm, b_nm, c_nm, pi/2.0, pi/2.0, pi/2.0)
 
+    def _compute_system_reciprocal_metric_tensor(self):
+        return reciprocal_metric_tensor.gro_1_nm2(self.a_nm, self.b_nm, self.c_nm)
+
 
 class Tetragonal(CrystalSystem):
+    __slots__ = ()
+
+    name = "tetragonal"
+    symbol = "t"
+
+    tied_parameters = (("a_nm", "b_nm"),)
+    fixed_parameters = (("alpha_rad", pi/2.0), ("beta_rad", pi/2.0), ("gamma_rad", pi/2.0))
+
     def __init__(self, a_nm, c_nm):
         super().__init__(a_nm, a_nm, c_nm, pi/2.0, pi/2.0, pi/2.0)
 
+    def _compute_system_reciprocal_metric_tensor(self):
+        return reciprocal_metric_tensor.grt_1_nm2(self.a_nm, self.c_nm)
+
 
 class Cubic(CrystalSystem):
+    __slots__ = ()
+
+    name = "cubic"
+    symbol = "c"
+
+    tied_parameters = (("a_nm", "b_nm", "c_nm"),)
+    fixed_parameters = (("alpha_rad", pi/2.0), ("beta_rad", pi/2.0), ("gamma_rad", pi/2.0))
+
     def __init__(self, a_nm):
         super().__init__(a_nm, a_nm, a_nm, pi/2.0, pi/2.0, pi/2.0)
+
+    def _compute_system_reciprocal_metric_tensor(self):
+        return reciprocal_metric_tensor.grc_1_nm2(self.a_nm)
@@ -0,0 +1,167 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. py:currentmodule:: d_spacing
+   :synopsis: Vectorized interplanar spacings and reciprocal vector lengths.
+
+.. moduleauthor:: Hendrix Demers <hendrix.demers@mail.mcgill.ca>
+
+Vectorized interplanar spacings and reciprocal vector lengths.
+
+The length of the reciprocal lattice vector :math:`g = h a^* + k b^* + l c^*` is computed with the reciprocal metric
+tensor, :math:`|g|^2 = h_i g^*_{ij} h_j`, and the interplanar spacing is :math:`d_{hkl} = 1 / |g|`.
+"""
+
+###############################################################################
+# Copyright 2017 Hendrix Demers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###############################################################################
+
+# Standard library modules.
+
+# Third party modules.
+import numpy as np
+
+# Local modules.
+
+# Project modules.
+
+# Globals and constants variables.
+DEFAULT_TOLERANCE_NM = 1.0e-6
+RELATIVE_TOLERANCE = 1.0e-9
+
+
+class DSpacingTable(object):
+    """
+    Interplanar spacings of an array of reflections.
+
+    The reflections keep the input order, :py:attr:`order` sorts them by decreasing d-spacing and
+    :py:attr:`family_ids` groups reflections with the same d-spacing, within the tolerance, into families numbered
+    by decreasing d-spacing.
+    """
+    def __init__(self, hkls, g_1_nm, d_nm, order, family_ids, family_d_nm):
+        self.hkls = hkls
+        self.g_1_nm = g_1_nm
+        self.d_nm = d_nm
+        self.order = order
+        self.family_ids = family_ids
+        self.family_d_nm = family_d_nm
+
+    def __len__(self):
+        return len(self.d_nm)
+
+    @property
+    def number_families(self):
+        return len(self.family_d_nm)
+
+    @property
+    def multiplicities(self):
+        """
+        Number of reflections in each family.
+        """
+        return np.bincount(self.family_ids, minlength=self.number_families)
+
+    def family(self, family_id):
+        """
+        Indices of the reflections of one family.
+        """
+        return np.flatnonzero(self.family_ids == family_id)
+
+
+def g_lengths_1_nm(crystal, hkls):
+    """
+    Length of the reciprocal lattice vectors of a (N, 3) array of Miller indices.
+    """
+    hkls = np.asarray(hkls, dtype=float)
+
+    g2_1_nm2 = np.einsum("...i,...i->...", np.dot(hkls, crystal.g_star_1_nm2), hkls)
+
+    return np.sqrt(np.maximum(g2_1_nm2, 0.0))
+
+
+def d_spacings_nm(crystal, hkls):
+    """
+    Interplanar spacings of a (N, 3) array of Miller indices, the (000) reflection gives ``inf``.
+    """
+    g_1_nm = g_lengths_1_nm(crystal, hkls)
+
+    with np.errstate(divide="ignore"):
+        d_nm = 1.0 / g_1_nm
+
+    return d_nm
+
+
+def hkl_bounds(crystal, g_max_1_nm):
+    """
+    Largest absolute value of each Miller index for a reflection inside the sphere :math:`|g| \\leq g_{max}`.
+
+    The extent of the ellipsoid :math:`h_i g^*_{ij} h_j \\leq g_{max}^2` along index :math:`i` is
+    :math:`g_{max} \\sqrt{g_{ii}}`, with :math:`g_{ij}` the direct metric tensor.
+    """
+    extents = g_max_1_nm * np.sqrt(np.diag(crystal.gij_nm2))
+
+    return np.floor(extents * (1.0 + RELATIVE_TOLERANCE)).astype(int)
+
+
+def hkl_grid(crystal, g_max_1_nm):
+    """
+    All the Miller indices, except (000), with :math:`|g| \\leq g_{max}` as a (N, 3) integer array.
+    """
+    h_max, k_max, l_max = hkl_bounds(crystal, g_max_1_nm)
+
+    hs, ks, ls = np.meshgrid(np.arange(-h_max, h_max + 1), np.arange(-k_max, k_max + 1),
+                             np.arange(-l_max, l_max + 1), indexing="ij")
+    hkls = np.stack([hs.ravel(), ks.ravel(), ls.ravel()], axis=-1)
+
+    g_1_nm = g_lengths_1_nm(crystal, hkls)
+    mask = (g_1_nm <= g_max_1_nm * (1.0 + RELATIVE_TOLERANCE)) & np.any(hkls != 0, axis=-1)
+
+    return hkls[mask]
+
+
+def compute_d_spacings(crystal, hkls=None, g_max_1_nm=None, tolerance_nm=DEFAULT_TOLERANCE_NM):
+    """
+    Compute the :py:class:`DSpacingTable` of a crystal.
+
+    Either the (N, 3) array of Miller indices ``hkls`` or the reciprocal vector cutoff ``g_max_1_nm`` is given.
+    """
+    if (hkls is None) == (g_max_1_nm is None):
+        raise ValueError("Give either hkls or g_max_1_nm")
+
+    if hkls is None:
+        hkls = hkl_grid(crystal, g_max_1_nm)
+    else:
+        hkls = np.asarray(hkls)
+        if hkls.ndim != 2 or hkls.shape[1] != 3:
+            raise ValueError("hkls must be a (N, 3) array, got shape {}".format(hkls.shape))
+
+    g_1_nm = g_lengths_1_nm(crystal, hkls)
+    with np.errstate(divide="ignore"):
+        d_nm = 1.0 / g_1_nm
+
+    order = np.argsort(-d_nm, kind="stable")
+
+    family_ids = np.empty(len(d_nm), dtype=int)
+    if len(d_nm) > 0:
+        sorted_d_nm = d_nm[order]
+        is_new_family = np.empty(len(d_nm), dtype=bool)
+        is_new_family[0] = True
+        is_new_family[1:] = (sorted_d_nm[:-1] - sorted_d_nm[1:]) > tolerance_nm
+        family_ids[order] = np.cumsum(is_new_family) - 1
+        family_d_nm = sorted_d_nm[is_new_family]
+    else:
+        family_d_nm = np.empty(0)
+
+    return DSpacingTable(hkls, g_1_nm, d_nm, order, family_ids, family_d_nm)
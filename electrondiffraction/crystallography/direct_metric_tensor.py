@@ -8,6 +8,9 @@
 .. moduleauthor:: Hendrix Demers <hendrix.demers@mail.mcgill.ca>
 
 Equations to compute the direct metric tensor for each crystal system.
+
+The lattice parameters can be scalars or arrays, arrays are broadcast against each other and a stack of tensors
+with shape (..., 3, 3) is returned.
 """
 
 ###############################################################################
@@ -38,87 +41,127 @@ import numpy as np
 # Globals and constants variables.
 
 
+def _create_tensor(*parameters):
+    parameters = np.broadcast_arrays(*[np.asarray(parameter, dtype=float) for parameter in parameters])
+    tensor = np.zeros(parameters[0].shape + (3, 3))
+
+    return (tensor,) + tuple(parameters)
+
+
 def gc_nm2(a_nm):
-    tensor_nm2 = np.zeros((3, 3))
+    tensor_nm2, a_nm = _create_tensor(a_nm)
 
-    tensor_nm2[0, 0] = a_nm * a_nm
-    tensor_nm2[1, 1] = a_nm * a_nm
-    tensor_nm2[2, 2] = a_nm * a_nm
+    tensor_nm2[..., 0, 0] = a_nm * a_nm
+    tensor_nm2[..., 1, 1] = a_nm * a_nm
+    tensor_nm2[..., 2, 2] = a_nm * a_nm
 
     return tensor_nm2
 
 
 def gt_nm2(a_nm, c_nm):
-    tensor_nm2 = np.zeros((3, 3))
+    tensor_nm2, a_nm, c_nm = _create_tensor(a_nm, c_nm)
 
-    tensor_nm2[0, 0] = a_nm * a_nm
-    tensor_nm2[1, 1] = a_nm * a_nm
-    tensor_nm2[2, 2] = c_nm * c_nm
+    tensor_nm2[..., 0, 0] = a_nm * a_nm
+    tensor_nm2[..., 1, 1] = a_nm * a_nm
+    tensor_nm2[..., 2, 2] = c_nm * c_nm
 
     return tensor_nm2
 
 
 def go_nm2(a_nm, b_nm, c_nm):
-    tensor_nm2 = np.zeros((3, 3))
+    tensor_nm2, a_nm, b_nm, c_nm = _create_tensor(a_nm, b_nm, c_nm)
 
-    tensor_nm2[0, 0] = a_nm * a_nm
-    tensor_nm2[1, 1] = b_nm * b_nm
-    tensor_nm2[2, 2] = c_nm * c_nm
+    tensor_nm2[..., 0, 0] = a_nm * a_nm
+    tensor_nm2[..., 1, 1] = b_nm * b_nm
+    tensor_nm2[..., 2, 2] = c_nm * c_nm
 
     return tensor_nm2
 
 
 def gh_nm2(a_nm, c_nm):
-    tensor_nm2 = np.zeros((3, 3))
+    tensor_nm2, a_nm, c_nm = _create_tensor(a_nm, c_nm)
 
-    tensor_nm2[0, 0] = a_nm * a_nm
-    tensor_nm2[1, 1] = a_nm * a_nm
-    tensor_nm2[2, 2] = c_nm * c_nm
-    tensor_nm2[0, 1] = -a_nm * a_nm / 2.0
-    tensor_nm2[1, 0] = -a_nm * a_nm / 2.0
+    tensor_nm2[..., 0, 0] = a_nm * a_nm
+    tensor_nm2[..., 1, 1] = a_nm * a_nm
+    tensor_nm2[..., 2, 2] = c_nm * c_nm
+    tensor_nm2[..., 0, 1] = -a_nm * a_nm / 2.0
+    tensor_nm2[..., 1, 0] = -a_nm * a_nm / 2.0
 
     return tensor_nm2
 
 
 def gr_nm2(a_nm, alpha_rad):
-    tensor_nm2 = np.zeros((3, 3))
+    tensor_nm2, a_nm, alpha_rad = _create_tensor(a_nm, alpha_rad)
     cos_alpha = np.cos(alpha_rad)
 
-    tensor_nm2[0, 0] = a_nm * a_nm
-    tensor_nm2[0, 1] = a_nm * a_nm * cos_alpha
-    tensor_nm2[0, 2] = a_nm * a_nm * cos_alpha
-    tensor_nm2[1, 0] = a_nm * a_nm * cos_alpha
-    tensor_nm2[1, 1] = a_nm * a_nm
-    tensor_nm2[1, 2] = a_nm * a_nm * cos_alpha
-    tensor_nm2[2, 0] = a_nm * a_nm * cos_alpha
-    tensor_nm2[2, 1] = a_nm * a_nm * cos_alpha
-    tensor_nm2[2, 2] = a_nm * a_nm
+    tensor_nm2[..., 0, 0] = a_nm * a_nm
+    tensor_nm2[..., 0, 1] = a_nm * a_nm * cos_alpha
+    tensor_nm2[..., 0, 2] = a_nm * a_nm * cos_alpha
+    tensor_nm2[..., 1, 0] = a_nm * a_nm * cos_alpha
+    tensor_nm2[..., 1, 1] = a_nm * a_nm
+    tensor_nm2[..., 1, 2] = a_nm * a_nm * cos_alpha
+    tensor_nm2[..., 2, 0] = a_nm * a_nm * cos_alpha
+    tensor_nm2[..., 2, 1] = a_nm * a_nm * cos_alpha
+    tensor_nm2[..., 2, 2] = a_nm * a_nm
 
     return tensor_nm2
 
 
 def gm_nm2(a_nm, b_nm, c_nm, beta_rad):
-    tensor_nm2 = np.zeros((3, 3))
+    tensor_nm2, a_nm, b_nm, c_nm, beta_rad = _create_tensor(a_nm, b_nm, c_nm, beta_rad)
     cos_beta = np.cos(beta_rad)
 
-    tensor_nm2[0, 0] = a_nm * a_nm
-    tensor_nm2[1, 1] = b_nm * b_nm
-    tensor_nm2[2, 2] = c_nm * c_nm
-    tensor_nm2[0, 2] = a_nm * c_nm * cos_beta
-    tensor_nm2[2, 0] = a_nm * c_nm * cos_beta
+    tensor_nm2[..., 0, 0] = a_nm * a_nm
+    tensor_nm2[..., 1, 1] = b_nm * b_nm
+    tensor_nm2[..., 2, 2] = c_nm * c_nm
+    tensor_nm2[..., 0, 2] = a_nm * c_nm * cos_beta
+    tensor_nm2[..., 2, 0] = a_nm * c_nm * cos_beta
 
     return tensor_nm2
 
 
 def ga_nm2(a_nm, b_nm, c_nm, alpha_rad, beta_rad, gamma_rad):
-    tensor_nm2 = np.zeros((3, 3))
+    tensor_nm2, a_nm, b_nm, c_nm, alpha_rad, beta_rad, gamma_rad = _create_tensor(a_nm, b_nm, c_nm,
+                                                                                  alpha_rad, beta_rad, gamma_rad)
 
-    tensor_nm2[0, 0] = a_nm * a_nm
-    tensor_nm2[1, 1] = b_nm * b_nm
-    tensor_nm2[2, 2] = c_nm * c_nm
+    tensor_nm2[..., 0, 0] = a_nm * a_nm
+    tensor_nm2[..., 1, 1] = b_nm * b_nm
+    tensor_nm2[..., 2, 2] = c_nm * c_nm
 
-    tensor_nm2[0, 1] = tensor_nm2[1, 0] = a_nm * b_nm * np.cos(gamma_rad)
-    tensor_nm2[0, 2] = tensor_nm2[2, 0] = a_nm * c_nm * np.cos(beta_rad)
-    tensor_nm2[1, 2] = tensor_nm2[2, 1] = b_nm * c_nm * np.cos(alpha_rad)
+    tensor_nm2[..., 0, 1] = tensor_nm2[..., 1, 0] = a_nm * b_nm * np.cos(gamma_rad)
+    tensor_nm2[..., 0, 2] = tensor_nm2[..., 2, 0] = a_nm * c_nm * np.cos(beta_rad)
+    tensor_nm2[..., 1, 2] = tensor_nm2[..., 2, 1] = b_nm * c_nm * np.cos(alpha_rad)
 
     return tensor_nm2
+
+
+def ga_derivatives(a_nm, b_nm, c_nm, alpha_rad, beta_rad, gamma_rad):
+    """
+    Derivatives of the direct metric tensor with respect to (a, b, c, alpha, beta, gamma), shape (..., 6, 3, 3).
+
+    The derivatives are in nm for the lengths and in nm2/rad for the angles.
+    """
+    _tensor_nm2, a_nm, b_nm, c_nm, alpha_rad, beta_rad, gamma_rad = _create_tensor(a_nm, b_nm, c_nm,
+                                                                                   alpha_rad, beta_rad, gamma_rad)
+    cos_alpha = np.cos(alpha_rad)
+    cos_beta = np.cos(beta_rad)
+    cos_gamma = np.cos(gamma_rad)
+    derivatives = np.zeros(a_nm.shape + (6, 3, 3))
+
+    derivatives[..., 0, 0, 0] = 2.0 * a_nm
+    derivatives[..., 0, 0, 1] = derivatives[..., 0, 1, 0] = b_nm * cos_gamma
+    derivatives[..., 0, 0, 2] = derivatives[..., 0, 2, 0] = c_nm * cos_beta
+
+    derivatives[..., 1, 1, 1] = 2.0 * b_nm
+    derivatives[..., 1, 0, 1] = derivatives[..., 1, 1, 0] = a_nm * cos_gamma
+    derivatives[..., 1, 1, 2] = derivatives[..., 1, 2, 1] = c_nm * cos_alpha
+
+    derivatives[..., 2, 2, 2] = 2.0 * c_nm
+    derivatives[..., 2, 0, 2] = derivatives[..., 2, 2, 0] = a_nm * cos_beta
+    derivatives[..., 2, 1, 2] = derivatives[..., 2, 2, 1] = b_nm * cos_alpha
+
+    derivatives[..., 3, 1, 2] = derivatives[..., 3, 2, 1] = -b_nm * c_nm * np.sin(alpha_rad)
+    derivatives[..., 4, 0, 2] = derivatives[..., 4, 2, 0] = -a_nm * c_nm * np.sin(beta_rad)
+    derivatives[..., 5, 0, 1] = derivatives[..., 5, 1, 0] = -a_nm * b_nm * np.sin(gamma_rad)
+
+    return derivatives
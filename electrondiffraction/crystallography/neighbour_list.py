@@ -0,0 +1,149 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. py:currentmodule:: neighbour_list
+   :synopsis: Periodic neighbour search with cell lists.
+
+.. moduleauthor:: Hendrix Demers <hendrix.demers@mail.mcgill.ca>
+
+Periodic neighbour search with cell lists.
+
+The unit cell is divided in :math:`n_i` bins along each fractional axis, with :math:`n_i = \\lfloor d_i / r_c
+\\rfloor` and :math:`d_i = 1 / |a^*_i|` the distance between the lattice planes of that axis. Two atoms closer than
+the cutoff :math:`r_c` have fractional coordinates that differ by at most :math:`r_c |a^*_i|` along axis :math:`i`,
+so only the neighbouring bins are searched, for any cell shape, and the cost is linear in the number of atoms.
+"""
+
+###############################################################################
+# Copyright 2017 Hendrix Demers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###############################################################################
+
+# Standard library modules.
+import itertools
+
+# Third party modules.
+import numpy as np
+
+# Local modules.
+
+# Project modules.
+import electrondiffraction.crystallography.reduction as reduction
+
+# Globals and constants variables.
+
+
+def _bin_atoms(positions, number_bins):
+    bins = np.floor(positions * number_bins).astype(np.int64)
+    bins = np.minimum(bins, number_bins - 1)
+    bin_ids = np.ravel_multi_index(bins.T, number_bins)
+
+    order = np.argsort(bin_ids, kind="stable")
+    counts = np.bincount(bin_ids, minlength=int(np.prod(number_bins)))
+    starts = np.cumsum(counts) - counts
+
+    return bins, order, starts, counts
+
+
+def neighbour_list(crystal, positions, cutoff_nm, full=False, reduce_cell=True):
+    """
+    All the pairs of atoms closer than the cutoff under periodic boundary conditions.
+
+    The positions are fractional coordinates of shape (N, 3). Returns the atom indices ``i`` and ``j``, the (K, 3)
+    integer lattice translations ``shifts`` of atom ``j`` and the distances, so that the pair vector is
+    ``positions[j] + shifts - positions[i]``. Each pair is given once, unless ``full`` is true, in which case both
+    (i, j, shift) and (j, i, -shift) are given. The cutoff can be larger than the cell.
+
+    With ``reduce_cell``, the search runs in the Niggli reduced cell, whose bins stay close to the cutoff for
+    skewed input cells, and the shifts are transformed back to the input cell.
+    """
+    positions = np.atleast_2d(np.asarray(positions, dtype=float))
+    if positions.ndim != 2 or positions.shape[1] != 3:
+        raise ValueError("positions must be a (N, 3) array, got shape {}".format(positions.shape))
+    if cutoff_nm <= 0.0:
+        raise ValueError("cutoff_nm must be positive, got {}".format(cutoff_nm))
+
+    if reduce_cell:
+        reduced_crystal, transformation, inverse_transformation = reduction.niggli_reduce(crystal)
+        indices_i, indices_j, shifts, distances_nm = neighbour_list(reduced_crystal,
+                                                                    np.dot(positions, inverse_transformation.T),
+                                                                    cutoff_nm, full=full, reduce_cell=False)
+        return indices_i, indices_j, np.dot(shifts, transformation.T), distances_nm
+
+    wrapped_positions = positions - np.floor(positions)
+    wrapped_positions[wrapped_positions >= 1.0] = 0.0
+    wrap_shifts = np.round(positions - wrapped_positions).astype(np.int64)
+
+    reciprocal_lengths_1_nm = np.sqrt(np.diag(crystal.g_star_1_nm2))
+    number_bins = np.maximum(np.floor(1.0 / (reciprocal_lengths_1_nm * cutoff_nm)), 1).astype(np.int64)
+    search_ranges = np.ceil(cutoff_nm * reciprocal_lengths_1_nm * number_bins).astype(np.int64)
+
+    bins, order, starts, counts = _bin_atoms(wrapped_positions, number_bins)
+    structure_matrix = crystal.direct_structure_matrix_nm
+
+    all_i = []
+    all_j = []
+    all_shifts = []
+    all_distances_nm = []
+    offsets_ranges = [range(-search_range, search_range + 1) for search_range in search_ranges]
+    for offset in itertools.product(*offsets_ranges):
+        target_bins = bins + np.array(offset)
+        bin_shifts = np.floor_divide(target_bins, number_bins)
+        target_bins -= bin_shifts * number_bins
+        target_ids = np.ravel_multi_index(target_bins.T, number_bins)
+
+        pair_counts = counts[target_ids]
+        total = int(pair_counts.sum())
+        if total == 0:
+            continue
+
+        indices_i = np.repeat(np.arange(len(positions)), pair_counts)
+        local_offsets = np.arange(total) - np.repeat(np.cumsum(pair_counts) - pair_counts, pair_counts)
+        indices_j = order[np.repeat(starts[target_ids], pair_counts) + local_offsets]
+        shifts = np.repeat(bin_shifts, pair_counts, axis=0)
+
+        vectors = wrapped_positions[indices_j] + shifts - wrapped_positions[indices_i]
+        distances_nm = np.sqrt(np.sum(np.dot(vectors, structure_matrix.T)**2, axis=-1))
+
+        mask = distances_nm <= cutoff_nm
+        mask &= (indices_i != indices_j) | np.any(shifts != 0, axis=-1)
+        if not full:
+            is_positive_shift = _is_lexicographically_positive(shifts)
+            mask &= (indices_i < indices_j) | ((indices_i == indices_j) & is_positive_shift)
+
+        all_i.append(indices_i[mask])
+        all_j.append(indices_j[mask])
+        all_shifts.append(shifts[mask])
+        all_distances_nm.append(distances_nm[mask])
+
+    if len(all_i) == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), np.empty((0, 3), dtype=np.int64), \
+            np.empty(0)
+
+    indices_i = np.concatenate(all_i)
+    indices_j = np.concatenate(all_j)
+    # Translations for the input positions, which may lie outside of the unit cell.
+    shifts = np.concatenate(all_shifts) + wrap_shifts[indices_i] - wrap_shifts[indices_j]
+    distances_nm = np.concatenate(all_distances_nm)
+
+    return indices_i, indices_j, shifts, distances_nm
+
+
+def _is_lexicographically_positive(shifts):
+    is_positive = shifts[:, 0] > 0
+    is_positive |= (shifts[:, 0] == 0) & (shifts[:, 1] > 0)
+    is_positive |= (shifts[:, 0] == 0) & (shifts[:, 1] == 0) & (shifts[:, 2] > 0)
+
+    return is_positive
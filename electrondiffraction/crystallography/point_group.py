@@ -0,0 +1,199 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. py:currentmodule:: point_group
+   :synopsis: Laue class symmetry operations and reflection families.
+
+.. moduleauthor:: Hendrix Demers <hendrix.demers@mail.mcgill.ca>
+
+Laue class symmetry operations and reflection families.
+
+The operations are the integer matrices :math:`W` acting on fractional coordinates, the Miller indices as row
+vectors transform as :math:`h W`. The Laue classes of the rhombohedral crystal system use rhombohedral axes, the
+trigonal Laue classes of the hexagonal crystal system use hexagonal axes, the monoclinic unique axis is b.
+"""
+
+###############################################################################
+# Copyright 2017 Hendrix Demers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###############################################################################
+
+# Standard library modules.
+import functools
+
+# Third party modules.
+import numpy as np
+
+# Local modules.
+
+# Project modules.
+
+# Globals and constants variables.
+_INVERSION = ((-1, 0, 0), (0, -1, 0), (0, 0, -1))
+_TWOFOLD_A = ((1, 0, 0), (0, -1, 0), (0, 0, -1))
+_TWOFOLD_B = ((-1, 0, 0), (0, 1, 0), (0, 0, -1))
+_TWOFOLD_C = ((-1, 0, 0), (0, -1, 0), (0, 0, 1))
+_FOURFOLD_C = ((0, -1, 0), (1, 0, 0), (0, 0, 1))
+_THREEFOLD_C_HEXAGONAL = ((0, -1, 0), (1, -1, 0), (0, 0, 1))
+_SIXFOLD_C_HEXAGONAL = ((1, -1, 0), (1, 0, 0), (0, 0, 1))
+_TWOFOLD_A_HEXAGONAL = ((1, -1, 0), (0, -1, 0), (0, 0, -1))
+_TWOFOLD_110_HEXAGONAL = ((0, 1, 0), (1, 0, 0), (0, 0, -1))
+_THREEFOLD_111 = ((0, 0, 1), (1, 0, 0), (0, 1, 0))
+_TWOFOLD_1M10 = ((0, -1, 0), (-1, 0, 0), (0, 0, -1))
+
+LAUE_CLASS_GENERATORS = {
+    "triclinic": {"-1": (_INVERSION,)},
+    "monoclinic": {"2/m": (_INVERSION, _TWOFOLD_B)},
+    "orthorhombic": {"mmm": (_INVERSION, _TWOFOLD_A, _TWOFOLD_C)},
+    "tetragonal": {"4/m": (_INVERSION, _FOURFOLD_C),
+                   "4/mmm": (_INVERSION, _FOURFOLD_C, _TWOFOLD_A)},
+    "rhombohedral": {"-3": (_INVERSION, _THREEFOLD_111),
+                     "-3m": (_INVERSION, _THREEFOLD_111, _TWOFOLD_1M10)},
+    "hexagonal": {"-3": (_INVERSION, _THREEFOLD_C_HEXAGONAL),
+                  "-3m1": (_INVERSION, _THREEFOLD_C_HEXAGONAL, _TWOFOLD_A_HEXAGONAL),
+                  "-31m": (_INVERSION, _THREEFOLD_C_HEXAGONAL, _TWOFOLD_110_HEXAGONAL),
+                  "6/m": (_INVERSION, _SIXFOLD_C_HEXAGONAL),
+                  "6/mmm": (_INVERSION, _SIXFOLD_C_HEXAGONAL, _TWOFOLD_110_HEXAGONAL)},
+    "cubic": {"m-3": (_INVERSION, _THREEFOLD_111, _TWOFOLD_C),
+              "m-3m": (_INVERSION, _THREEFOLD_111, _FOURFOLD_C)},
+}
+
+HOLOHEDRIES = {"triclinic": "-1", "monoclinic": "2/m", "orthorhombic": "mmm", "tetragonal": "4/mmm",
+               "rhombohedral": "-3m", "hexagonal": "6/mmm", "cubic": "m-3m"}
+
+
+def generate_group(generators):
+    """
+    All the operations of the group generated by integer 3x3 matrices, the identity first.
+    """
+    identity = np.eye(3, dtype=np.int64)
+    generators = [np.asarray(generator, dtype=np.int64) for generator in generators]
+
+    operations = [identity]
+    keys = {identity.tobytes()}
+    index = 0
+    while index < len(operations):
+        for generator in generators:
+            operation = np.dot(operations[index], generator)
+            key = operation.tobytes()
+            if key not in keys:
+                keys.add(key)
+                operations.append(operation)
+        index += 1
+
+    return np.array(operations)
+
+
+def _encode(hkls, offset):
+    width = 2 * offset + 1
+    indices = hkls + offset
+
+    return (indices[..., 0] * width + indices[..., 1]) * width + indices[..., 2]
+
+
+class PointGroup(object):
+    """
+    Point group of integer operations acting on fractional coordinates, used to collapse reflections in families.
+    """
+    def __init__(self, symbol, operations):
+        self.symbol = symbol
+        self.operations = np.asarray(operations, dtype=np.int64)
+        self.operations.flags.writeable = False
+
+    def __len__(self):
+        return len(self.operations)
+
+    def __repr__(self):
+        return "{}({!r}, order={})".format(type(self).__name__, self.symbol, len(self))
+
+    @property
+    def order(self):
+        return len(self.operations)
+
+    def equivalent_hkls(self, hkls):
+        """
+        Images of a (N, 3) array of Miller indices under all the operations, returned as (N, order, 3).
+        """
+        hkls = np.asarray(hkls, dtype=np.int64)
+
+        return np.einsum("...i,oij->...oj", hkls, self.operations)
+
+    def family(self, hkl):
+        """
+        Distinct reflections of the family of one reflection (hkl) in lexicographic order.
+        """
+        return np.unique(self.equivalent_hkls(hkl), axis=0)
+
+    def canonicalize(self, hkls):
+        """
+        Family representative and multiplicity of each reflection of a (N, 3) array of Miller indices.
+
+        The representative is the lexicographically largest equivalent reflection, for example (2, 0, 0) for
+        {200} and (3, 2, 1) for {321} in the cubic m-3m class. The multiplicity is the number of distinct
+        equivalent reflections.
+        """
+        hkls = np.atleast_2d(np.asarray(hkls, dtype=np.int64))
+        if len(hkls) == 0:
+            return np.empty((0, 3), dtype=np.int64), np.empty(0, dtype=np.int64)
+
+        images = self.equivalent_hkls(hkls)
+        offset = int(np.abs(images).max())
+        keys = _encode(images, offset)
+
+        best = np.argmax(keys, axis=1)
+        representatives = images[np.arange(len(hkls)), best]
+
+        sorted_keys = np.sort(keys, axis=1)
+        multiplicities = 1 + np.count_nonzero(np.diff(sorted_keys, axis=1), axis=1)
+
+        return representatives, multiplicities
+
+    def families(self, hkls):
+        """
+        Unique families of a (N, 3) array of Miller indices.
+
+        Returns the (F, 3) representatives in lexicographic order, their (F,) multiplicities and the (N,) family
+        index of each reflection, so that the values of a family are computed once and expanded with
+        ``values[family_ids]``.
+        """
+        representatives, multiplicities = self.canonicalize(hkls)
+        unique_representatives, first, family_ids = np.unique(representatives, axis=0, return_index=True,
+                                                              return_inverse=True)
+
+        return unique_representatives, multiplicities[first], family_ids.reshape(-1)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_point_group(system_name, laue_class):
+    try:
+        generators = LAUE_CLASS_GENERATORS[system_name][laue_class]
+    except KeyError:
+        raise ValueError("Laue class {!r} is not defined for the {} crystal system, use one of {}".format(
+            laue_class, system_name, sorted(LAUE_CLASS_GENERATORS.get(system_name, {}))))
+
+    return PointGroup(laue_class, generate_group(generators))
+
+
+def get_laue_class(crystal, laue_class=None):
+    """
+    Point group of a Laue class of the crystal system, the holohedry of the system by default.
+
+    A general :py:class:`CrystalSystem` without a name is treated as triclinic.
+    """
+    system_name = crystal.name or "triclinic"
+    if laue_class is None:
+        laue_class = HOLOHEDRIES[system_name]
+
+    return _get_point_group(system_name, laue_class)
@@ -8,6 +8,9 @@
 .. moduleauthor:: Hendrix Demers <hendrix.demers@mail.mcgill.ca>
 
 Equations to compute the reciprocal metric tensor for each crystal system.
+
+The lattice parameters can be scalars or arrays, arrays are broadcast against each other and a stack of tensors
+with shape (..., 3, 3) is returned.
 """
 
 ###############################################################################
@@ -35,70 +38,79 @@ import numpy as np
 # Local modules.
 
 # Project modules.
+import electrondiffraction.crystallography.direct_metric_tensor as direct_metric_tensor
 
 # Globals and constants variables.
 
 
+def _create_tensor(*parameters):
+    parameters = np.broadcast_arrays(*[np.asarray(parameter, dtype=float) for parameter in parameters])
+    tensor = np.zeros(parameters[0].shape + (3, 3))
+
+    return (tensor,) + tuple(parameters)
+
+
 def grc_1_nm2(a_nm):
-    tensor_1_nm2 = np.zeros((3, 3))
+    tensor_1_nm2, a_nm = _create_tensor(a_nm)
 
-    tensor_1_nm2[0, 0] = 1.0 / (a_nm * a_nm)
-    tensor_1_nm2[1, 1] = 1.0 / (a_nm * a_nm)
-    tensor_1_nm2[2, 2] = 1.0 / (a_nm * a_nm)
+    tensor_1_nm2[..., 0, 0] = 1.0 / (a_nm * a_nm)
+    tensor_1_nm2[..., 1, 1] = 1.0 / (a_nm * a_nm)
+    tensor_1_nm2[..., 2, 2] = 1.0 / (a_nm * a_nm)
 
     return tensor_1_nm2
 
 
 def grt_1_nm2(a_nm, c_nm):
-    tensor_1_nm2 = np.zeros((3, 3))
+    tensor_1_nm2, a_nm, c_nm = _create_tensor(a_nm, c_nm)
 
-    tensor_1_nm2[0, 0] = 1.0 / (a_nm * a_nm)
-    tensor_1_nm2[1, 1] = 1.0 / (a_nm * a_nm)
-    tensor_1_nm2[2, 2] = 1.0 / (c_nm * c_nm)
+    tensor_1_nm2[..., 0, 0] = 1.0 / (a_nm * a_nm)
+    tensor_1_nm2[..., 1, 1] = 1.0 / (a_nm * a_nm)
+    tensor_1_nm2[..., 2, 2] = 1.0 / (c_nm * c_nm)
 
     return tensor_1_nm2
 
 
 def gro_1_nm2(a_nm, b_nm, c_nm):
-    tensor_1_nm2 = np.zeros((3, 3))
+    tensor_1_nm2, a_nm, b_nm, c_nm = _create_tensor(a_nm, b_nm, c_nm)
 
-    tensor_1_nm2[0, 0] = 1.0 / (a_nm * a_nm)
-    tensor_1_nm2[1, 1] = 1.0 / (b_nm * b_nm)
-    tensor_1_nm2[2, 2] = 1.0 / (c_nm * c_nm)
+    tensor_1_nm2[..., 0, 0] = 1.0 / (a_nm * a_nm)
+    tensor_1_nm2[..., 1, 1] = 1.0 / (b_nm * b_nm)
+    tensor_1_nm2[..., 2, 2] = 1.0 / (c_nm * c_nm)
 
     return tensor_1_nm2
 
 
 def grh_1_nm2(a_nm, c_nm):
-    tensor_1_nm2 = np.zeros((3, 3))
+    tensor_1_nm2, a_nm, c_nm = _create_tensor(a_nm, c_nm)
+
+    factor_1_nm2 = 2.0 / (3.0 * a_nm * a_nm)
 
-    tensor_1_nm2[0, 0] = 4.0 / (3.0 * a_nm * a_nm)
-    tensor_1_nm2[1, 1] = 4.0 / (3.0 * a_nm * a_nm)
-    tensor_1_nm2[2, 2] = 1.0 / (c_nm * c_nm)
-    tensor_1_nm2[0, 1] = 2.0 / (3.0 * a_nm * a_nm)
-    tensor_1_nm2[1, 0] = 2.0 / (3.0 * a_nm * a_nm)
+    tensor_1_nm2[..., 0, 0] = 2.0 * factor_1_nm2
+    tensor_1_nm2[..., 1, 1] = 2.0 * factor_1_nm2
+    tensor_1_nm2[..., 2, 2] = 1.0 / (c_nm * c_nm)
+    tensor_1_nm2[..., 0, 1] = factor_1_nm2
+    tensor_1_nm2[..., 1, 0] = factor_1_nm2
 
     return tensor_1_nm2
 
 
 def grr_1_nm2(a_nm, alpha_rad):
-    tensor_1_nm2 = np.zeros((3, 3))
+    tensor_1_nm2, a_nm, alpha_rad = _create_tensor(a_nm, alpha_rad)
     cos_alpha = np.cos(alpha_rad)
-    factor_tan2_alpha_2 = (1.0 - np.tan(alpha_rad / 2.0) * np.tan(alpha_rad / 2.0)) / 2.0
-
-    tensor_1_nm2[0, 0] = 1.0 + cos_alpha
-    tensor_1_nm2[0, 1] = -factor_tan2_alpha_2
-    tensor_1_nm2[0, 2] = -factor_tan2_alpha_2
-    tensor_1_nm2[1, 0] = -factor_tan2_alpha_2
-    tensor_1_nm2[1, 1] = 1.0 + cos_alpha
-    tensor_1_nm2[1, 2] = -factor_tan2_alpha_2
-    tensor_1_nm2[2, 0] = -factor_tan2_alpha_2
-    tensor_1_nm2[2, 1] = -factor_tan2_alpha_2
-    tensor_1_nm2[2, 2] = 1.0 + cos_alpha
+
+    tensor_1_nm2[..., 0, 0] = 1.0 + cos_alpha
+    tensor_1_nm2[..., 0, 1] = -cos_alpha
+    tensor_1_nm2[..., 0, 2] = -cos_alpha
+    tensor_1_nm2[..., 1, 0] = -cos_alpha
+    tensor_1_nm2[..., 1, 1] = 1.0 + cos_alpha
+    tensor_1_nm2[..., 1, 2] = -cos_alpha
+    tensor_1_nm2[..., 2, 0] = -cos_alpha
+    tensor_1_nm2[..., 2, 1] = -cos_alpha
+    tensor_1_nm2[..., 2, 2] = 1.0 + cos_alpha
 
     W = _compute_W(a_nm, cos_alpha)
 
-    tensor_1_nm2 = tensor_1_nm2 / (W * W)
+    tensor_1_nm2 /= W[..., np.newaxis, np.newaxis]
 
     return tensor_1_nm2
 
@@ -109,47 +121,84 @@ def _compute_W(a_nm, cos_alpha):
 
 
 def grm_1_nm2(a_nm, b_nm, c_nm, beta_rad):
-    tensor_1_nm2 = np.zeros((3, 3))
+    tensor_1_nm2, a_nm, b_nm, c_nm, beta_rad = _create_tensor(a_nm, b_nm, c_nm, beta_rad)
     cos_beta = np.cos(beta_rad)
-    sin2_beta = np.sin(beta_rad) * np.sin(beta_rad)
+    sin2_beta = 1.0 - cos_beta * cos_beta
 
-    tensor_1_nm2[0, 0] = 1.0 / (a_nm * a_nm * sin2_beta)
-    tensor_1_nm2[1, 1] = 1.0 / (b_nm * b_nm)
-    tensor_1_nm2[2, 2] = 1.0 / (c_nm * c_nm * sin2_beta)
-    tensor_1_nm2[0, 2] = -cos_beta / (a_nm * c_nm * sin2_beta)
-    tensor_1_nm2[2, 0] = -cos_beta / (a_nm * c_nm * sin2_beta)
+    tensor_1_nm2[..., 0, 0] = 1.0 / (a_nm * a_nm * sin2_beta)
+    tensor_1_nm2[..., 1, 1] = 1.0 / (b_nm * b_nm)
+    tensor_1_nm2[..., 2, 2] = 1.0 / (c_nm * c_nm * sin2_beta)
+    tensor_1_nm2[..., 0, 2] = -cos_beta / (a_nm * c_nm * sin2_beta)
+    tensor_1_nm2[..., 2, 0] = -cos_beta / (a_nm * c_nm * sin2_beta)
 
     return tensor_1_nm2
 
 
 def gra_1_nm2(a_nm, b_nm, c_nm, alpha_rad, beta_rad, gamma_rad):
-    tensor_1_nm2 = np.zeros((3, 3))
+    tensor_1_nm2, a_nm, b_nm, c_nm, alpha_rad, beta_rad, gamma_rad = _create_tensor(a_nm, b_nm, c_nm,
+                                                                                    alpha_rad, beta_rad, gamma_rad)
+    cos_alpha = np.cos(alpha_rad)
+    cos_beta = np.cos(beta_rad)
+    cos_gamma = np.cos(gamma_rad)
 
-    tensor_1_nm2[0, 0] = b_nm * b_nm * c_nm * c_nm * np.sin(alpha_rad) * np.sin(alpha_rad)
-    tensor_1_nm2[1, 1] = a_nm * a_nm * c_nm * c_nm * np.sin(beta_rad) * np.sin(beta_rad)
-    tensor_1_nm2[2, 2] = a_nm * a_nm * b_nm * b_nm * np.sin(gamma_rad) * np.sin(gamma_rad)
+    tensor_1_nm2[..., 0, 0] = b_nm * b_nm * c_nm * c_nm * (1.0 - cos_alpha * cos_alpha)
+    tensor_1_nm2[..., 1, 1] = a_nm * a_nm * c_nm * c_nm * (1.0 - cos_beta * cos_beta)
+    tensor_1_nm2[..., 2, 2] = a_nm * a_nm * b_nm * b_nm * (1.0 - cos_gamma * cos_gamma)
 
-    tensor_1_nm2[0, 1] = tensor_1_nm2[1, 0] = a_nm * b_nm * c_nm * c_nm * _compute_F(alpha_rad, beta_rad, gamma_rad)
-    tensor_1_nm2[0, 2] = tensor_1_nm2[2, 0] = a_nm * b_nm * b_nm * c_nm * _compute_F(gamma_rad, alpha_rad, beta_rad)
-    tensor_1_nm2[1, 2] = tensor_1_nm2[2, 1] = a_nm * a_nm * b_nm * c_nm * _compute_F(beta_rad, gamma_rad, alpha_rad)
+    tensor_1_nm2[..., 0, 1] = tensor_1_nm2[..., 1, 0] = \
+        a_nm * b_nm * c_nm * c_nm * _compute_F_cos(cos_alpha, cos_beta, cos_gamma)
+    tensor_1_nm2[..., 0, 2] = tensor_1_nm2[..., 2, 0] = \
+        a_nm * b_nm * b_nm * c_nm * _compute_F_cos(cos_gamma, cos_alpha, cos_beta)
+    tensor_1_nm2[..., 1, 2] = tensor_1_nm2[..., 2, 1] = \
+        a_nm * a_nm * b_nm * c_nm * _compute_F_cos(cos_beta, cos_gamma, cos_alpha)
 
-    omega = _compute_omega(a_nm, b_nm, c_nm, alpha_rad, beta_rad, gamma_rad)
+    omega = _compute_omega_cos(a_nm, b_nm, c_nm, cos_alpha, cos_beta, cos_gamma)
 
-    tensor_1_nm2 = tensor_1_nm2 / (omega * omega)
+    tensor_1_nm2 /= omega[..., np.newaxis, np.newaxis]
     return tensor_1_nm2
 
 
 def _compute_F(a_rad, b_rad, g_rad):
-    Fabg = np.cos(a_rad) * np.cos(b_rad) - np.cos(g_rad)
+    return _compute_F_cos(np.cos(a_rad), np.cos(b_rad), np.cos(g_rad))
+
+
+def _compute_F_cos(cos_a, cos_b, cos_g):
+    Fabg = cos_a * cos_b - cos_g
     return Fabg
 
 
 def _compute_omega(a_nm, b_nm, c_nm, alpha_rad, beta_rad, gamma_rad):
+    """
+    Square of the unit cell volume, i.e. the determinant of the direct metric tensor.
+    """
+    return _compute_omega_cos(a_nm, b_nm, c_nm, np.cos(alpha_rad), np.cos(beta_rad), np.cos(gamma_rad))
+
+
+def _compute_omega_cos(a_nm, b_nm, c_nm, cos_alpha, cos_beta, cos_gamma):
     factor = a_nm * b_nm * c_nm
     factor = factor * factor
-    term1 = np.cos(alpha_rad) * np.cos(alpha_rad) + np.cos(beta_rad) * np.cos(beta_rad) + \
-            np.cos(gamma_rad) * np.cos(gamma_rad)
-    term2 = 2.0 * np.cos(alpha_rad) * np.cos(beta_rad) * np.cos(gamma_rad)
+    term1 = cos_alpha * cos_alpha + cos_beta * cos_beta + cos_gamma * cos_gamma
+    term2 = 2.0 * cos_alpha * cos_beta * cos_gamma
 
     omega = factor * (1.0 - term1 + term2)
     return omega
+
+
+def volume_nm3(a_nm, b_nm, c_nm, alpha_rad, beta_rad, gamma_rad):
+    """
+    Unit cell volume, the lattice parameters can be arrays.
+    """
+    return np.sqrt(_compute_omega(a_nm, b_nm, c_nm, alpha_rad, beta_rad, gamma_rad))
+
+
+def gra_derivatives(a_nm, b_nm, c_nm, alpha_rad, beta_rad, gamma_rad):
+    """
+    Derivatives of the reciprocal metric tensor with respect to (a, b, c, alpha, beta, gamma), shape (..., 6, 3, 3).
+
+    From :math:`g^* = g^{-1}`, :math:`\\partial g^* = -g^* (\\partial g) g^*`, in 1/nm3 for the lengths and in
+    1/(nm2 rad) for the angles.
+    """
+    g_star_1_nm2 = gra_1_nm2(a_nm, b_nm, c_nm, alpha_rad, beta_rad, gamma_rad)
+    derivatives = direct_metric_tensor.ga_derivatives(a_nm, b_nm, c_nm, alpha_rad, beta_rad, gamma_rad)
+
+    return -np.einsum("...ij,...kjl,...lm->...kim", g_star_1_nm2, derivatives, g_star_1_nm2)
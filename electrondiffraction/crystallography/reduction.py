@@ -0,0 +1,161 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. py:currentmodule:: reduction
+   :synopsis: Niggli reduction of the unit cell.
+
+.. moduleauthor:: Hendrix Demers <hendrix.demers@mail.mcgill.ca>
+
+Niggli reduction of the unit cell.
+
+The algorithm of Krivy and Gruber (1976) works on the metric tensor with the tolerance of Grosse-Kunstleve et al.
+(2004). The transformation matrix :math:`P` gives the reduced basis :math:`(a', b', c') = (a, b, c) P`, so that the
+Miller indices transform as :math:`h' = h P` and the fractional coordinates as :math:`x' = P^{-1} x`.
+"""
+
+###############################################################################
+# Copyright 2017 Hendrix Demers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###############################################################################
+
+# Standard library modules.
+
+# Third party modules.
+import numpy as np
+
+# Local modules.
+
+# Project modules.
+import electrondiffraction.crystallography.crystal_system as crystal_system
+
+# Globals and constants variables.
+DEFAULT_RELATIVE_TOLERANCE = 1.0e-5
+MAXIMUM_ITERATIONS = 10000
+
+_M1 = np.array([[0, -1, 0], [-1, 0, 0], [0, 0, -1]])
+_M2 = np.array([[-1, 0, 0], [0, 0, -1], [0, -1, 0]])
+_M8 = np.array([[1, 0, 1], [0, 1, 1], [0, 0, 1]])
+
+
+def _sign(value):
+    return 1 if value > 0.0 else -1
+
+
+def _get_parameters(g_nm2):
+    return g_nm2[0, 0], g_nm2[1, 1], g_nm2[2, 2], 2.0 * g_nm2[1, 2], 2.0 * g_nm2[0, 2], 2.0 * g_nm2[0, 1]
+
+
+def _get_signs(values, epsilon):
+    return [1 if value > epsilon else (-1 if value < -epsilon else 0) for value in values]
+
+
+def _sign_transformation(xi, eta, zeta, epsilon):
+    """
+    Steps 3 and 4, all the off-diagonal terms positive or all of them negative or zero.
+    """
+    signs = _get_signs((xi, eta, zeta), epsilon)
+    if signs[0] * signs[1] * signs[2] == 1:
+        return np.diag([-1 if sign == -1 else 1 for sign in signs])
+
+    diagonal = [1, 1, 1]
+    zero_index = None
+    for index, sign in enumerate(signs):
+        if sign == 1:
+            diagonal[index] = -1
+        elif sign == 0:
+            zero_index = index
+    if diagonal[0] * diagonal[1] * diagonal[2] == -1:
+        diagonal[zero_index] = -1
+
+    return np.diag(diagonal)
+
+
+def _reduction_step(g_nm2, epsilon):
+    """
+    Transformation of the first step of the algorithm that applies, None when the cell is reduced.
+    """
+    a, b, c, xi, eta, zeta = _get_parameters(g_nm2)
+
+    if a > b + epsilon or (abs(a - b) < epsilon and abs(xi) > abs(eta) + epsilon):
+        return _M1
+    if b > c + epsilon or (abs(b - c) < epsilon and abs(eta) > abs(zeta) + epsilon):
+        return _M2
+
+    transformation = _sign_transformation(xi, eta, zeta, epsilon)
+    if not np.array_equal(transformation, np.eye(3)):
+        return transformation
+
+    if abs(xi) > b + epsilon or (abs(xi - b) < epsilon and 2.0 * eta < zeta - epsilon) or \
+            (abs(xi + b) < epsilon and zeta < -epsilon):
+        return np.array([[1, 0, 0], [0, 1, -_sign(xi)], [0, 0, 1]])
+    if abs(eta) > a + epsilon or (abs(eta - a) < epsilon and 2.0 * xi < zeta - epsilon) or \
+            (abs(eta + a) < epsilon and zeta < -epsilon):
+        return np.array([[1, 0, -_sign(eta)], [0, 1, 0], [0, 0, 1]])
+    if abs(zeta) > a + epsilon or (abs(zeta - a) < epsilon and 2.0 * xi < eta - epsilon) or \
+            (abs(zeta + a) < epsilon and eta < -epsilon):
+        return np.array([[1, -_sign(zeta), 0], [0, 1, 0], [0, 0, 1]])
+    if xi + eta + zeta + a + b < -epsilon or \
+            (abs(xi + eta + zeta + a + b) < epsilon and 2.0 * (a + eta) + zeta > epsilon):
+        return _M8
+
+    return None
+
+
+def _get_epsilon(crystal, relative_tolerance):
+    return relative_tolerance * crystal.volume_nm3**(2.0 / 3.0)
+
+
+def niggli_reduce(crystal, relative_tolerance=DEFAULT_RELATIVE_TOLERANCE):
+    """
+    Niggli reduced cell of a crystal as a :py:class:`Triclinic`, the transformation matrix and its inverse.
+
+    The tolerance on the metric tensor is ``relative_tolerance`` times :math:`V^{2/3}`. Both matrices are integer
+    with a determinant of one, :math:`g' = P^T g P`.
+    """
+    g0_nm2 = crystal.gij_nm2
+    epsilon = _get_epsilon(crystal, relative_tolerance)
+
+    transformation = np.eye(3, dtype=np.int64)
+    g_nm2 = g0_nm2
+    for _iteration in range(MAXIMUM_ITERATIONS):
+        step = _reduction_step(g_nm2, epsilon)
+        if step is None:
+            break
+        transformation = np.dot(transformation, step)
+        # The metric is recomputed from the input cell to avoid the accumulation of rounding errors.
+        g_nm2 = np.dot(np.dot(transformation.T, g0_nm2), transformation)
+    else:
+        raise RuntimeError("Niggli reduction did not converge in {} iterations".format(MAXIMUM_ITERATIONS))
+
+    inverse_transformation = np.rint(np.linalg.inv(transformation)).astype(np.int64)
+
+    return _create_crystal(g_nm2), transformation, inverse_transformation
+
+
+def _create_crystal(g_nm2):
+    a_nm, b_nm, c_nm = np.sqrt(np.diagonal(g_nm2))
+    alpha_rad = np.arccos(np.clip(g_nm2[1, 2] / (b_nm * c_nm), -1.0, 1.0))
+    beta_rad = np.arccos(np.clip(g_nm2[0, 2] / (a_nm * c_nm), -1.0, 1.0))
+    gamma_rad = np.arccos(np.clip(g_nm2[0, 1] / (a_nm * b_nm), -1.0, 1.0))
+
+    return crystal_system.Triclinic(float(a_nm), float(b_nm), float(c_nm), float(alpha_rad), float(beta_rad),
+                                    float(gamma_rad))
+
+
+def is_niggli_reduced(crystal, relative_tolerance=DEFAULT_RELATIVE_TOLERANCE):
+    """
+    Whether the cell of a crystal satisfies the Niggli conditions.
+    """
+    return _reduction_step(crystal.gij_nm2, _get_epsilon(crystal, relative_tolerance)) is None
@@ -0,0 +1,233 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. py:currentmodule:: refinement
+   :synopsis: Least-squares refinement of the lattice parameters from indexed spots.
+
+.. moduleauthor:: Hendrix Demers <hendrix.demers@mail.mcgill.ca>
+
+Least-squares refinement of the lattice parameters from indexed spots.
+
+The free parameters of the crystal system are fitted to measured d-spacings and interplanar angles with a damped
+Gauss-Newton (Levenberg-Marquardt) method. The Jacobian comes from the analytic derivatives of the reciprocal metric
+tensor and is evaluated for all the observations at once. The measurements can have leading batch dimensions, for
+example one set of d-spacings per scan position of a strain map, and all the problems are refined together.
+"""
+
+###############################################################################
+# Copyright 2017 Hendrix Demers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###############################################################################
+
+# Standard library modules.
+
+# Third party modules.
+import numpy as np
+
+# Local modules.
+
+# Project modules.
+import electrondiffraction.crystallography.crystal_system as crystal_system
+import electrondiffraction.crystallography.reciprocal_metric_tensor as reciprocal_metric_tensor
+
+# Globals and constants variables.
+LATTICE_PARAMETER_NAMES = ("a_nm", "b_nm", "c_nm", "alpha_rad", "beta_rad", "gamma_rad")
+
+# Lattice parameters tied to each free parameter of a crystal system, the other ones keep their initial values.
+FREE_PARAMETERS = {
+    "triclinic": ((0,), (1,), (2,), (3,), (4,), (5,)),
+    "monoclinic": ((0,), (1,), (2,), (4,)),
+    "orthorhombic": ((0,), (1,), (2,)),
+    "tetragonal": ((0, 1), (2,)),
+    "hexagonal": ((0, 1), (2,)),
+    "rhombohedral": ((0, 1, 2), (3, 4, 5)),
+    "cubic": ((0, 1, 2),),
+}
+
+DEFAULT_MAXIMUM_ITERATIONS = 50
+DEFAULT_TOLERANCE = 1.0e-12
+
+_MINIMUM_SIN = 1.0e-12
+
+
+def get_constraint_matrix(crystal):
+    """
+    Matrix (6, number of free parameters) mapping the free parameters of a crystal system to its lattice parameters.
+    """
+    free_parameters = FREE_PARAMETERS[crystal.name or "triclinic"]
+
+    matrix = np.zeros((6, len(free_parameters)))
+    for index_free, indices in enumerate(free_parameters):
+        matrix[list(indices), index_free] = 1.0
+
+    return matrix
+
+
+def get_free_parameter_names(crystal):
+    return tuple(LATTICE_PARAMETER_NAMES[indices[0]] for indices in FREE_PARAMETERS[crystal.name or "triclinic"])
+
+
+def compute_residuals(lattice_parameters, hkls, d_nm, angle_hkls=None, angles_rad=None):
+    """
+    Residuals and their Jacobian with respect to the six lattice parameters.
+
+    The lattice parameters have the shape (..., 6). The d-spacing residuals are relative, :math:`d/d_{obs} - 1`,
+    and the angle residuals are in radians. Returns the residuals (..., N + K) and the Jacobian (..., N + K, 6).
+    """
+    lattice_parameters = np.asarray(lattice_parameters, dtype=float)
+    parameters = np.moveaxis(lattice_parameters, -1, 0)
+    g_star_1_nm2 = reciprocal_metric_tensor.gra_1_nm2(*parameters)
+    derivatives = reciprocal_metric_tensor.gra_derivatives(*parameters)
+
+    hkls = np.asarray(hkls, dtype=float)
+    q_1_nm2 = np.einsum("ni,...ij,nj->...n", hkls, g_star_1_nm2, hkls)
+    q_derivatives = np.einsum("ni,...kij,nj->...nk", hkls, derivatives, hkls)
+
+    model_d_nm = 1.0 / np.sqrt(q_1_nm2)
+    residuals = [model_d_nm / d_nm - 1.0]
+    jacobians = [-0.5 * (model_d_nm / (q_1_nm2 * d_nm))[..., np.newaxis] * q_derivatives]
+
+    if angle_hkls is not None:
+        angle_hkls = np.asarray(angle_hkls, dtype=float)
+        hkls1 = angle_hkls[:, 0]
+        hkls2 = angle_hkls[:, 1]
+        p_1_nm2 = np.einsum("ni,...ij,nj->...n", hkls1, g_star_1_nm2, hkls2)
+        q1_1_nm2 = np.einsum("ni,...ij,nj->...n", hkls1, g_star_1_nm2, hkls1)
+        q2_1_nm2 = np.einsum("ni,...ij,nj->...n", hkls2, g_star_1_nm2, hkls2)
+        p_derivatives = np.einsum("ni,...kij,nj->...nk", hkls1, derivatives, hkls2)
+        q1_derivatives = np.einsum("ni,...kij,nj->...nk", hkls1, derivatives, hkls1)
+        q2_derivatives = np.einsum("ni,...kij,nj->...nk", hkls2, derivatives, hkls2)
+
+        norms = np.sqrt(q1_1_nm2 * q2_1_nm2)
+        cos_angles = np.clip(p_1_nm2 / norms, -1.0, 1.0)
+        sin_angles = np.maximum(np.sqrt(1.0 - cos_angles**2), _MINIMUM_SIN)
+
+        cos_derivatives = p_derivatives / norms[..., np.newaxis] - 0.5 * cos_angles[..., np.newaxis] * \
+            (q1_derivatives / q1_1_nm2[..., np.newaxis] + q2_derivatives / q2_1_nm2[..., np.newaxis])
+
+        residuals.append(np.arccos(cos_angles) - angles_rad)
+        jacobians.append(-cos_derivatives / sin_angles[..., np.newaxis])
+
+    return np.concatenate(residuals, axis=-1), np.concatenate(jacobians, axis=-2)
+
+
+class RefinementResult(object):
+    """
+    Refined lattice parameters (..., 6), free parameters and their standard uncertainties (..., number of free
+    parameters), residuals, convergence flags and number of iterations.
+    """
+    def __init__(self, crystal_class, lattice_parameters, free_parameters, uncertainties, residuals, converged,
+                 number_iterations):
+        self.crystal_class = crystal_class
+        self.lattice_parameters = lattice_parameters
+        self.free_parameters = free_parameters
+        self.uncertainties = uncertainties
+        self.residuals = residuals
+        self.converged = converged
+        self.number_iterations = number_iterations
+
+    def get_crystal(self, index=()):
+        """
+        Crystal of the same crystal system with the refined lattice parameters of one problem of the batch.
+        """
+        values = [float(value) for value in self.lattice_parameters[index]]
+
+        return self.crystal_class.from_lattice_parameters(crystal_system.LatticeParameters(*values))
+
+
+def refine_lattice_parameters(crystal, hkls, d_nm, angle_hkls=None, angles_rad=None, d_weights=None,
+                              angle_weights=None, maximum_iterations=DEFAULT_MAXIMUM_ITERATIONS,
+                              tolerance=DEFAULT_TOLERANCE):
+    """
+    Refine the free parameters of a crystal system to the measured d-spacings and interplanar angles.
+
+    The (N, 3) Miller indices ``hkls`` have the measured d-spacings ``d_nm`` of shape (..., N). The optional (K, 2, 3)
+    pairs ``angle_hkls`` have the measured angles ``angles_rad`` of shape (..., K). The leading dimensions are
+    independent problems refined together, all of them start from the lattice parameters of ``crystal``. The
+    weights multiply the relative d-spacing residuals and the angle residuals in radians.
+    """
+    d_nm = np.asarray(d_nm, dtype=float)
+    batch_shape = d_nm.shape[:-1]
+    if angle_hkls is not None:
+        angles_rad = np.asarray(angles_rad, dtype=float)
+        batch_shape = np.broadcast_shapes(batch_shape, angles_rad.shape[:-1])
+
+    weights = [np.ones(d_nm.shape[-1]) if d_weights is None else np.asarray(d_weights, dtype=float)]
+    if angle_hkls is not None:
+        weights.append(np.ones(angles_rad.shape[-1]) if angle_weights is None else
+                       np.asarray(angle_weights, dtype=float))
+    weights = np.concatenate([np.broadcast_to(weight, batch_shape + weight.shape[-1:]) for weight in weights],
+                             axis=-1)
+
+    constraints = get_constraint_matrix(crystal)
+    initial_parameters = np.array(crystal.lattice_parameters.astuple())
+    initial_free_parameters = initial_parameters[np.argmax(constraints, axis=0)]
+
+    def evaluate(free_parameters):
+        lattice_parameters = initial_parameters + np.dot(free_parameters - initial_free_parameters, constraints.T)
+        residuals, jacobian = compute_residuals(lattice_parameters, hkls, d_nm, angle_hkls, angles_rad)
+        residuals = residuals * weights
+        jacobian = np.dot(jacobian * weights[..., np.newaxis], constraints)
+        return lattice_parameters, residuals, jacobian
+
+    free_parameters = np.broadcast_to(initial_free_parameters, batch_shape + initial_free_parameters.shape).copy()
+    lattice_parameters, residuals, jacobian = evaluate(free_parameters)
+    costs = np.sum(residuals**2, axis=-1)
+    dampings = np.full(batch_shape, 1.0e-3)
+    converged = np.zeros(batch_shape, dtype=bool)
+    number_iterations = 0
+
+    identity = np.eye(len(initial_free_parameters))
+    for number_iterations in range(1, maximum_iterations + 1):
+        normal_matrices = np.einsum("...ni,...nj->...ij", jacobian, jacobian)
+        gradients = np.einsum("...ni,...n->...i", jacobian, residuals)
+        diagonals = np.diagonal(normal_matrices, axis1=-2, axis2=-1)[..., np.newaxis, :] * identity
+        steps = -np.linalg.solve(normal_matrices + dampings[..., np.newaxis, np.newaxis] * diagonals,
+                                 gradients[..., np.newaxis])[..., 0]
+        steps[converged] = 0.0
+
+        trial_free_parameters = free_parameters + steps
+        trial_lattice_parameters, trial_residuals, trial_jacobian = evaluate(trial_free_parameters)
+        trial_costs = np.sum(trial_residuals**2, axis=-1)
+
+        accepted = (trial_costs <= costs) & ~converged
+        free_parameters = np.where(accepted[..., np.newaxis], trial_free_parameters, free_parameters)
+        lattice_parameters = np.where(accepted[..., np.newaxis], trial_lattice_parameters, lattice_parameters)
+        residuals = np.where(accepted[..., np.newaxis], trial_residuals, residuals)
+        jacobian = np.where(accepted[..., np.newaxis, np.newaxis], trial_jacobian, jacobian)
+        costs = np.where(accepted, trial_costs, costs)
+        dampings = np.where(accepted, dampings / 10.0, dampings * 10.0)
+
+        small_steps = np.all(np.abs(steps) <= tolerance * (np.abs(free_parameters) + tolerance), axis=-1)
+        converged |= small_steps
+        if np.all(converged):
+            break
+
+    uncertainties = _compute_uncertainties(jacobian, costs)
+
+    return RefinementResult(type(crystal), lattice_parameters, free_parameters, uncertainties, residuals / weights,
+                            converged, number_iterations)
+
+
+def _compute_uncertainties(jacobian, costs):
+    number_observations, number_parameters = jacobian.shape[-2:]
+    if number_observations <= number_parameters:
+        return np.full(jacobian.shape[:-2] + (number_parameters,), np.nan)
+
+    normal_matrices = np.einsum("...ni,...nj->...ij", jacobian, jacobian)
+    variances = costs / (number_observations - number_parameters)
+    covariances = np.linalg.pinv(normal_matrices) * variances[..., np.newaxis, np.newaxis]
+
+    return np.sqrt(np.diagonal(covariances, axis1=-2, axis2=-1))
@@ -0,0 +1,162 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. py:currentmodule:: reflection
+   :synopsis: Enumeration of the reciprocal lattice points inside a sphere.
+
+.. moduleauthor:: Hendrix Demers <hendrix.demers@mail.mcgill.ca>
+
+Enumeration of the reciprocal lattice points inside a sphere.
+
+The reflections with :math:`|g| \\leq g_{max}` are the integer points inside the ellipsoid
+:math:`h_i g^*_{ij} h_j \\leq g_{max}^2`. The enumeration walks the ellipsoid one :math:`h` plane at a time and
+solves the quadratic in :math:`l` for each :math:`(h, k)` row, so that only the points inside the sphere are generated,
+even for strongly oblique cells.
+"""
+
+###############################################################################
+# Copyright 2017 Hendrix Demers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###############################################################################
+
+# Standard library modules.
+
+# Third party modules.
+import numpy as np
+
+# Local modules.
+
+# Project modules.
+import electrondiffraction.crystallography.d_spacing as d_spacing
+import electrondiffraction.crystallography.space_group as space_group_module
+
+# Globals and constants variables.
+DEFAULT_CHUNK_SIZE = 65536
+
+# Margin on the real index bounds before rounding, the points outside the sphere are removed afterwards.
+_INDEX_MARGIN = 1.0e-6
+
+REFLECTION_DTYPE = np.dtype([("hkl", np.int64, (3,)), ("g_1_nm", np.float64), ("d_nm", np.float64)])
+
+
+def _integer_range(lower, upper):
+    lower = np.ceil(lower - _INDEX_MARGIN).astype(np.int64)
+    upper = np.floor(upper + _INDEX_MARGIN).astype(np.int64)
+
+    return lower, upper
+
+
+def _plane_hkls(g_star_1_nm2, g_ij_nm2, h, g2_max_1_nm2):
+    """
+    Miller indices of the reflections inside the sphere in the plane of constant index h.
+    """
+    # Squared radius left for k and l once the minimum over the plane, h^2 / g_11, is removed.
+    r2_1_nm2 = g2_max_1_nm2 - h * h / g_ij_nm2[0, 0]
+    if r2_1_nm2 < 0.0:
+        return np.empty((0, 3), dtype=np.int64)
+
+    b_kl = g_star_1_nm2[1:, 1:]
+    center_kl = -h * np.linalg.solve(b_kl, g_star_1_nm2[1:, 0])
+    schur_kk = b_kl[0, 0] - b_kl[0, 1] * b_kl[0, 1] / b_kl[1, 1]
+    half_width_k = np.sqrt(r2_1_nm2 / schur_kk)
+    k_min, k_max = _integer_range(center_kl[0] - half_width_k, center_kl[0] + half_width_k)
+    ks = np.arange(k_min, k_max + 1, dtype=np.int64)
+
+    # Roots of g*_33 l^2 + 2 b l + c = 0 for each k.
+    a = g_star_1_nm2[2, 2]
+    b = g_star_1_nm2[0, 2] * h + g_star_1_nm2[1, 2] * ks
+    c = g_star_1_nm2[0, 0] * h * h + 2.0 * g_star_1_nm2[0, 1] * h * ks + g_star_1_nm2[1, 1] * ks * ks - g2_max_1_nm2
+    discriminant = np.maximum(b * b - a * c, 0.0)
+    l_min, l_max = _integer_range((-b - np.sqrt(discriminant)) / a, (-b + np.sqrt(discriminant)) / a)
+
+    counts = np.maximum(l_max - l_min + 1, 0)
+    total = int(counts.sum())
+    offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+
+    hkls = np.empty((total, 3), dtype=np.int64)
+    hkls[:, 0] = h
+    hkls[:, 1] = np.repeat(ks, counts)
+    hkls[:, 2] = np.repeat(l_min, counts) + offsets
+
+    return hkls
+
+
+def _create_reflections(crystal, hkls, g_max_1_nm, include_origin, space_group=None):
+    g_1_nm = d_spacing.g_lengths_1_nm(crystal, hkls)
+    mask = g_1_nm <= g_max_1_nm * (1.0 + d_spacing.RELATIVE_TOLERANCE)
+    if not include_origin:
+        mask &= np.any(hkls != 0, axis=-1)
+    if space_group is not None:
+        mask &= space_group.is_allowed(hkls)
+
+    reflections = np.empty(int(mask.sum()), dtype=REFLECTION_DTYPE)
+    reflections["hkl"] = hkls[mask]
+    reflections["g_1_nm"] = g_1_nm[mask]
+    with np.errstate(divide="ignore"):
+        reflections["d_nm"] = 1.0 / g_1_nm[mask]
+
+    return reflections
+
+
+def iter_reflections(crystal, g_max_1_nm, chunk_size=DEFAULT_CHUNK_SIZE, include_origin=False, space_group=None):
+    """
+    Generate all the reflections with :math:`|g| \\leq g_{max}` in chunks of at most ``chunk_size`` reflections.
+
+    Each chunk is a structured array of :py:data:`REFLECTION_DTYPE` with the fields ``hkl``, ``g_1_nm`` and ``d_nm``.
+    The reflections are generated in lexicographic order of their Miller indices. With a space group number or a
+    :py:class:`SpaceGroup`, the systematically absent reflections are dropped.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be positive, got {}".format(chunk_size))
+    if space_group is not None:
+        space_group = space_group_module.get_space_group(space_group, crystal)
+
+    g_star_1_nm2 = crystal.g_star_1_nm2
+    g_ij_nm2 = crystal.gij_nm2
+    g2_max_1_nm2 = (g_max_1_nm * (1.0 + d_spacing.RELATIVE_TOLERANCE))**2
+    h_max = int(np.floor(g_max_1_nm * np.sqrt(g_ij_nm2[0, 0]) * (1.0 + d_spacing.RELATIVE_TOLERANCE)))
+
+    pending = []
+    number_pending = 0
+    for h in range(-h_max, h_max + 1):
+        hkls = _plane_hkls(g_star_1_nm2, g_ij_nm2, h, g2_max_1_nm2)
+        reflections = _create_reflections(crystal, hkls, g_max_1_nm, include_origin, space_group)
+        if len(reflections) == 0:
+            continue
+
+        pending.append(reflections)
+        number_pending += len(reflections)
+
+        if number_pending >= chunk_size:
+            reflections = np.concatenate(pending)
+            number_full = (len(reflections) // chunk_size) * chunk_size
+            for start in range(0, number_full, chunk_size):
+                yield reflections[start:start + chunk_size]
+            pending = [reflections[number_full:]]
+            number_pending = len(reflections) - number_full
+
+    if number_pending > 0:
+        yield np.concatenate(pending)
+
+
+def enumerate_reflections(crystal, g_max_1_nm, include_origin=False, space_group=None):
+    """
+    All the reflections with :math:`|g| \\leq g_{max}` as a single structured array.
+    """
+    chunks = list(iter_reflections(crystal, g_max_1_nm, include_origin=include_origin, space_group=space_group))
+    if len(chunks) == 0:
+        return np.empty(0, dtype=REFLECTION_DTYPE)
+
+    return np.concatenate(chunks)
@@ -0,0 +1,224 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. py:currentmodule:: reflection_table
+   :synopsis: Reflection tables and their persistent on-disk cache.
+
+.. moduleauthor:: Hendrix Demers <hendrix.demers@mail.mcgill.ca>
+
+Reflection tables and their persistent on-disk cache.
+
+A reflection table is a structured array with the Miller indices, the reciprocal vector length, the d-spacing, the
+multiplicity and the structure factor of every reflection with :math:`|g| \\leq g_{max}`. The tables are
+deterministic, so :py:class:`ReflectionTableCache` stores them as ``.npy`` files named by a hash of the cache format
+version, the lattice parameters, the atom sites and the cutoff, and reopens them memory-mapped. Several processes can
+share a cache directory, a file removed by another process is skipped or computed again.
+"""
+
+###############################################################################
+# Copyright 2017 Hendrix Demers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###############################################################################
+
+# Standard library modules.
+import hashlib
+import os
+import tempfile
+
+# Third party modules.
+import numpy as np
+
+# Local modules.
+
+# Project modules.
+import electrondiffraction.crystallography.point_group as point_group
+import electrondiffraction.crystallography.reflection as reflection
+import electrondiffraction.crystallography.structure as structure
+import electrondiffraction.crystallography.structure_factor as structure_factor
+
+# Globals and constants variables.
+REFLECTION_TABLE_DTYPE = np.dtype(reflection.REFLECTION_DTYPE.descr +
+                                  [("multiplicity", np.int64), ("structure_factor_nm", np.complex128)])
+
+DEFAULT_MAXIMUM_SIZE_BYTES = 1024**3
+
+# Version of the content of the tables, increase it when the computation of a column changes so the tables written
+# before the change are not reused. Version 2: multiplicities of the Laue class point groups. Version 3: Peng et al.
+# electron scattering factors.
+CACHE_FORMAT_VERSION = 3
+
+_FILE_EXTENSION = ".npy"
+
+
+def _split_phase(phase):
+    if isinstance(phase, structure.Structure):
+        return phase.crystal, phase
+
+    return phase, None
+
+
+def compute_reflection_table(phase, g_max_1_nm):
+    """
+    Reflection table of a :py:class:`CrystalSystem` or a :py:class:`Structure`.
+
+    The multiplicity is the number of reflections of the family in the holohedral Laue class of the crystal system.
+    The structure factors are computed for a structure and are one for a crystal system.
+    """
+    crystal, crystal_structure = _split_phase(phase)
+
+    reflections = reflection.enumerate_reflections(crystal, g_max_1_nm)
+
+    table = np.empty(len(reflections), dtype=REFLECTION_TABLE_DTYPE)
+    for name in reflection.REFLECTION_DTYPE.names:
+        table[name] = reflections[name]
+
+    _representatives, table["multiplicity"] = point_group.get_laue_class(crystal).canonicalize(reflections["hkl"])
+
+    if crystal_structure is None:
+        table["structure_factor_nm"] = 1.0
+    else:
+        table["structure_factor_nm"] = structure_factor.compute_structure_factors(crystal_structure,
+                                                                                  reflections["hkl"])
+
+    return table
+
+
+def _format_values(values):
+    return ",".join("{:.9g}".format(value) for value in np.ravel(values))
+
+
+def compute_key(phase, g_max_1_nm):
+    """
+    Canonical hash of the cache format version, the crystal system, its lattice parameters, the atom sites and the
+    cutoff.
+    """
+    crystal, crystal_structure = _split_phase(phase)
+
+    items = ["v{:d}".format(CACHE_FORMAT_VERSION), type(crystal).__name__,
+             _format_values(crystal.lattice_parameters.key), _format_values(g_max_1_nm)]
+    if crystal_structure is not None:
+        items.append(",".join(crystal_structure.symbols))
+        items.append(_format_values(crystal_structure.positions))
+        items.append(_format_values(crystal_structure.occupancies))
+        items.append(_format_values(crystal_structure.debye_waller_B_nm2))
+
+    return hashlib.sha256("|".join(items).encode("utf-8")).hexdigest()
+
+
+def _remove(file_path):
+    try:
+        os.remove(file_path)
+    except FileNotFoundError:
+        pass
+
+
+class ReflectionTableCache(object):
+    """
+    Directory of reflection tables with a least recently used eviction above ``maximum_size_bytes``.
+
+    The modification time of a file is its last use.
+    """
+    def __init__(self, directory, maximum_size_bytes=DEFAULT_MAXIMUM_SIZE_BYTES):
+        self.directory = directory
+        self.maximum_size_bytes = maximum_size_bytes
+
+        os.makedirs(directory, exist_ok=True)
+
+    def _get_file_path(self, key):
+        return os.path.join(self.directory, key + _FILE_EXTENSION)
+
+    def _list_files(self):
+        file_paths = []
+        for file_name in os.listdir(self.directory):
+            if file_name.endswith(_FILE_EXTENSION):
+                file_paths.append(os.path.join(self.directory, file_name))
+
+        return file_paths
+
+    def _stat_files(self):
+        """
+        Modification time, size and path of the tables, the files removed meanwhile by another process are skipped.
+        """
+        entries = []
+        for file_path in self._list_files():
+            try:
+                status = os.stat(file_path)
+            except FileNotFoundError:
+                continue
+            entries.append((status.st_mtime, status.st_size, file_path))
+
+        return entries
+
+    @property
+    def size_bytes(self):
+        return sum(size for _time, size, _file_path in self._stat_files())
+
+    def __contains__(self, key):
+        return os.path.exists(self._get_file_path(key))
+
+    def __len__(self):
+        return len(self._list_files())
+
+    def get(self, phase, g_max_1_nm):
+        """
+        Memory-mapped, read-only, reflection table of a phase, computed and stored when it is not in the cache.
+        """
+        key = compute_key(phase, g_max_1_nm)
+        file_path = self._get_file_path(key)
+
+        try:
+            os.utime(file_path, None)
+            return np.load(file_path, mmap_mode="r")
+        except FileNotFoundError:
+            pass
+
+        table = compute_reflection_table(phase, g_max_1_nm)
+        self._write(file_path, table)
+        self.evict(keep=file_path)
+
+        try:
+            return np.load(file_path, mmap_mode="r")
+        except FileNotFoundError:
+            # Evicted by another process since it was written.
+            return table
+
+    def _write(self, file_path, table):
+        file_descriptor, temporary_path = tempfile.mkstemp(suffix=".tmp", dir=self.directory)
+        try:
+            with os.fdopen(file_descriptor, "wb") as table_file:
+                np.save(table_file, table)
+            os.replace(temporary_path, file_path)
+        except BaseException:
+            os.remove(temporary_path)
+            raise
+
+    def evict(self, keep=None):
+        """
+        Remove the least recently used tables until the cache is below its maximum size.
+        """
+        entries = self._stat_files()
+        size_bytes = sum(size for _time, size, _file_path in entries)
+
+        for _time, size, file_path in sorted(entries):
+            if size_bytes <= self.maximum_size_bytes:
+                break
+            if file_path == keep:
+                continue
+            _remove(file_path)
+            size_bytes -= size
+
+    def clear(self):
+        for file_path in self._list_files():
+            _remove(file_path)
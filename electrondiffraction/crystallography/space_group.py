@@ -0,0 +1,308 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. py:currentmodule:: space_group
+   :synopsis: Systematic absences of the 230 space groups.
+
+.. moduleauthor:: Hendrix Demers <hendrix.demers@mail.mcgill.ca>
+
+Systematic absences of the 230 space groups.
+
+The reflection conditions are derived from the Hermann-Mauguin symbol of the standard setting: the lattice centring,
+the screw axes and the glide planes of each symbol position. A reflection :math:`h` is absent when a centring vector
+:math:`c` gives :math:`h \\cdot c \\notin \\mathbb{Z}`, or when a symmetry element :math:`(W, t)` with the intrinsic
+translation :math:`t` leaves it invariant, :math:`h W = h`, and :math:`h \\cdot t \\notin \\mathbb{Z}`. The
+elements of a symbol position are completed with their images under the Laue class of the space group. The
+translations are stored in twelfths so that the conditions are exact integer arithmetic.
+
+The monoclinic groups have the unique axis b and the rhombohedral groups use the obverse hexagonal axes, Miller
+indices on rhombohedral axes are converted to hexagonal axes.
+"""
+
+###############################################################################
+# Copyright 2017 Hendrix Demers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###############################################################################
+
+# Standard library modules.
+import functools
+
+# Third party modules.
+import numpy as np
+
+# Local modules.
+
+# Project modules.
+import electrondiffraction.crystallography.point_group as point_group
+
+# Globals and constants variables.
+SPACE_GROUP_SYMBOLS = (
+    "P 1", "P -1",
+    "P 1 2 1", "P 1 21 1", "C 1 2 1", "P 1 m 1", "P 1 c 1", "C 1 m 1", "C 1 c 1", "P 1 2/m 1", "P 1 21/m 1",
+    "C 1 2/m 1", "P 1 2/c 1", "P 1 21/c 1", "C 1 2/c 1",
+    "P 2 2 2", "P 2 2 21", "P 21 21 2", "P 21 21 21", "C 2 2 21", "C 2 2 2", "F 2 2 2", "I 2 2 2", "I 21 21 21",
+    "P m m 2", "P m c 21", "P c c 2", "P m a 2", "P c a 21", "P n c 2", "P m n 21", "P b a 2", "P n a 21", "P n n 2",
+    "C m m 2", "C m c 21", "C c c 2", "A m m 2", "A e m 2", "A m a 2", "A e a 2", "F m m 2", "F d d 2", "I m m 2",
+    "I b a 2", "I m a 2",
+    "P m m m", "P n n n", "P c c m", "P b a n", "P m m a", "P n n a", "P m n a", "P c c a", "P b a m", "P c c n",
+    "P b c m", "P n n m", "P m m n", "P b c n", "P b c a", "P n m a", "C m c m", "C m c e", "C m m m", "C c c m",
+    "C m m e", "C c c e", "F m m m", "F d d d", "I m m m", "I b a m", "I b c a", "I m m a",
+    "P 4", "P 41", "P 42", "P 43", "I 4", "I 41", "P -4", "I -4", "P 4/m", "P 42/m", "P 4/n", "P 42/n", "I 4/m",
+    "I 41/a",
+    "P 4 2 2", "P 4 21 2", "P 41 2 2", "P 41 21 2", "P 42 2 2", "P 42 21 2", "P 43 2 2", "P 43 21 2", "I 4 2 2",
+    "I 41 2 2",
+    "P 4 m m", "P 4 b m", "P 42 c m", "P 42 n m", "P 4 c c", "P 4 n c", "P 42 m c", "P 42 b c", "I 4 m m", "I 4 c m",
+    "I 41 m d", "I 41 c d",
+    "P -4 2 m", "P -4 2 c", "P -4 21 m", "P -4 21 c", "P -4 m 2", "P -4 c 2", "P -4 b 2", "P -4 n 2", "I -4 m 2",
+    "I -4 c 2", "I -4 2 m", "I -4 2 d",
+    "P 4/m m m", "P 4/m c c", "P 4/n b m", "P 4/n n c", "P 4/m b m", "P 4/m n c", "P 4/n m m", "P 4/n c c",
+    "P 42/m m c", "P 42/m c m", "P 42/n b c", "P 42/n n m", "P 42/m b c", "P 42/m n m", "P 42/n m c", "P 42/n c m",
+    "I 4/m m m", "I 4/m c m", "I 41/a m d", "I 41/a c d",
+    "P 3", "P 31", "P 32", "R 3", "P -3", "R -3",
+    "P 3 1 2", "P 3 2 1", "P 31 1 2", "P 31 2 1", "P 32 1 2", "P 32 2 1", "R 3 2",
+    "P 3 m 1", "P 3 1 m", "P 3 c 1", "P 3 1 c", "R 3 m", "R 3 c",
+    "P -3 1 m", "P -3 1 c", "P -3 m 1", "P -3 c 1", "R -3 m", "R -3 c",
+    "P 6", "P 61", "P 65", "P 62", "P 64", "P 63", "P -6", "P 6/m", "P 63/m",
+    "P 6 2 2", "P 61 2 2", "P 65 2 2", "P 62 2 2", "P 64 2 2", "P 63 2 2",
+    "P 6 m m", "P 6 c c", "P 63 c m", "P 63 m c", "P -6 m 2", "P -6 c 2", "P -6 2 m", "P -6 2 c",
+    "P 6/m m m", "P 6/m c c", "P 63/m c m", "P 63/m m c",
+    "P 2 3", "F 2 3", "I 2 3", "P 21 3", "I 21 3", "P m -3", "P n -3", "F m -3", "F d -3", "I m -3", "P a -3",
+    "I a -3",
+    "P 4 3 2", "P 42 3 2", "F 4 3 2", "F 41 3 2", "I 4 3 2", "P 43 3 2", "P 41 3 2", "I 41 3 2",
+    "P -4 3 m", "F -4 3 m", "I -4 3 m", "P -4 3 n", "F -4 3 c", "I -4 3 d",
+    "P m -3 m", "P n -3 n", "P m -3 n", "P n -3 m", "F m -3 m", "F m -3 c", "F d -3 m", "F d -3 c", "I m -3 m",
+    "I a -3 d",
+)
+
+# Translations in twelfths of the lattice vectors.
+_DENOMINATOR = 12
+
+_CENTRING_VECTORS = {
+    "P": (),
+    "A": ((0, 6, 6),),
+    "B": ((6, 0, 6),),
+    "C": ((6, 6, 0),),
+    "I": ((6, 6, 6),),
+    "F": ((0, 6, 6), (6, 0, 6), (6, 6, 0)),
+    "R": ((8, 4, 4), (4, 8, 8)),
+}
+
+# Crystal system, Laue class and the directions of the symbol positions, by the last space group number of each
+# range.
+_SYSTEMS = (
+    (2, "triclinic", "-1", ((0, 0, 1),)),
+    (15, "monoclinic", "2/m", ((1, 0, 0), (0, 1, 0), (0, 0, 1))),
+    (74, "orthorhombic", "mmm", ((1, 0, 0), (0, 1, 0), (0, 0, 1))),
+    (88, "tetragonal", "4/m", ((0, 0, 1),)),
+    (142, "tetragonal", "4/mmm", ((0, 0, 1), (1, 0, 0), (1, 1, 0))),
+    (148, "hexagonal", "-3", ((0, 0, 1),)),
+    (167, "hexagonal", "-3m1", ((0, 0, 1), (1, 0, 0), (1, -1, 0))),
+    (176, "hexagonal", "6/m", ((0, 0, 1),)),
+    (194, "hexagonal", "6/mmm", ((0, 0, 1), (1, 0, 0), (1, -1, 0))),
+    (206, "cubic", "m-3", ((0, 0, 1), (1, 1, 1))),
+    (230, "cubic", "m-3m", ((0, 0, 1), (1, 1, 1), (1, 1, 0))),
+)
+
+# Trigonal groups with the two-fold axes along the tertiary directions.
+_LAUE_CLASS_31M = frozenset((149, 151, 153, 157, 159, 162, 163))
+
+# Laue classes of the rhombohedral space groups with the Miller indices on rhombohedral axes.
+_RHOMBOHEDRAL_LAUE_CLASSES = {"-3": "-3", "-3m1": "-3m"}
+
+# Two vectors of the glide plane perpendicular to each symbol direction, for the n and d glides.
+_PLANE_VECTORS = {
+    (1, 0, 0): ((0, 1, 0), (0, 0, 1)),
+    (0, 1, 0): ((1, 0, 0), (0, 0, 1)),
+    (0, 0, 1): ((1, 0, 0), (0, 1, 0)),
+    (1, 1, 0): ((1, -1, 0), (0, 0, 1)),
+}
+
+_AXIAL_GLIDES = {"a": (1, 0, 0), "b": (0, 1, 0), "c": (0, 0, 1)}
+
+# Hexagonal obverse axes from rhombohedral axes for the Miller indices.
+_RHOMBOHEDRAL_TO_HEXAGONAL = np.array([[1, 0, 1],
+                                       [-1, 1, 1],
+                                       [0, -1, 1]], dtype=np.int64)
+
+
+def _get_system(number):
+    if not 1 <= number <= len(SPACE_GROUP_SYMBOLS):
+        raise ValueError("Space group number must be between 1 and {}, got {}".format(
+            len(SPACE_GROUP_SYMBOLS), number))
+
+    for last_number, system_name, laue_class, directions in _SYSTEMS:
+        if number <= last_number:
+            if number in _LAUE_CLASS_31M:
+                laue_class = "-31m"
+            return system_name, laue_class, directions
+
+
+def _twofold_axis(operations, direction):
+    direction = np.asarray(direction, dtype=np.int64)
+    for operation in operations:
+        if np.trace(operation) == -1 and np.linalg.det(operation) > 0 and \
+                np.array_equal(np.dot(operation, direction), direction):
+            return operation
+
+    raise ValueError("No two-fold axis along {}".format(direction))
+
+
+def _glide_translations(letter, direction):
+    if letter == "m":
+        return []
+    if letter in _AXIAL_GLIDES:
+        return [np.array(_AXIAL_GLIDES[letter]) * _DENOMINATOR // 2]
+
+    vector_u, vector_v = _PLANE_VECTORS[tuple(direction)]
+    plane_sum = np.add(vector_u, vector_v)
+    if letter == "n":
+        return [plane_sum * _DENOMINATOR // 2]
+    if letter == "d":
+        return [plane_sum * _DENOMINATOR // 4]
+    if letter == "e":
+        return [np.array(vector_u) * _DENOMINATOR // 2, np.array(vector_v) * _DENOMINATOR // 2]
+
+    raise ValueError("Unknown glide plane {!r}".format(letter))
+
+
+def _parse_elements(symbol, holohedry_operations, directions):
+    """
+    Symmetry elements with an intrinsic translation of each symbol position, as (W, t) pairs.
+    """
+    elements = []
+    for token, direction in zip(symbol.split()[1:], directions):
+        axis, _separator, plane = token.partition("/")
+        if axis[0] in "abcdemn":
+            axis, plane = "", axis
+
+        if len(axis) == 2 and axis[0] != "-":
+            # The reflections invariant under a rotation of any order are along its axis, like for the two-fold one.
+            order, screw = int(axis[0]), int(axis[1])
+            twofold = _twofold_axis(holohedry_operations, direction)
+            elements.append((twofold, np.array(direction) * _DENOMINATOR * screw // order))
+        if plane:
+            twofold = _twofold_axis(holohedry_operations, direction)
+            for translation in _glide_translations(plane, direction):
+                elements.append((-twofold, translation))
+
+    return elements
+
+
+def _complete_elements(elements, laue_operations):
+    """
+    Images of the elements under the Laue class, without duplicates.
+    """
+    completed = {}
+    for operation, translation in elements:
+        for laue_operation in laue_operations:
+            inverse = np.rint(np.linalg.inv(laue_operation)).astype(np.int64)
+            image_operation = np.dot(np.dot(laue_operation, operation), inverse)
+            image_translation = np.dot(laue_operation, translation) % _DENOMINATOR
+            # The conditions of t and -t are the same.
+            image_translation = min(tuple(image_translation), tuple(-image_translation % _DENOMINATOR))
+            completed[(image_operation.tobytes(), image_translation)] = (image_operation,
+                                                                         np.array(image_translation))
+
+    return list(completed.values())
+
+
+class SpaceGroup(object):
+    """
+    Reflection conditions of a space group in its standard setting.
+    """
+    def __init__(self, number, rhombohedral_axes=False):
+        system_name, laue_class, directions = _get_system(number)
+
+        self.number = number
+        self.symbol = SPACE_GROUP_SYMBOLS[number - 1]
+        self.lattice = self.symbol[0]
+        self.system_name = system_name
+        self.laue_class = laue_class
+        self.rhombohedral_axes = rhombohedral_axes and self.lattice == "R"
+
+        holohedry = point_group.generate_group(
+            point_group.LAUE_CLASS_GENERATORS[system_name][point_group.HOLOHEDRIES[system_name]])
+        laue_operations = point_group.generate_group(point_group.LAUE_CLASS_GENERATORS[system_name][laue_class])
+
+        self.centring_vectors = np.array(_CENTRING_VECTORS[self.lattice], dtype=np.int64).reshape(-1, 3)
+        elements = _parse_elements(self.symbol, holohedry, directions)
+        self.elements = _complete_elements(elements, laue_operations)
+
+    def __repr__(self):
+        return "{}({}, {!r})".format(type(self).__name__, self.number, self.symbol)
+
+    @property
+    def short_symbol(self):
+        """
+        Hermann-Mauguin symbol without the spaces and the monoclinic unit positions, for example P21/c.
+        """
+        positions = self.symbol.split()
+        if self.system_name == "monoclinic":
+            positions = positions[:1] + positions[2:3]
+
+        return "".join(positions)
+
+    def is_allowed(self, hkls):
+        """
+        Mask of the reflections of a (..., 3) integer array that are not systematically absent.
+        """
+        hkls = np.asarray(hkls, dtype=np.int64)
+        if self.rhombohedral_axes:
+            hkls = np.dot(hkls, _RHOMBOHEDRAL_TO_HEXAGONAL)
+
+        allowed = np.ones(hkls.shape[:-1], dtype=bool)
+        for centring_vector in self.centring_vectors:
+            allowed &= np.dot(hkls, centring_vector) % _DENOMINATOR == 0
+
+        for operation, translation in self.elements:
+            is_invariant = np.all(np.dot(hkls, operation) == hkls, axis=-1)
+            allowed &= ~is_invariant | (np.dot(hkls, translation) % _DENOMINATOR == 0)
+
+        return allowed
+
+    def filter(self, hkls):
+        """
+        Reflections of a (N, 3) integer array that are not systematically absent.
+        """
+        hkls = np.asarray(hkls, dtype=np.int64)
+
+        return hkls[self.is_allowed(hkls)]
+
+    def get_laue_class(self, crystal):
+        """
+        Point group of the Laue class of the space group acting on the Miller indices of a crystal.
+        """
+        laue_class = self.laue_class
+        if crystal.name == "rhombohedral" and self.lattice == "R":
+            laue_class = _RHOMBOHEDRAL_LAUE_CLASSES[laue_class]
+
+        return point_group.get_laue_class(crystal, laue_class)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_space_group(number, rhombohedral_axes):
+    return SpaceGroup(number, rhombohedral_axes)
+
+
+def get_space_group(number, crystal=None):
+    """
+    Space group of a number, with the Miller indices on rhombohedral axes for a :py:class:`Rhombohedral` crystal.
+    """
+    if isinstance(number, SpaceGroup):
+        return number
+
+    rhombohedral_axes = crystal is not None and crystal.name == "rhombohedral"
+
+    return _get_space_group(int(number), rhombohedral_axes)
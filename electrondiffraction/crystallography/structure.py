@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. py:currentmodule:: structure
+   :synopsis: Crystal structure, a crystal system with its atom sites.
+
+.. moduleauthor:: Hendrix Demers <hendrix.demers@mail.mcgill.ca>
+
+Crystal structure, a crystal system with its atom sites.
+"""
+
+###############################################################################
+# Copyright 2017 Hendrix Demers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###############################################################################
+
+# Standard library modules.
+
+# Third party modules.
+import numpy as np
+
+# Local modules.
+
+# Project modules.
+import electrondiffraction.crystallography.structure_factor as structure_factor
+
+# Globals and constants variables.
+
+
+class Structure(object):
+    """
+    Crystal structure made of a :py:class:`CrystalSystem` and its atom sites.
+
+    The positions are fractional coordinates of shape (M, 3). The occupancies default to one and the isotropic
+    Debye-Waller factors :math:`B = 8 \\pi^2 \\langle u^2 \\rangle` default to zero.
+    """
+    def __init__(self, crystal, symbols, positions, occupancies=None, debye_waller_B_nm2=None):
+        self.crystal = crystal
+        self.symbols = list(symbols)
+        self.positions = np.atleast_2d(np.asarray(positions, dtype=float))
+
+        number_atoms = len(self.symbols)
+        if self.positions.shape != (number_atoms, 3):
+            raise ValueError("positions must have shape ({}, 3), got {}".format(number_atoms, self.positions.shape))
+
+        if occupancies is None:
+            occupancies = np.ones(number_atoms)
+        self.occupancies = np.broadcast_to(np.asarray(occupancies, dtype=float), (number_atoms,)).copy()
+
+        if debye_waller_B_nm2 is None:
+            debye_waller_B_nm2 = np.zeros(number_atoms)
+        self.debye_waller_B_nm2 = np.broadcast_to(np.asarray(debye_waller_B_nm2, dtype=float),
+                                                  (number_atoms,)).copy()
+
+    def __len__(self):
+        return len(self.symbols)
+
+    @property
+    def elements(self):
+        """
+        Unique elements of the structure and the index of the element of each atom.
+        """
+        elements = sorted(set(self.symbols))
+        element_ids = np.array([elements.index(symbol) for symbol in self.symbols], dtype=int)
+
+        return elements, element_ids
+
+    def structure_factors(self, hkls):
+        """
+        Structure factors of a (N, 3) array of Miller indices, see
+        :py:func:`electrondiffraction.crystallography.structure_factor.compute_structure_factors`.
+        """
+        return structure_factor.compute_structure_factors(self, hkls)
@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. py:currentmodule:: structure_factor
+   :synopsis: Vectorized structure factors of a crystal structure.
+
+.. moduleauthor:: Hendrix Demers <hendrix.demers@mail.mcgill.ca>
+
+Vectorized structure factors of a crystal structure.
+
+The structure factor of a reflection is
+
+.. math::
+
+    F_g = \\sum_j o_j f_j(s) \\exp(-B_j s^2) \\exp(2 \\pi i \\, \\mathbf{h} \\cdot \\mathbf{x}_j),
+
+with :math:`o_j` the occupancy, :math:`f_j` the electron scattering factor, :math:`B_j` the Debye-Waller factor and
+:math:`\\mathbf{x}_j` the fractional position of atom :math:`j`. The phases of a chunk of reflections are computed
+with a single (N, 3) by (3, M) matrix product, so the memory used is bounded by the chunk size times the number of
+atoms.
+"""
+
+###############################################################################
+# Copyright 2017 Hendrix Demers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###############################################################################
+
+# Standard library modules.
+
+# Third party modules.
+import numpy as np
+
+# Local modules.
+
+# Project modules.
+import electrondiffraction.crystallography.d_spacing as d_spacing
+import electrondiffraction.crystallography.scattering_factor as scattering_factor
+
+# Globals and constants variables.
+DEFAULT_CHUNK_SIZE = 16384
+
+
+def _compute_chunk(structure, elements, element_ids, hkls):
+    g_1_nm = d_spacing.g_lengths_1_nm(structure.crystal, hkls)
+    s2_1_nm2 = (g_1_nm / 2.0)**2
+
+    factors_nm = scattering_factor.electron_scattering_factors_nm(elements, g_1_nm)[:, element_ids]
+    debye_wallers = np.exp(-s2_1_nm2[:, np.newaxis] * structure.debye_waller_B_nm2[np.newaxis, :])
+    amplitudes_nm = factors_nm * debye_wallers * structure.occupancies[np.newaxis, :]
+
+    phases = np.exp(2.0j * np.pi * np.dot(hkls, structure.positions.T))
+
+    return np.einsum("nm,nm->n", amplitudes_nm, phases)
+
+
+def compute_structure_factors(structure, hkls, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Structure factors, in nm, of a (N, 3) array of Miller indices.
+    """
+    hkls = np.asarray(hkls, dtype=float)
+    if hkls.ndim != 2 or hkls.shape[1] != 3:
+        raise ValueError("hkls must be a (N, 3) array, got shape {}".format(hkls.shape))
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be positive, got {}".format(chunk_size))
+
+    elements, element_ids = structure.elements
+
+    factors_nm = np.empty(len(hkls), dtype=complex)
+    for start in range(0, len(hkls), chunk_size):
+        stop = start + chunk_size
+        factors_nm[start:stop] = _compute_chunk(structure, elements, element_ids, hkls[start:stop])
+
+    return factors_nm
@@ -27,6 +27,7 @@ Vector operation in a crystal system.
 ###############################################################################
 
 # Standard library modules.
+import math
 
 # Third party modules.
 import numpy as np
@@ -34,11 +35,71 @@ import numpy as np
 # Local modules.
 
 # Project modules.
+import electrondiffraction.instrumentation as instrumentation
 
 # Globals and constants variables.
 
 
+def _as_components(vector):
+    """
+    Three Python floats of a single 3-vector, or None when the vector needs the NumPy path.
+    """
+    if type(vector) is np.ndarray:
+        if vector.shape != (3,) or vector.dtype.kind not in "iuf":
+            return None
+        return vector.tolist()
+
+    if type(vector) not in (list, tuple) or len(vector) != 3:
+        return None
+    try:
+        return float(vector[0]), float(vector[1]), float(vector[2])
+    except TypeError:
+        return None
+
+
+def _dot_product_components(g_components, p, q):
+    g11, g22, g33, g12, g13, g23 = g_components
+    p1, p2, p3 = p
+    q1, q2, q3 = q
+
+    return p1 * (g11 * q1 + g12 * q2 + g13 * q3) + p2 * (g12 * q1 + g22 * q2 + g23 * q3) + \
+        p3 * (g13 * q1 + g23 * q2 + g33 * q3)
+
+
+def _dot_product_scalar(crystal, vector_p, vector_q):
+    """
+    Scalar fast path of a dot product on the cached tensor components, None when a vector is not a single 3-vector.
+    """
+    p = _as_components(vector_p)
+    if p is None:
+        return None
+    q = p if vector_q is vector_p else _as_components(vector_q)
+    if q is None:
+        return None
+
+    return _dot_product_components(crystal.gij_components_nm2, p, q)
+
+
+def _sqrt(value):
+    if type(value) is float and value >= 0.0:
+        return math.sqrt(value)
+
+    return np.sqrt(value)
+
+
+def _arccos(factor):
+    if type(factor) is float:
+        return math.acos(min(max(factor, -1.0), 1.0))
+
+    return np.arccos(np.clip(factor, -1.0, 1.0))
+
+
+@instrumentation.instrumented(instrumentation.CATEGORY_VECTOR)
 def dot_product(crystal, vector_p, vector_q):
+    magnitude = _dot_product_scalar(crystal, vector_p, vector_q)
+    if magnitude is not None:
+        return magnitude
+
     g_ij_nm2 = crystal.gij_nm2
 
     vector1 = np.dot(g_ij_nm2, np.array(vector_q).transpose())
@@ -47,22 +108,26 @@ def dot_product(crystal, vector_p, vector_q):
     return magnitude
 
 
+@instrumentation.instrumented(instrumentation.CATEGORY_VECTOR)
 def distance(crystal, vector_p, vector_q):
-    d = np.sqrt(dot_product(crystal, vector_p, vector_q))
+    d = _sqrt(dot_product(crystal, vector_p, vector_q))
 
     return d
 
 
+@instrumentation.instrumented(instrumentation.CATEGORY_VECTOR)
 def length(crystal, vector_p):
     return distance(crystal, vector_p, vector_p)
 
 
+@instrumentation.instrumented(instrumentation.CATEGORY_VECTOR)
 def distance_points(crystal, point_p, point_q):
     vector_d = point_p - point_q
 
     return distance(crystal, vector_d, vector_d)
 
 
+@instrumentation.instrumented(instrumentation.CATEGORY_ANGLE)
 def angle_rad(crystal, vector_p, vector_q):
     denominator = dot_product(crystal, vector_p, vector_q)
     norm_p = length(crystal, vector_p)
@@ -70,22 +135,176 @@ def angle_rad(crystal, vector_p, vector_q):
 
     factor = denominator / (norm_p * norm_q)
 
-    angle_value_rad = np.arccos(factor)
+    angle_value_rad = _arccos(factor)
 
     return angle_value_rad
 
 
+@instrumentation.instrumented(instrumentation.CATEGORY_ANGLE)
 def angle2_rad(crystal, vector_p, vector_q):
-    matrix_left = np.vstack([vector_p, vector_q])
-    matrix_right = matrix_left.transpose()
+    _products, _lengths, angles = gram_matrix(crystal, [vector_p, vector_q])
 
-    matrix = np.dot(crystal.gij_nm2, matrix_right)
-    matrix = np.dot(matrix_left, matrix)
+    return angles[0, 1]
 
-    nominator = matrix[0, 1]
-    denominator = np.sqrt(matrix[0, 0]) * np.sqrt(matrix[1, 1])
-    factor = nominator / denominator
 
-    angle_value_rad = np.arccos(factor)
+def _as_vectors(vectors):
+    vectors = np.asarray(vectors, dtype=float)
+    if vectors.shape[-1] != 3:
+        raise ValueError("Vectors must have 3 components along the last axis, got shape {}".format(vectors.shape))
 
-    return angle_value_rad
+    return vectors
+
+
+@instrumentation.instrumented(instrumentation.CATEGORY_VECTOR)
+def dot_products(crystal, vectors_p, vectors_q):
+    """
+    Dot products of two arrays of vectors of shape (..., 3), broadcast against each other.
+
+    Returns an array with the broadcast leading shape, e.g. (N,) for two (N, 3) arrays.
+    """
+    vectors_p = _as_vectors(vectors_p)
+    vectors_q = _as_vectors(vectors_q)
+
+    magnitudes = np.einsum("...i,...i->...", np.dot(vectors_p, crystal.gij_nm2), vectors_q)
+
+    return magnitudes
+
+
+@instrumentation.instrumented(instrumentation.CATEGORY_VECTOR)
+def dot_products_pairwise(crystal, vectors_p, vectors_q):
+    """
+    Dot products between every vector of a (N, 3) array and every vector of a (M, 3) array.
+
+    Returns a (N, M) array computed with a single matrix product.
+    """
+    vectors_p = _as_vectors(vectors_p)
+    vectors_q = _as_vectors(vectors_q)
+
+    magnitudes = np.dot(np.dot(vectors_p, crystal.gij_nm2), vectors_q.T)
+
+    return magnitudes
+
+
+@instrumentation.instrumented(instrumentation.CATEGORY_VECTOR)
+def distances(crystal, vectors_p, vectors_q):
+    d = np.sqrt(dot_products(crystal, vectors_p, vectors_q))
+
+    return d
+
+
+@instrumentation.instrumented(instrumentation.CATEGORY_VECTOR)
+def lengths(crystal, vectors_p):
+    return np.sqrt(dot_products(crystal, vectors_p, vectors_p))
+
+
+@instrumentation.instrumented(instrumentation.CATEGORY_VECTOR)
+def distances_points(crystal, points_p, points_q):
+    vectors_d = _as_vectors(points_p) - _as_vectors(points_q)
+
+    return lengths(crystal, vectors_d)
+
+
+@instrumentation.instrumented(instrumentation.CATEGORY_VECTOR)
+def distances_points_pairwise(crystal, points_p, points_q):
+    """
+    Distances between every point of a (N, 3) array and every point of a (M, 3) array, returned as (N, M).
+
+    The points are centred on the mean of the first array before expanding :math:`|p - q|^2`, so the cancellation
+    between the terms of the expansion depends on the spread of the points and not on their distance to the origin.
+    """
+    points_p = _as_vectors(points_p)
+    points_q = _as_vectors(points_q)
+
+    if len(points_p) > 0:
+        origin = np.mean(points_p, axis=0)
+        points_p = points_p - origin
+        points_q = points_q - origin
+
+    squared_p = dot_products(crystal, points_p, points_p)
+    squared_q = dot_products(crystal, points_q, points_q)
+    squared_d = squared_p[:, np.newaxis] + squared_q[np.newaxis, :] - \
+        2.0 * dot_products_pairwise(crystal, points_p, points_q)
+
+    return np.sqrt(np.maximum(squared_d, 0.0))
+
+
+@instrumentation.instrumented(instrumentation.CATEGORY_ANGLE)
+def angles_rad(crystal, vectors_p, vectors_q):
+    """
+    Angles between two arrays of vectors of shape (..., 3), broadcast against each other.
+    """
+    vectors_p = _as_vectors(vectors_p)
+    vectors_q = _as_vectors(vectors_q)
+
+    denominator = dot_products(crystal, vectors_p, vectors_q)
+    norm_p = lengths(crystal, vectors_p)
+    norm_q = lengths(crystal, vectors_q)
+
+    factor = np.clip(denominator / (norm_p * norm_q), -1.0, 1.0)
+
+    return np.arccos(factor)
+
+
+@instrumentation.instrumented(instrumentation.CATEGORY_ANGLE)
+def angles_rad_pairwise(crystal, vectors_p, vectors_q):
+    """
+    Angles between every vector of a (N, 3) array and every vector of a (M, 3) array, returned as (N, M).
+    """
+    vectors_p = _as_vectors(vectors_p)
+    vectors_q = _as_vectors(vectors_q)
+
+    denominator = dot_products_pairwise(crystal, vectors_p, vectors_q)
+    norm_p = lengths(crystal, vectors_p)
+    norm_q = lengths(crystal, vectors_q)
+
+    factor = np.clip(denominator / np.outer(norm_p, norm_q), -1.0, 1.0)
+
+    return np.arccos(factor)
+
+
+@instrumentation.instrumented(instrumentation.CATEGORY_ANGLE)
+def gram_matrix(crystal, vectors, reciprocal=False):
+    """
+    Dot products, lengths and angles of all the pairs of a (N, 3) array of vectors from a single
+    :math:`V g V^T` product.
+
+    The vectors are directions [uvw] with the direct metric tensor or, with ``reciprocal``, plane normals (hkl)
+    with the reciprocal metric tensor. Returns the (N, N) dot products, the (N,) lengths and the (N, N) angles.
+    """
+    vectors = _as_vectors(vectors)
+    metric_tensor = crystal.g_star_1_nm2 if reciprocal else crystal.gij_nm2
+
+    products = np.dot(np.dot(vectors, metric_tensor), vectors.T)
+    norms = np.sqrt(np.diagonal(products))
+
+    factor = np.clip(products / np.outer(norms, norms), -1.0, 1.0)
+
+    return products, norms, np.arccos(factor)
+
+
+def fractional_to_cartesian_nm(crystal, positions):
+    """
+    Cartesian coordinates of a (..., 3) array of fractional coordinates or directions [uvw].
+    """
+    return np.dot(_as_vectors(positions), crystal.direct_structure_matrix_nm.T)
+
+
+def cartesian_to_fractional(crystal, positions_nm):
+    """
+    Fractional coordinates of a (..., 3) array of Cartesian coordinates, :math:`A^{-1} = B^T`.
+    """
+    return np.dot(_as_vectors(positions_nm), crystal.reciprocal_structure_matrix_1_nm)
+
+
+def miller_to_cartesian_1_nm(crystal, hkls):
+    """
+    Cartesian reciprocal vectors of a (..., 3) array of Miller indices (hkl).
+    """
+    return np.dot(_as_vectors(hkls), crystal.reciprocal_structure_matrix_1_nm.T)
+
+
+def cartesian_to_miller(crystal, g_1_nm):
+    """
+    Miller indices, not rounded, of a (..., 3) array of Cartesian reciprocal vectors, :math:`B^{-1} = A^T`.
+    """
+    return np.dot(_as_vectors(g_1_nm), crystal.direct_structure_matrix_nm)
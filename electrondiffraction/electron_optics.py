@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. py:currentmodule:: electron_optics
+   :synopsis: Electron optics quantities of the incident electron beam.
+
+.. moduleauthor:: Hendrix Demers <hendrix.demers@mail.mcgill.ca>
+
+Electron optics quantities of the incident electron beam.
+
+The Bragg angle tables of a crystal are cached per cell and accelerating voltage, so that datasets acquired at a few
+voltages reuse the same tables.
+"""
+
+###############################################################################
+# Copyright 2017 Hendrix Demers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###############################################################################
+
+# Standard library modules.
+import functools
+
+# Third party modules.
+import numpy as np
+
+# Local modules.
+
+# Project modules.
+import electrondiffraction.crystallography.reflection as reflection
+
+# Globals and constants variables.
+PLANCK_CONSTANT_Js = 6.62607015e-34
+ELECTRON_MASS_kg = 9.1093837015e-31
+ELEMENTARY_CHARGE_C = 1.602176634e-19
+SPEED_OF_LIGHT_m_s = 299792458.0
+
+# Number of reflection tables kept in memory, each table holds every reflection of a crystal below the cutoff.
+BRAGG_TABLE_CACHE_SIZE = 8
+WAVELENGTH_CACHE_SIZE = 256
+
+
+def relativistic_factor(voltage_V):
+    """
+    Lorentz factor :math:`\\gamma = 1 + eV / m_0 c^2` of the electrons, the voltage can be an array.
+    """
+    voltage_V = np.asarray(voltage_V, dtype=float)
+
+    return 1.0 + ELEMENTARY_CHARGE_C * voltage_V / (ELECTRON_MASS_kg * SPEED_OF_LIGHT_m_s**2)
+
+
+def relativistic_wavelength_nm(voltage_V):
+    """
+    Relativistic electron wavelength for an accelerating voltage, the voltage can be an array.
+    """
+    voltage_V = np.asarray(voltage_V, dtype=float)
+
+    energy_J = ELEMENTARY_CHARGE_C * voltage_V
+    momentum2 = 2.0 * ELECTRON_MASS_kg * energy_J * (1.0 + energy_J / (2.0 * ELECTRON_MASS_kg * SPEED_OF_LIGHT_m_s**2))
+    wavelength_m = PLANCK_CONSTANT_Js / np.sqrt(momentum2)
+
+    return wavelength_m * 1.0e9
+
+
+def interaction_constant_rad_V_nm(voltage_V):
+    """
+    Interaction constant :math:`\\sigma = 2 \\pi \\gamma m_0 e \\lambda / h^2` in rad/(V nm), the voltage can be an
+    array.
+    """
+    wavelength_m = relativistic_wavelength_nm(voltage_V) * 1.0e-9
+    sigma_rad_V_m = 2.0 * np.pi * relativistic_factor(voltage_V) * ELECTRON_MASS_kg * ELEMENTARY_CHARGE_C * \
+        wavelength_m / PLANCK_CONSTANT_Js**2
+
+    return sigma_rad_V_m * 1.0e-9
+
+
+def two_theta_rad(g_1_nm, voltage_V):
+    """
+    Scattering angles :math:`2 \\theta = 2 \\arcsin(\\lambda g / 2)` of reflections.
+
+    The result has the shape of the voltages followed by the shape of the reflection lengths, so a series of
+    voltages gives one row per voltage.
+    """
+    g_1_nm = np.asarray(g_1_nm, dtype=float)
+    wavelength_nm = relativistic_wavelength_nm(voltage_V)
+
+    return 2.0 * np.arcsin(0.5 * np.multiply.outer(wavelength_nm, g_1_nm))
+
+
+@functools.lru_cache(maxsize=BRAGG_TABLE_CACHE_SIZE)
+def _get_reflections(crystal_class, lattice_parameters, g_max_1_nm, space_group):
+    crystal = crystal_class.from_lattice_parameters(lattice_parameters)
+    reflections = reflection.enumerate_reflections(crystal, g_max_1_nm, space_group=space_group)
+    reflections.flags.writeable = False
+
+    return reflections
+
+
+@functools.lru_cache(maxsize=WAVELENGTH_CACHE_SIZE)
+def _get_wavelength_nm(voltage_V):
+    return float(relativistic_wavelength_nm(voltage_V))
+
+
+def compute_bragg_table(crystal, g_max_1_nm, voltages_V, space_group=None):
+    """
+    Reflections with :math:`|g| \\leq g_{max}` of a crystal and their scattering angles :math:`2 \\theta` in radians.
+
+    With one voltage the angles have the shape (N,), with a series of voltages they have the shape
+    (number of voltages, N). The read-only reflections of the last :py:data:`BRAGG_TABLE_CACHE_SIZE` tables are cached,
+    keyed by the crystal system, its lattice parameters, the cutoff and the space group number, and the wavelength of
+    each voltage is cached. The angles are a single vectorized evaluation from the cached values.
+    """
+    key = (type(crystal), crystal.lattice_parameters, float(g_max_1_nm), space_group)
+    reflections = _get_reflections(*key)
+
+    if np.ndim(voltages_V) == 0:
+        wavelengths_nm = _get_wavelength_nm(float(voltages_V))
+    else:
+        wavelengths_nm = np.array([_get_wavelength_nm(float(voltage_V)) for voltage_V in voltages_V])
+
+    two_thetas_rad = 2.0 * np.arcsin(0.5 * np.multiply.outer(wavelengths_nm, reflections["g_1_nm"]))
+
+    return reflections, two_thetas_rad
+
+
+def clear_bragg_table_cache():
+    _get_reflections.cache_clear()
+    _get_wavelength_nm.cache_clear()
@@ -0,0 +1,162 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. py:currentmodule:: batch
+   :synopsis: Parallel indexing of many diffraction patterns with a process pool.
+
+.. moduleauthor:: Hendrix Demers <hendrix.demers@mail.mcgill.ca>
+
+Parallel indexing of many diffraction patterns with a process pool.
+
+The :py:class:`SpotPairIndex` of each phase is built once in the parent process and sent to each worker once, by the
+pool initializer, instead of with every task. The patterns are sent in chunks and the number of chunks in flight is
+bounded, so an iterable of patterns is consumed lazily.
+"""
+
+###############################################################################
+# Copyright 2017 Hendrix Demers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###############################################################################
+
+# Standard library modules.
+import collections
+import concurrent.futures
+import itertools
+import os
+
+# Third party modules.
+import numpy as np
+
+# Local modules.
+
+# Project modules.
+import electrondiffraction.indexing.spot_pair_index as spot_pair_index
+
+# Globals and constants variables.
+DEFAULT_CHUNK_SIZE = 64
+
+BATCH_SOLUTION_DTYPE = np.dtype([("phase", np.int64)] + spot_pair_index.PATTERN_SOLUTION_DTYPE.descr)
+
+# Indexes of the phases in a worker process, set by the pool initializer.
+_worker_indexes = None
+_worker_options = None
+
+
+def _initialize_worker(indexes, options):
+    global _worker_indexes, _worker_options
+    _worker_indexes = indexes
+    _worker_options = options
+
+
+def index_pattern(indexes, spots_1_nm, **options):
+    """
+    Index one pattern with each phase and return the best solution of each phase.
+
+    The solutions are a structured array of :py:data:`BATCH_SOLUTION_DTYPE` sorted by decreasing number of matched
+    spots and increasing error, the phases without candidate are omitted.
+    """
+    solutions = []
+    for phase_id, index in enumerate(indexes):
+        phase_solutions = index.index_pattern(spots_1_nm, **options)
+        if len(phase_solutions) > 0:
+            solution = np.empty(1, dtype=BATCH_SOLUTION_DTYPE)
+            solution["phase"] = phase_id
+            for name in spot_pair_index.PATTERN_SOLUTION_DTYPE.names:
+                solution[name] = phase_solutions[0][name]
+            solutions.append(solution)
+
+    if len(solutions) == 0:
+        return np.empty(0, dtype=BATCH_SOLUTION_DTYPE)
+
+    solutions = np.concatenate(solutions)
+    order = np.lexsort((solutions["error"], -solutions["number_matched"]))
+
+    return solutions[order]
+
+
+def _index_chunk(chunk):
+    return [(pattern_id, index_pattern(_worker_indexes, spots_1_nm, **_worker_options))
+            for pattern_id, spots_1_nm in chunk]
+
+
+def _create_indexes(phases, g_max_1_nm):
+    indexes = []
+    for phase in phases:
+        if isinstance(phase, spot_pair_index.SpotPairIndex):
+            indexes.append(phase)
+        else:
+            indexes.append(spot_pair_index.SpotPairIndex(phase, g_max_1_nm))
+
+    return indexes
+
+
+def _iter_chunks(patterns, chunk_size):
+    numbered_patterns = enumerate(patterns)
+    while True:
+        chunk = list(itertools.islice(numbered_patterns, chunk_size))
+        if len(chunk) == 0:
+            return
+        yield chunk
+
+
+def index_patterns(patterns, phases, g_max_1_nm=None, max_workers=None, ordered=True,
+                   chunk_size=DEFAULT_CHUNK_SIZE, **options):
+    """
+    Index an iterable of spot arrays with a process pool and generate ``(pattern_id, solutions)`` pairs.
+
+    The phases are :py:class:`CrystalSystem` or prebuilt :py:class:`SpotPairIndex`, ``g_max_1_nm`` is required to
+    build the index of a crystal system. With ``ordered``, the results are generated in the order of the patterns,
+    otherwise as soon as they are completed. The other options are passed to
+    :py:meth:`SpotPairIndex.index_pattern`. With ``max_workers=1`` the patterns are indexed in this process.
+    """
+    if isinstance(phases, spot_pair_index.SpotPairIndex) or not isinstance(phases, (list, tuple)):
+        phases = [phases]
+    if g_max_1_nm is None and not all(isinstance(phase, spot_pair_index.SpotPairIndex) for phase in phases):
+        raise ValueError("g_max_1_nm is required to build the index of a crystal system")
+
+    indexes = _create_indexes(phases, g_max_1_nm)
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+
+    if max_workers == 1:
+        for pattern_id, spots_1_nm in enumerate(patterns):
+            yield pattern_id, index_pattern(indexes, spots_1_nm, **options)
+        return
+
+    maximum_pending = 4 * max_workers
+    chunks = _iter_chunks(patterns, chunk_size)
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers, initializer=_initialize_worker,
+                                                initargs=(indexes, options)) as executor:
+        pending = collections.deque(executor.submit(_index_chunk, chunk)
+                                    for chunk in itertools.islice(chunks, maximum_pending))
+
+        while pending:
+            if ordered:
+                future = pending.popleft()
+                completed = [future]
+            else:
+                done, _not_done = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                completed = [future for future in pending if future in done]
+                for future in completed:
+                    pending.remove(future)
+
+            for future in completed:
+                for result in future.result():
+                    yield result
+
+                for chunk in itertools.islice(chunks, 1):
+                    pending.append(executor.submit(_index_chunk, chunk))
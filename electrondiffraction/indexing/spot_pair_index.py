@@ -0,0 +1,267 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. py:currentmodule:: spot_pair_index
+   :synopsis: Lookup index of reflection pairs to index zone axis diffraction patterns.
+
+.. moduleauthor:: Hendrix Demers <hendrix.demers@mail.mcgill.ca>
+
+Lookup index of reflection pairs to index zone axis diffraction patterns.
+
+Every pair of non-collinear reflections of a phase is described by the triplet :math:`(|g_1|, |g_2|, \\theta)`, with
+:math:`|g_1| \\leq |g_2|` and :math:`\\theta` the angle between the two reciprocal lattice vectors. The triplets are
+sorted by :math:`|g_1|`, so a query only scans the pairs inside the :math:`|g_1|` tolerance window. Each unordered
+pair is stored once, a measured pair of nearly equal lengths is also searched with its two spots exchanged.
+
+The index holds all the :math:`N (N - 1) / 2` pairs of the :math:`N` reflections, its memory grows as :math:`N^2`,
+about 40 bytes per pair, e.g. 200 MB for 3000 reflections. The pairs are built in chunks of rows, so the temporary
+arrays of the construction stay bounded by the chunk size times :math:`N`.
+"""
+
+###############################################################################
+# Copyright 2017 Hendrix Demers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###############################################################################
+
+# Standard library modules.
+
+# Third party modules.
+import numpy as np
+
+# Local modules.
+
+# Project modules.
+import electrondiffraction.crystallography.reflection as reflection
+
+# Globals and constants variables.
+DEFAULT_LENGTH_TOLERANCE = 0.02
+DEFAULT_ANGLE_TOLERANCE_RAD = np.radians(1.0)
+
+# Pairs with a cosine closer to +-1 than this limit are collinear and do not define a zone axis.
+_COLLINEAR_LIMIT = 1.0 - 1.0e-9
+
+SOLUTION_DTYPE = np.dtype([("hkl1", np.int64, (3,)), ("hkl2", np.int64, (3,)), ("zone_axis", np.int64, (3,)),
+                           ("error", np.float64)])
+
+PATTERN_SOLUTION_DTYPE = np.dtype(SOLUTION_DTYPE.descr + [("number_matched", np.int64)])
+
+DEFAULT_CHUNK_SIZE = 1024
+
+DEFAULT_INDEX_TOLERANCE = 0.15
+DEFAULT_MAXIMUM_CANDIDATES = 256
+
+# Limit of the cosine between the two reference spots of a pattern, more collinear pairs are skipped.
+_REFERENCE_COLLINEAR_LIMIT = 0.95
+
+
+def zone_axes(hkls1, hkls2):
+    """
+    Zone axes [uvw] common to two arrays of reflections, reduced by their greatest common divisor.
+    """
+    uvws = np.cross(np.asarray(hkls1, dtype=np.int64), np.asarray(hkls2, dtype=np.int64))
+    divisors = np.gcd.reduce(uvws, axis=-1, keepdims=True)
+
+    return uvws // np.maximum(divisors, 1)
+
+
+def _select_reference_spots(spots_1_nm):
+    """
+    Indices of the shortest spot and of the next shortest spot not collinear with it.
+    """
+    lengths_1_nm = np.sqrt(np.sum(spots_1_nm**2, axis=-1))
+    order = np.argsort(lengths_1_nm, kind="stable")
+    first = order[0]
+
+    for second in order[1:]:
+        cos_angle = np.dot(spots_1_nm[first], spots_1_nm[second]) / (lengths_1_nm[first] * lengths_1_nm[second])
+        if abs(cos_angle) < _REFERENCE_COLLINEAR_LIMIT:
+            return first, second
+
+    return None
+
+
+def measure_spot_pair(spot1_1_nm, spot2_1_nm):
+    """
+    Lengths and angle of two measured spot vectors, in 2D detector or 3D Cartesian coordinates.
+    """
+    spot1_1_nm = np.asarray(spot1_1_nm, dtype=float)
+    spot2_1_nm = np.asarray(spot2_1_nm, dtype=float)
+
+    g1_1_nm = np.sqrt(np.dot(spot1_1_nm, spot1_1_nm))
+    g2_1_nm = np.sqrt(np.dot(spot2_1_nm, spot2_1_nm))
+    cos_angle = np.clip(np.dot(spot1_1_nm, spot2_1_nm) / (g1_1_nm * g2_1_nm), -1.0, 1.0)
+
+    return g1_1_nm, g2_1_nm, np.arccos(cos_angle)
+
+
+class SpotPairIndex(object):
+    """
+    Index of the :math:`(|g_1|, |g_2|, \\theta)` triplets of all the reflection pairs with :math:`|g| \\leq g_{max}`.
+    """
+    def __init__(self, crystal, g_max_1_nm, chunk_size=DEFAULT_CHUNK_SIZE):
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be positive, got {}".format(chunk_size))
+
+        self.crystal = crystal
+        self.g_max_1_nm = g_max_1_nm
+
+        reflections = reflection.enumerate_reflections(crystal, g_max_1_nm)
+        self.hkls = reflections["hkl"]
+        self.g_1_nm = reflections["g_1_nm"]
+
+        self._create_index(chunk_size)
+
+    def __len__(self):
+        return len(self.g1_1_nm)
+
+    def _create_index(self, chunk_size):
+        hkls = self.hkls.astype(float)
+        g_1_nm = self.g_1_nm
+        g_star_hkls = np.dot(hkls, self.crystal.g_star_1_nm2)
+
+        # Rank of each reflection by length, each unordered pair is kept once with the shortest reflection first.
+        ranks = np.empty(len(g_1_nm), dtype=np.int64)
+        ranks[np.argsort(g_1_nm, kind="stable")] = np.arange(len(g_1_nm))
+
+        all_indices1 = []
+        all_indices2 = []
+        all_angles_rad = []
+        for start in range(0, len(g_1_nm), chunk_size):
+            stop = start + chunk_size
+            cos_angles = np.dot(g_star_hkls[start:stop], hkls.T) / np.outer(g_1_nm[start:stop], g_1_nm)
+
+            mask = (ranks[start:stop, np.newaxis] < ranks[np.newaxis, :]) & (np.abs(cos_angles) < _COLLINEAR_LIMIT)
+            indices1, indices2 = np.nonzero(mask)
+            all_angles_rad.append(np.arccos(cos_angles[indices1, indices2]))
+            all_indices1.append(indices1 + start)
+            all_indices2.append(indices2)
+
+        indices1 = np.concatenate(all_indices1) if all_indices1 else np.empty(0, dtype=np.int64)
+        indices2 = np.concatenate(all_indices2) if all_indices2 else np.empty(0, dtype=np.int64)
+        angles_rad = np.concatenate(all_angles_rad) if all_angles_rad else np.empty(0)
+
+        order = np.argsort(g_1_nm[indices1], kind="stable")
+        self.indices1 = indices1[order]
+        self.indices2 = indices2[order]
+        self.g1_1_nm = g_1_nm[self.indices1]
+        self.g2_1_nm = g_1_nm[self.indices2]
+        self.angles_rad = angles_rad[order]
+
+    def _search(self, g1_1_nm, g2_1_nm, angle_rad, length_tolerance, angle_tolerance_rad):
+        """
+        Stored pairs matching a triplet with the shortest stored reflection matching ``g1_1_nm`` and their errors.
+        """
+        start = np.searchsorted(self.g1_1_nm, g1_1_nm * (1.0 - length_tolerance), side="left")
+        stop = np.searchsorted(self.g1_1_nm, g1_1_nm * (1.0 + length_tolerance), side="right")
+
+        errors_g1 = (self.g1_1_nm[start:stop] - g1_1_nm) / (g1_1_nm * length_tolerance)
+        errors_g2 = (self.g2_1_nm[start:stop] - g2_1_nm) / (g2_1_nm * length_tolerance)
+        errors_angle = (self.angles_rad[start:stop] - angle_rad) / angle_tolerance_rad
+
+        mask = (np.abs(errors_g2) <= 1.0) & (np.abs(errors_angle) <= 1.0)
+        candidates = np.flatnonzero(mask) + start
+        errors = np.sqrt(errors_g1[mask]**2 + errors_g2[mask]**2 + errors_angle[mask]**2)
+
+        return candidates, errors
+
+    def query(self, g1_1_nm, g2_1_nm, angle_rad, length_tolerance=DEFAULT_LENGTH_TOLERANCE,
+              angle_tolerance_rad=DEFAULT_ANGLE_TOLERANCE_RAD):
+        """
+        Candidate solutions for a measured triplet, sorted by increasing error.
+
+        The lengths match within the relative ``length_tolerance`` and the angle within ``angle_tolerance_rad``. The
+        error is the quadratic sum of the deviations normalized by their tolerance. Solutions are returned as a
+        structured array of :py:data:`SOLUTION_DTYPE` with ``hkl1`` matching the first measured length. When the
+        two lengths are within the tolerance of each other, both assignments of the stored reflections to the
+        measured spots are returned.
+        """
+        is_swapped = g1_1_nm > g2_1_nm
+        if is_swapped:
+            g1_1_nm, g2_1_nm = g2_1_nm, g1_1_nm
+
+        candidates, errors = self._search(g1_1_nm, g2_1_nm, angle_rad, length_tolerance, angle_tolerance_rad)
+        hkls1 = self.hkls[self.indices1[candidates]]
+        hkls2 = self.hkls[self.indices2[candidates]]
+
+        # The shortest measured spot can match the longest reflection of a stored pair of nearly equal lengths.
+        if g1_1_nm * (1.0 + length_tolerance) >= g2_1_nm * (1.0 - length_tolerance):
+            reversed_candidates, reversed_errors = self._search(g2_1_nm, g1_1_nm, angle_rad, length_tolerance,
+                                                                angle_tolerance_rad)
+            hkls1 = np.concatenate([hkls1, self.hkls[self.indices2[reversed_candidates]]])
+            hkls2 = np.concatenate([hkls2, self.hkls[self.indices1[reversed_candidates]]])
+            errors = np.concatenate([errors, reversed_errors])
+
+        if is_swapped:
+            hkls1, hkls2 = hkls2, hkls1
+
+        solutions = np.empty(len(errors), dtype=SOLUTION_DTYPE)
+        solutions["hkl1"] = hkls1
+        solutions["hkl2"] = hkls2
+        solutions["zone_axis"] = zone_axes(hkls1, hkls2)
+        solutions["error"] = errors
+
+        return solutions[np.argsort(errors, kind="stable")]
+
+    def index_spots(self, spot1_1_nm, spot2_1_nm, length_tolerance=DEFAULT_LENGTH_TOLERANCE,
+                    angle_tolerance_rad=DEFAULT_ANGLE_TOLERANCE_RAD):
+        """
+        Candidate solutions for two measured spot vectors, see :py:meth:`query`.
+        """
+        g1_1_nm, g2_1_nm, angle_rad = measure_spot_pair(spot1_1_nm, spot2_1_nm)
+
+        return self.query(g1_1_nm, g2_1_nm, angle_rad, length_tolerance, angle_tolerance_rad)
+
+    def index_pattern(self, spots_1_nm, length_tolerance=DEFAULT_LENGTH_TOLERANCE,
+                      angle_tolerance_rad=DEFAULT_ANGLE_TOLERANCE_RAD, index_tolerance=DEFAULT_INDEX_TOLERANCE,
+                      maximum_candidates=DEFAULT_MAXIMUM_CANDIDATES):
+        """
+        Index a whole pattern from its (K, 2) or (K, 3) array of spot vectors, the direct beam excluded.
+
+        The two shortest non-collinear spots are indexed with :py:meth:`index_spots`. Each candidate is verified on
+        the other spots: a spot written as :math:`a s_1 + b s_2` must have the indices
+        :math:`a h_1 + b h_2` within ``index_tolerance`` of integers. The solutions, as a structured array of
+        :py:data:`PATTERN_SOLUTION_DTYPE`, are sorted by decreasing number of matched spots and increasing error.
+        """
+        spots_1_nm = np.asarray(spots_1_nm, dtype=float)
+        if len(spots_1_nm) < 2:
+            return np.empty(0, dtype=PATTERN_SOLUTION_DTYPE)
+
+        references = _select_reference_spots(spots_1_nm)
+        if references is None:
+            return np.empty(0, dtype=PATTERN_SOLUTION_DTYPE)
+        first, second = references
+
+        candidates = self.index_spots(spots_1_nm[first], spots_1_nm[second], length_tolerance,
+                                      angle_tolerance_rad)[:maximum_candidates]
+
+        basis = np.stack([spots_1_nm[first], spots_1_nm[second]], axis=-1)
+        coefficients = np.linalg.lstsq(basis, spots_1_nm.T, rcond=None)[0].T
+        residuals_1_nm = spots_1_nm - np.dot(coefficients, basis.T)
+        is_in_plane = np.sqrt(np.sum(residuals_1_nm**2, axis=-1)) <= \
+            length_tolerance * np.sqrt(np.sum(spots_1_nm**2, axis=-1))
+
+        hkl_bases = np.stack([candidates["hkl1"], candidates["hkl2"]], axis=1).astype(float)
+        predicted_hkls = np.einsum("kj,cji->cki", coefficients, hkl_bases)
+        deviations = np.max(np.abs(predicted_hkls - np.round(predicted_hkls)), axis=-1)
+        numbers_matched = np.sum((deviations <= index_tolerance) & is_in_plane, axis=-1)
+
+        solutions = np.empty(len(candidates), dtype=PATTERN_SOLUTION_DTYPE)
+        for name in SOLUTION_DTYPE.names:
+            solutions[name] = candidates[name]
+        solutions["number_matched"] = numbers_matched
+
+        order = np.lexsort((solutions["error"], -solutions["number_matched"]))
+
+        return solutions[order]
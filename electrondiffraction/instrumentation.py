@@ -0,0 +1,249 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. py:currentmodule:: instrumentation
+   :synopsis: Opt-in call counters and timers of the crystallography hot paths.
+
+.. moduleauthor:: Hendrix Demers <hendrix.demers@mail.mcgill.ca>
+
+Opt-in call counters and timers of the crystallography hot paths.
+
+The instrumentation counts the metric tensor constructions, the angle evaluations and the vector function calls of
+each crystal and accumulates their self wall time, the time spent in a function minus the time of the instrumented
+calls it makes, so the totals of nested functions do not overlap. It is disabled by default and then costs nothing:
+the decorated functions are the plain functions, the timing wrappers replace them in their module or class only
+while the instrumentation is enabled. A reference to a function taken before enabling, such as
+``from vector import dot_product``, is therefore not instrumented. It is enabled for a block of code with the
+:py:func:`instrument` context manager::
+
+    with instrumentation.instrument() as statistics:
+        run_indexing()
+    print(statistics.summary())
+
+or for the whole process by setting the environment variable ``ELECTRONDIFFRACTION_INSTRUMENTATION`` to ``1``, the
+summary is then written to the standard error at exit.
+"""
+
+###############################################################################
+# Copyright 2017 Hendrix Demers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###############################################################################
+
+# Standard library modules.
+import atexit
+import contextlib
+import functools
+import os
+import sys
+import time
+
+# Third party modules.
+
+# Local modules.
+
+# Project modules.
+
+# Globals and constants variables.
+ENVIRONMENT_VARIABLE = "ELECTRONDIFFRACTION_INSTRUMENTATION"
+
+CATEGORY_TENSOR = "tensor"
+CATEGORY_ANGLE = "angle"
+CATEGORY_VECTOR = "vector"
+
+
+class Statistics(object):
+    """
+    Number of calls and accumulated self wall time of each (crystal, function) pair.
+    """
+    def __init__(self):
+        self.counts = {}
+        self.times_s = {}
+        self.categories = {}
+
+    def record(self, crystal_key, name, category, time_s):
+        key = (crystal_key, name)
+        self.counts[key] = self.counts.get(key, 0) + 1
+        self.times_s[key] = self.times_s.get(key, 0.0) + time_s
+        self.categories[name] = category
+
+    def reset(self):
+        self.counts.clear()
+        self.times_s.clear()
+        self.categories.clear()
+
+    def count(self, name=None, crystal=None, category=None):
+        """
+        Number of calls, optionally restricted to a function name, a crystal or a category.
+        """
+        total = 0
+        for (crystal_key, key_name), count in self.counts.items():
+            if name is not None and key_name != name:
+                continue
+            if crystal is not None and crystal_key != get_crystal_key(crystal):
+                continue
+            if category is not None and self.categories[key_name] != category:
+                continue
+            total += count
+
+        return total
+
+    def summary(self):
+        """
+        Table of the calls sorted by decreasing accumulated time.
+        """
+        lines = ["{:30s} {:40s} {:8s} {:>10s} {:>12s}".format("crystal", "function", "category", "calls", "self (s)")]
+        for key in sorted(self.counts, key=lambda item: -self.times_s[item]):
+            crystal_key, name = key
+            lines.append("{:30s} {:40s} {:8s} {:>10d} {:>12.6f}".format(crystal_key, name, self.categories[name],
+                                                                        self.counts[key], self.times_s[key]))
+
+        return "\n".join(lines)
+
+
+class _State(object):
+    def __init__(self):
+        self.enabled = False
+        self.statistics = Statistics()
+        self.callback = None
+        self.child_times_s = []
+
+
+_state = _State()
+
+# Plain function, timing wrapper and installed flag of each instrumented function.
+_registry = []
+
+
+def get_crystal_key(crystal):
+    return "{}@{:x}".format(type(crystal).__name__, id(crystal))
+
+
+def is_enabled():
+    return _state.enabled
+
+
+def get_statistics():
+    return _state.statistics
+
+
+def enable(callback=None):
+    """
+    Enable the instrumentation, ``callback(crystal_key, name, category, time_s)`` is called for each event.
+    """
+    _state.enabled = True
+    _state.callback = callback
+    _install_wrappers(True)
+
+
+def disable():
+    _state.enabled = False
+    _state.callback = None
+    _install_wrappers(False)
+
+
+def _get_owner(function):
+    owner = sys.modules[function.__module__]
+    for name in function.__qualname__.split(".")[:-1]:
+        owner = getattr(owner, name)
+
+    return owner
+
+
+def _install_wrappers(enabled):
+    for entry in _registry:
+        function, wrapper, installed = entry
+        if installed == enabled:
+            continue
+
+        try:
+            owner = _get_owner(function)
+        except (KeyError, AttributeError):
+            # The module or the class is still being defined, the decorator installs the wrapper.
+            continue
+
+        setattr(owner, function.__name__, wrapper if enabled else function)
+        entry[2] = enabled
+
+
+def _record(crystal, name, category, time_s):
+    crystal_key = get_crystal_key(crystal)
+    _state.statistics.record(crystal_key, name, category, time_s)
+    if _state.callback is not None:
+        _state.callback(crystal_key, name, category, time_s)
+
+
+def record(crystal, name, category, time_s):
+    """
+    Record an event timed by the caller, its time is excluded from the self time of the enclosing instrumented call.
+    """
+    _record(crystal, name, category, time_s)
+    if _state.child_times_s:
+        _state.child_times_s[-1] += time_s
+
+
+@contextlib.contextmanager
+def instrument(callback=None):
+    """
+    Enable the instrumentation in a block of code and yield the :py:class:`Statistics` of the block.
+    """
+    previous_state = (_state.enabled, _state.statistics, _state.callback)
+
+    statistics = Statistics()
+    _state.statistics = statistics
+    enable(callback)
+    try:
+        yield statistics
+    finally:
+        _state.enabled, _state.statistics, _state.callback = previous_state
+        _install_wrappers(_state.enabled)
+
+
+def instrumented(category):
+    """
+    Decorator counting and timing the calls of a function whose first argument is the crystal.
+
+    The function is returned unchanged, its timing wrapper is only installed while the instrumentation is enabled.
+    """
+    def decorator(function):
+        name = function.__qualname__
+
+        @functools.wraps(function)
+        def wrapper(crystal, *args, **kwargs):
+            child_times_s = _state.child_times_s
+            child_times_s.append(0.0)
+            start_s = time.perf_counter()
+            try:
+                return function(crystal, *args, **kwargs)
+            finally:
+                time_s = time.perf_counter() - start_s
+                self_time_s = time_s - child_times_s.pop()
+                if child_times_s:
+                    child_times_s[-1] += time_s
+                _record(crystal, name, category, self_time_s)
+
+        _registry.append([function, wrapper, _state.enabled])
+
+        return wrapper if _state.enabled else function
+
+    return decorator
+
+
+def _write_summary():  # pragma: no cover
+    sys.stderr.write(_state.statistics.summary() + "\n")
+
+
+if os.environ.get(ENVIRONMENT_VARIABLE, "0").lower() not in ("", "0", "false", "no"):  # pragma: no cover
+    enable()
+    atexit.register(_write_summary)
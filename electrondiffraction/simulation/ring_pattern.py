@@ -0,0 +1,254 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. py:currentmodule:: ring_pattern
+   :synopsis: Kinematical ring (powder) diffraction pattern simulation.
+
+.. moduleauthor:: Hendrix Demers <hendrix.demers@mail.mcgill.ca>
+
+Kinematical ring (powder) diffraction pattern simulation.
+
+The reflections of each phase are enumerated and collapsed in families of the Laue class once. The integrated
+intensity of the ring of a family of multiplicity :math:`m` is
+
+.. math::
+
+    I_g = \\frac{m |F_g|^2}{g},
+
+with the :math:`1/g` Lorentz factor of the small electron Bragg angles. The radial profile is built without a loop over
+the rings: the intensities are deposited on a uniform grid with linear weights between the two nearest nodes, one
+``np.bincount`` for all the phases, and the deposits are convolved with the peak shape by FFT. Each phase gives one
+basis profile, the pattern of a mixture is the linear combination of the basis profiles with the phase fractions.
+The phase fractions of a measured profile are fitted by non-negative least squares.
+"""
+
+###############################################################################
+# Copyright 2017 Hendrix Demers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###############################################################################
+
+# Standard library modules.
+
+# Third party modules.
+import numpy as np
+
+# Local modules.
+
+# Project modules.
+import electrondiffraction.crystallography.reflection as reflection
+import electrondiffraction.crystallography.point_group as point_group
+import electrondiffraction.crystallography.d_spacing as d_spacing
+import electrondiffraction.crystallography.space_group as space_group_module
+
+# Globals and constants variables.
+KERNEL_HALF_WIDTH_FWHM = 10.0
+"""Half width, in multiples of the FWHM, of the peak shape used for the convolution."""
+
+SAMPLES_PER_FWHM = 20
+"""Number of points per FWHM of the uniform grid on which a non-uniform q grid is sampled."""
+
+
+class PowderPhase(object):
+    """
+    Rings of one phase: the unique reflection families with :math:`g \\leq g_{max}`, in increasing g, and their
+    intensities.
+
+    The optional ``structure_factors`` callable returns the (N,) structure factors of a (N, 3) array of Miller
+    indices, for example :py:meth:`Structure.structure_factors`, it is evaluated once per family. All the structure
+    factors are one when it is not given. The systematic absences of the optional space group are removed and the
+    families are those of its Laue class, unless ``laue_class`` is given, otherwise of the holohedry of the crystal
+    system.
+    """
+    def __init__(self, crystal, g_max_1_nm, structure_factors=None, space_group=None, laue_class=None, name=None):
+        self.crystal = crystal
+        self.g_max_1_nm = g_max_1_nm
+        self.name = name
+
+        if space_group is not None:
+            space_group = space_group_module.get_space_group(space_group, crystal)
+
+        reflections = reflection.enumerate_reflections(crystal, g_max_1_nm, space_group=space_group)
+        if space_group is not None and laue_class is None:
+            group = space_group.get_laue_class(crystal)
+        else:
+            group = point_group.get_laue_class(crystal, laue_class)
+        hkls, multiplicities, _family_ids = group.families(reflections["hkl"])
+        g_1_nm = d_spacing.g_lengths_1_nm(crystal, hkls)
+
+        order = np.argsort(g_1_nm, kind="stable")
+        self.hkls = hkls[order]
+        self.multiplicities = multiplicities[order]
+        self.g_1_nm = g_1_nm[order]
+
+        if structure_factors is None:
+            self.structure_factors2 = np.ones(len(self.hkls))
+        else:
+            self.structure_factors2 = np.abs(structure_factors(self.hkls))**2
+
+        self.intensities = self.multiplicities * self.structure_factors2 / self.g_1_nm
+
+    def __len__(self):
+        return len(self.hkls)
+
+
+def peak_shape(q_1_nm, fwhm_1_nm, eta=0.0):
+    """
+    Pseudo-Voigt peak of unit area centered at zero, ``eta`` is the Lorentzian fraction.
+    """
+    sigma_1_nm = fwhm_1_nm / (2.0 * np.sqrt(2.0 * np.log(2.0)))
+    gamma_1_nm = fwhm_1_nm / 2.0
+
+    gaussian = np.exp(-0.5 * (q_1_nm / sigma_1_nm)**2) / (sigma_1_nm * np.sqrt(2.0 * np.pi))
+    lorentzian = gamma_1_nm / (np.pi * (q_1_nm**2 + gamma_1_nm**2))
+
+    return (1.0 - eta) * gaussian + eta * lorentzian
+
+
+def _get_grid_step(q_1_nm, fwhm_1_nm):
+    """
+    Step of the uniform grid of the profiles: the step of a uniform q grid, otherwise fine enough for the peaks but
+    never below the largest step of the q grid, so one tiny step does not create a huge grid.
+    """
+    steps_1_nm = np.diff(q_1_nm)
+    if np.allclose(steps_1_nm, steps_1_nm[0], rtol=1.0e-6, atol=0.0):
+        return np.min(steps_1_nm)
+
+    return min(np.max(steps_1_nm), fwhm_1_nm / SAMPLES_PER_FWHM)
+
+
+def _nnls(matrix, vector):
+    """
+    Non-negative least squares solution of :math:`\\min |A x - b|, x \\geq 0` by the Lawson-Hanson active set method.
+    """
+    number_variables = matrix.shape[1]
+    tolerance = 10.0 * np.finfo(float).eps * np.linalg.norm(matrix, 1) * max(matrix.shape)
+
+    solution = np.zeros(number_variables)
+    is_passive = np.zeros(number_variables, dtype=bool)
+    gradient = np.dot(matrix.T, vector)
+
+    for _iteration in range(3 * number_variables):
+        if np.all(is_passive) or np.max(gradient[~is_passive]) <= tolerance:
+            break
+        is_passive[np.argmax(np.where(is_passive, -np.inf, gradient))] = True
+
+        while True:
+            candidate = np.zeros(number_variables)
+            candidate[is_passive] = np.linalg.lstsq(matrix[:, is_passive], vector, rcond=None)[0]
+            if np.all(candidate[is_passive] > tolerance):
+                solution = candidate
+                break
+
+            # Move toward the candidate until a variable reaches zero and remove it from the passive set.
+            is_negative = is_passive & (candidate <= tolerance)
+            differences = solution[is_negative] - candidate[is_negative]
+            step = np.min(np.where(differences > 0.0, solution[is_negative] / np.maximum(differences, tolerance), 0.0))
+            solution = solution + step * (candidate - solution)
+            is_passive &= solution > tolerance
+            solution[~is_passive] = 0.0
+
+        gradient = np.dot(matrix.T, vector - np.dot(matrix, solution))
+
+    return solution
+
+
+class RingPatternSimulator(object):
+    """
+    Radial intensity profiles of one or many phases on a grid of scattering vector magnitude q in 1/nm.
+    """
+    def __init__(self, phases):
+        if isinstance(phases, PowderPhase):
+            phases = [phases]
+        self.phases = list(phases)
+
+        self._phase_ids = np.concatenate([np.full(len(phase), index) for index, phase in enumerate(self.phases)])
+        self._g_1_nm = np.concatenate([phase.g_1_nm for phase in self.phases])
+        self._intensities = np.concatenate([phase.intensities for phase in self.phases])
+
+    def __len__(self):
+        return len(self.phases)
+
+    def simulate_basis(self, q_1_nm, fwhm_1_nm, eta=0.0, scales=None):
+        """
+        Profile of each phase, shape (number of phases, len(q)), on the increasing grid ``q_1_nm``.
+
+        The optional ``scales`` are the isotropic lattice dilations :math:`1 + \\epsilon` of each phase, the rings
+        move to :math:`g / (1 + \\epsilon)` without enumerating the reflections again. A non-uniform grid is
+        sampled from a uniform grid with :py:data:`SAMPLES_PER_FWHM` points per FWHM, or with the largest step of the
+        grid when it is finer.
+        """
+        q_1_nm = np.asarray(q_1_nm, dtype=float)
+        if q_1_nm.ndim != 1 or len(q_1_nm) < 2 or np.any(np.diff(q_1_nm) <= 0.0):
+            raise ValueError("q_1_nm must be an increasing 1D grid of at least two points")
+        if fwhm_1_nm <= 0.0:
+            raise ValueError("fwhm_1_nm must be positive, got {}".format(fwhm_1_nm))
+
+        g_1_nm = self._g_1_nm
+        if scales is not None:
+            scales = np.broadcast_to(np.asarray(scales, dtype=float), (len(self.phases),))
+            g_1_nm = g_1_nm / scales[self._phase_ids]
+
+        step_1_nm = _get_grid_step(q_1_nm, fwhm_1_nm)
+        margin_1_nm = KERNEL_HALF_WIDTH_FWHM * fwhm_1_nm
+        number_kernel = int(np.ceil(margin_1_nm / step_1_nm))
+        start_1_nm = q_1_nm[0] - number_kernel * step_1_nm
+        number_grid = int(np.ceil((q_1_nm[-1] - q_1_nm[0]) / step_1_nm)) + 2 * number_kernel + 2
+
+        positions = (g_1_nm - start_1_nm) / step_1_nm
+        mask = (positions >= 0.0) & (positions < number_grid - 1)
+        indices = np.floor(positions[mask]).astype(int)
+        fractions = positions[mask] - indices
+        offsets = self._phase_ids[mask] * number_grid + indices
+        intensities = self._intensities[mask]
+
+        size = len(self.phases) * number_grid
+        deposits = np.bincount(offsets, weights=intensities * (1.0 - fractions), minlength=size) + \
+            np.bincount(offsets + 1, weights=intensities * fractions, minlength=size)
+        deposits = deposits.reshape(len(self.phases), number_grid)
+
+        kernel = peak_shape(np.arange(-number_kernel, number_kernel + 1) * step_1_nm, fwhm_1_nm, eta)
+        number_fft = number_grid + len(kernel) - 1
+        profiles = np.fft.irfft(np.fft.rfft(deposits, number_fft) * np.fft.rfft(kernel, number_fft), number_fft)
+        profiles = profiles[:, number_kernel:number_kernel + number_grid]
+
+        grid_1_nm = start_1_nm + np.arange(number_grid) * step_1_nm
+        return np.array([np.interp(q_1_nm, grid_1_nm, profile) for profile in profiles])
+
+    def simulate(self, q_1_nm, fwhm_1_nm, fractions=None, eta=0.0, scales=None):
+        """
+        Profile of the mixture of the phases with the given fractions, equal fractions by default.
+        """
+        basis = self.simulate_basis(q_1_nm, fwhm_1_nm, eta, scales)
+        if fractions is None:
+            fractions = np.full(len(self.phases), 1.0 / len(self.phases))
+
+        return np.dot(fractions, basis)
+
+    def fit_phase_fractions(self, q_1_nm, profile, fwhm_1_nm, eta=0.0, scales=None):
+        """
+        Non-negative least-squares phase fractions of a measured profile.
+
+        Returns the fractions, normalized to a sum of one, and the scale of the profile, so the fitted profile is
+        ``scale * simulate(q_1_nm, fwhm_1_nm, fractions, eta, scales)``. The fractions are in the intensity units of
+        the phases. All the fractions are zero when no phase contributes to the profile.
+        """
+        basis = self.simulate_basis(q_1_nm, fwhm_1_nm, eta, scales)
+        weights = _nnls(basis.T, np.asarray(profile, dtype=float))
+
+        scale = np.sum(weights)
+        if scale <= 0.0:
+            return np.zeros(len(self.phases)), 0.0
+
+        return weights / scale, scale
@@ -0,0 +1,140 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. py:currentmodule:: zone_axis
+   :synopsis: Kinematical zone axis diffraction pattern simulation.
+
+.. moduleauthor:: Hendrix Demers <hendrix.demers@mail.mcgill.ca>
+
+Kinematical zone axis diffraction pattern simulation.
+
+The reflections are enumerated once per crystal and converted to a Cartesian reciprocal frame. For each zone axis the
+excitation error of every reflection is computed in one vectorized pass,
+
+.. math::
+
+    s_g = -\\frac{2 k g_{\\parallel} + g^2}{2 k},
+
+with :math:`k = 1/\\lambda` and :math:`g_{\\parallel}` the component of :math:`g` along the beam, and the
+kinematical intensity of a foil of thickness :math:`t` is
+
+.. math::
+
+    I_g = |F_g|^2 \\left(\\frac{\\sin(\\pi t s_g)}{\\pi s_g}\\right)^2.
+"""
+
+###############################################################################
+# Copyright 2017 Hendrix Demers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###############################################################################
+
+# Standard library modules.
+
+# Third party modules.
+import numpy as np
+
+# Local modules.
+
+# Project modules.
+import electrondiffraction.crystallography.reflection as reflection
+import electrondiffraction.crystallography.vector as vector
+import electrondiffraction.electron_optics as electron_optics
+
+# Globals and constants variables.
+
+
+def _detector_basis(beam_direction):
+    """
+    Orthonormal basis of the plane perpendicular to the beam direction.
+    """
+    reference = np.eye(3)[np.argmin(np.abs(beam_direction))]
+    axis_x = reference - np.dot(reference, beam_direction) * beam_direction
+    axis_x /= np.sqrt(np.dot(axis_x, axis_x))
+    axis_y = np.cross(beam_direction, axis_x)
+
+    return axis_x, axis_y
+
+
+class DiffractionPattern(object):
+    """
+    Spots of a simulated diffraction pattern, positions are in 1/nm in the plane perpendicular to the beam.
+    """
+    def __init__(self, hkls, positions_1_nm, excitation_errors_1_nm, intensities):
+        self.hkls = hkls
+        self.positions_1_nm = positions_1_nm
+        self.excitation_errors_1_nm = excitation_errors_1_nm
+        self.intensities = intensities
+
+    def __len__(self):
+        return len(self.hkls)
+
+
+class ZoneAxisSimulator(object):
+    """
+    Kinematical simulator of zone axis diffraction patterns of one crystal.
+
+    The optional ``structure_factors`` callable returns the (N,) structure factors of a (N, 3) array of Miller
+    indices, all the structure factors are one when it is not given.
+    """
+    def __init__(self, crystal, g_max_1_nm, structure_factors=None):
+        self.crystal = crystal
+        self.g_max_1_nm = g_max_1_nm
+
+        reflections = reflection.enumerate_reflections(crystal, g_max_1_nm)
+        self.hkls = reflections["hkl"]
+        self.g_1_nm = reflections["g_1_nm"]
+
+        self.g_cartesian_1_nm = vector.miller_to_cartesian_1_nm(crystal, self.hkls)
+
+        if structure_factors is None:
+            self.structure_factors2 = np.ones(len(self.hkls))
+        else:
+            self.structure_factors2 = np.abs(structure_factors(self.hkls))**2
+
+    def beam_direction(self, zone_axis):
+        """
+        Cartesian unit vector of the beam along the direct lattice zone axis [uvw].
+        """
+        direction = vector.fractional_to_cartesian_nm(self.crystal, zone_axis)
+
+        return direction / np.sqrt(np.dot(direction, direction))
+
+    def simulate(self, zone_axis, voltage_V, thickness_nm, excitation_error_max_1_nm=None):
+        """
+        Simulate the pattern of a zone axis, only the spots with :math:`|s_g| \\leq s_{max}` are kept.
+
+        The default :math:`s_{max}` is :math:`2/t`, the second zero of the shape factor of the foil.
+        """
+        if excitation_error_max_1_nm is None:
+            excitation_error_max_1_nm = 2.0 / thickness_nm
+
+        k_1_nm = 1.0 / electron_optics.relativistic_wavelength_nm(voltage_V)
+        beam_direction = self.beam_direction(zone_axis)
+
+        g_parallel_1_nm = np.dot(self.g_cartesian_1_nm, beam_direction)
+        excitation_errors_1_nm = -(2.0 * k_1_nm * g_parallel_1_nm + self.g_1_nm**2) / (2.0 * k_1_nm)
+
+        mask = np.abs(excitation_errors_1_nm) <= excitation_error_max_1_nm
+        excitation_errors_1_nm = excitation_errors_1_nm[mask]
+
+        # np.sinc(x) = sin(pi x) / (pi x), so the shape factor is t sinc(t s).
+        shape_factors = thickness_nm * np.sinc(thickness_nm * excitation_errors_1_nm)
+        intensities = self.structure_factors2[mask] * shape_factors**2
+
+        axis_x, axis_y = _detector_basis(beam_direction)
+        g_cartesian_1_nm = self.g_cartesian_1_nm[mask]
+        positions_1_nm = np.stack([np.dot(g_cartesian_1_nm, axis_x), np.dot(g_cartesian_1_nm, axis_y)], axis=-1)
+
+        return DiffractionPattern(self.hkls[mask], positions_1_nm, excitation_errors_1_nm, intensities)
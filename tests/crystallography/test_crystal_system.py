@@ -27,6 +27,7 @@ Tests for the module :py:mod:`crystal_system`.
 ###############################################################################
 
 # Standard library modules.
+import pickle
 import unittest
 
 # Third party modules.
@@ -86,6 +87,215 @@ class Test_crystal_system(unittest.TestCase):
 
         # self.fail("Test if the testcase is working.")
 
+    def test_gij_nm2_cache(self):
+        """
+        Test the direct metric tensor is cached and recomputed only when a lattice parameter changes.
+        """
+
+        crystal = crystal_system.Tetragonal(0.5, 1.0)
+        g_ij_nm2 = crystal.gij_nm2
+
+        self.assertIs(g_ij_nm2, crystal.gij_nm2)
+        self.assertFalse(g_ij_nm2.flags.writeable)
+        with self.assertRaises(ValueError):
+            g_ij_nm2[0, 0] = 1.0
+
+        crystal.a_nm = 0.5
+        self.assertIs(g_ij_nm2, crystal.gij_nm2)
+
+        crystal.c_nm = 2.0
+        self.assertIsNot(g_ij_nm2, crystal.gij_nm2)
+        self.assertAlmostEqual(4.0, crystal.gij_nm2[2, 2], 5)
+
+        g_ij_nm2 = crystal.gij_nm2
+        crystal.update_lattice_parameters(a_nm=1.0, gamma_rad=np.pi/3.0)
+        self.assertIsNot(g_ij_nm2, crystal.gij_nm2)
+        self.assertAlmostEqual(1.0, crystal.gij_nm2[0, 0], 5)
+        self.assertAlmostEqual(1.0, crystal.gij_nm2[1, 1], 5)
+        self.assertAlmostEqual(0.5, crystal.gij_nm2[0, 1], 5)
+        self.assertAlmostEqual(4.0, crystal.gij_nm2[2, 2], 5)
+
+        # self.fail("Test if the testcase is working.")
+
+    def test_g_star_1_nm2(self):
+        """
+        Test the reciprocal metric tensor of each crystal system is the inverse of the direct metric tensor.
+        """
+
+        crystals = [crystal_system.Triclinic(0.5, 0.6, 0.7, 1.2, 1.4, 1.7),
+                    crystal_system.Monoclinic(0.5, 0.6, 0.7, 1.8),
+                    crystal_system.Hexagonal(0.3, 0.5),
+                    crystal_system.Rhombohedral(0.4, 1.2),
+                    crystal_system.Orthorhombic(0.5, 0.6, 0.7),
+                    crystal_system.Tetragonal(0.5, 1.0),
+                    crystal_system.Cubic(0.4)]
+
+        for crystal in crystals:
+            np.testing.assert_allclose(np.eye(3), np.dot(crystal.g_star_1_nm2, crystal.gij_nm2), atol=1.0e-10)
+            self.assertAlmostEqual(np.sqrt(np.linalg.det(crystal.gij_nm2)), crystal.volume_nm3, 10)
+            self.assertIs(crystal.g_star_1_nm2, crystal.g_star_1_nm2)
+            self.assertFalse(crystal.g_star_1_nm2.flags.writeable)
+
+        # self.fail("Test if the testcase is working.")
+
+    def test_reciprocal_lattice_parameters(self):
+        """
+        Test the reciprocal lattice parameters and their invalidation.
+        """
+
+        crystal = crystal_system.Cubic(0.4)
+        self.assertAlmostEqual(2.5, crystal.a_star_1_nm, 10)
+        self.assertAlmostEqual(2.5, crystal.b_star_1_nm, 10)
+        self.assertAlmostEqual(2.5, crystal.c_star_1_nm, 10)
+        self.assertAlmostEqual(np.pi/2.0, crystal.alpha_star_rad, 10)
+        self.assertAlmostEqual(np.pi/2.0, crystal.beta_star_rad, 10)
+        self.assertAlmostEqual(np.pi/2.0, crystal.gamma_star_rad, 10)
+        self.assertAlmostEqual(0.064, crystal.volume_nm3, 10)
+
+        crystal.a_nm = 0.5
+        self.assertAlmostEqual(2.0, crystal.a_star_1_nm, 10)
+        self.assertAlmostEqual(2.0, crystal.c_star_1_nm, 10)
+        self.assertAlmostEqual(4.0, crystal.g_star_1_nm2[0, 0], 10)
+
+        crystal = crystal_system.Hexagonal(0.3, 0.5)
+        self.assertAlmostEqual(np.pi/3.0, crystal.gamma_star_rad, 10)
+        self.assertAlmostEqual(2.0/(np.sqrt(3.0)*0.3), crystal.a_star_1_nm, 10)
+        self.assertAlmostEqual(2.0, crystal.c_star_1_nm, 10)
+
+        # self.fail("Test if the testcase is working.")
+
+    def test_tied_parameters(self):
+        """
+        Test the reciprocal metric tensor stays the inverse of the direct metric tensor when the parameters change.
+        """
+
+        crystals = [crystal_system.Triclinic(0.5, 0.6, 0.7, 1.2, 1.4, 1.7),
+                    crystal_system.Monoclinic(0.5, 0.6, 0.7, 1.8),
+                    crystal_system.Hexagonal(0.3, 0.5),
+                    crystal_system.Rhombohedral(0.4, 1.2),
+                    crystal_system.Orthorhombic(0.5, 0.6, 0.7),
+                    crystal_system.Tetragonal(0.5, 1.0),
+                    crystal_system.Cubic(0.4)]
+        values = {"a_nm": 0.45, "b_nm": 0.55, "c_nm": 0.65, "alpha_rad": 1.3, "beta_rad": 1.5, "gamma_rad": 1.9}
+
+        for crystal in crystals:
+            for name, value in sorted(values.items()):
+                crystal_copy = type(crystal).from_lattice_parameters(crystal.lattice_parameters)
+                setattr(crystal_copy, name, value)
+                self.assertAlmostEqual(value, getattr(crystal_copy, name), 12)
+                np.testing.assert_allclose(np.eye(3), np.dot(crystal_copy.g_star_1_nm2, crystal_copy.gij_nm2),
+                                           atol=1.0e-10, err_msg="{} {}".format(crystal.name, name))
+
+                for names in crystal.tied_parameters:
+                    if name in names:
+                        for tied_name in names:
+                            self.assertEqual(value, getattr(crystal_copy, tied_name))
+
+        crystal = crystal_system.Cubic(0.4)
+        crystal.update_lattice_parameters(b_nm=0.5)
+        np.testing.assert_allclose([0.5, 0.5, 0.5], [crystal.a_nm, crystal.b_nm, crystal.c_nm])
+        self.assertRaises(ValueError, crystal.update_lattice_parameters, a_nm=0.5, c_nm=0.6)
+
+        rhombohedral = crystal_system.Rhombohedral(0.4, 1.2)
+        rhombohedral.beta_rad = 1.1
+        np.testing.assert_allclose([1.1, 1.1, 1.1], [rhombohedral.alpha_rad, rhombohedral.beta_rad,
+                                                     rhombohedral.gamma_rad])
+
+        lattice_parameters = crystal_system.LatticeParameters(0.3, 0.31, 0.5, np.pi/2.0, np.pi/2.0, 2.0*np.pi/3.0)
+        self.assertRaises(ValueError, crystal_system.Hexagonal.from_lattice_parameters, lattice_parameters)
+        self.assertIsInstance(crystal_system.Orthorhombic.from_lattice_parameters(lattice_parameters),
+                              crystal_system.Orthorhombic)
+        hexagonal = crystal_system.Hexagonal(0.3, 0.5)
+        with self.assertRaises(ValueError):
+            hexagonal.lattice_parameters = lattice_parameters
+
+        # self.fail("Test if the testcase is working.")
+
+    def test_structure_matrices(self):
+        """
+        Test the structure matrices reproduce the metric tensors and are invalidated with the lattice parameters.
+        """
+
+        crystal = crystal_system.Triclinic(0.5, 0.6, 0.7, 1.2, 1.4, 1.7)
+        a_nm = crystal.direct_structure_matrix_nm
+        b_1_nm = crystal.reciprocal_structure_matrix_1_nm
+        np.testing.assert_allclose(crystal.gij_nm2, np.dot(a_nm.T, a_nm))
+        np.testing.assert_allclose(crystal.g_star_1_nm2, np.dot(b_1_nm.T, b_1_nm))
+        np.testing.assert_allclose(np.eye(3), np.dot(a_nm.T, b_1_nm), atol=1.0e-12)
+        np.testing.assert_allclose([0.5, 0.0, 0.0], a_nm[:, 0])
+        self.assertEqual(0.0, a_nm[2, 1])
+        self.assertFalse(a_nm.flags.writeable)
+
+        crystal = crystal_system.Cubic(0.4)
+        np.testing.assert_allclose(np.eye(3)*0.4, crystal.direct_structure_matrix_nm, atol=1.0e-15)
+        crystal.a_nm = 0.5
+        np.testing.assert_allclose(np.diag([2.0, 2.0, 2.0]), crystal.reciprocal_structure_matrix_1_nm, atol=1.0e-12)
+        b_1_nm = crystal.reciprocal_structure_matrix_1_nm
+        np.testing.assert_allclose(crystal.g_star_1_nm2, np.dot(b_1_nm.T, b_1_nm), atol=1.0e-12)
+
+        # self.fail("Test if the testcase is working.")
+
+    def test_lattice_parameters(self):
+        """
+        Test the lattice parameters are immutable and hashable within the tolerance.
+        """
+
+        lattice_parameters = crystal_system.LatticeParameters(0.5, 0.5, 1.0, np.pi/2.0, np.pi/2.0, np.pi/2.0)
+
+        self.assertFalse(hasattr(lattice_parameters, "__dict__"))
+        with self.assertRaises(AttributeError):
+            lattice_parameters.a_nm = 0.6
+        with self.assertRaises(AttributeError):
+            del lattice_parameters.a_nm
+
+        same_lattice_parameters = crystal_system.LatticeParameters(0.5 + 1.0e-12, 0.5, 1.0, np.pi/2.0, np.pi/2.0,
+                                                                   np.pi/2.0)
+        other_lattice_parameters = lattice_parameters.replace(c_nm=1.1)
+        self.assertEqual(lattice_parameters, same_lattice_parameters)
+        self.assertEqual(hash(lattice_parameters), hash(same_lattice_parameters))
+        self.assertNotEqual(lattice_parameters, other_lattice_parameters)
+        self.assertAlmostEqual(1.1, other_lattice_parameters.c_nm, 12)
+        self.assertAlmostEqual(1.0, lattice_parameters.c_nm, 12)
+
+        tables = {lattice_parameters: "table"}
+        self.assertEqual("table", tables[same_lattice_parameters])
+        self.assertNotIn(other_lattice_parameters, tables)
+
+        self.assertEqual(lattice_parameters, pickle.loads(pickle.dumps(lattice_parameters)))
+        self.assertEqual(lattice_parameters.astuple(), pickle.loads(pickle.dumps(lattice_parameters)).astuple())
+
+        # self.fail("Test if the testcase is working.")
+
+    def test_crystal_lattice_parameters(self):
+        """
+        Test a crystal system accepts and exposes its lattice parameters.
+        """
+
+        crystal = crystal_system.Tetragonal(0.5, 1.0)
+        lattice_parameters = crystal.lattice_parameters
+        self.assertEqual(crystal_system.LatticeParameters(0.5, 0.5, 1.0, np.pi/2.0, np.pi/2.0, np.pi/2.0),
+                         lattice_parameters)
+        self.assertFalse(hasattr(crystal, "__dict__"))
+
+        crystal_copy = crystal_system.CrystalSystem(lattice_parameters)
+        np.testing.assert_allclose(crystal.gij_nm2, crystal_copy.gij_nm2)
+        crystal_copy = crystal_system.Tetragonal.from_lattice_parameters(lattice_parameters)
+        self.assertIsInstance(crystal_copy, crystal_system.Tetragonal)
+        np.testing.assert_allclose(crystal.g_star_1_nm2, crystal_copy.g_star_1_nm2)
+
+        g_ij_nm2 = crystal.gij_nm2
+        crystal.lattice_parameters = lattice_parameters.replace(a_nm=1.0, b_nm=1.0)
+        self.assertIsNot(g_ij_nm2, crystal.gij_nm2)
+        self.assertAlmostEqual(1.0, crystal.a_nm, 12)
+        self.assertAlmostEqual(1.0, crystal.gij_nm2[1, 1], 12)
+
+        crystal_copy = pickle.loads(pickle.dumps(crystal))
+        self.assertIsInstance(crystal_copy, crystal_system.Tetragonal)
+        self.assertEqual(crystal.lattice_parameters, crystal_copy.lattice_parameters)
+        np.testing.assert_allclose(crystal.gij_nm2, crystal_copy.gij_nm2)
+
+        # self.fail("Test if the testcase is working.")
+
     def test_length_nm(self):
         """
         Test the calculation of the length of a vector.
@@ -146,6 +356,9 @@ class Test_crystal_system(unittest.TestCase):
 
         triclinic = crystal_system.Triclinic(1, 1, 1, 0.5, 0.5, 0.5)
         self.assertEqual("triclinic", triclinic.name)
+        self.assertEqual("monoclinic", crystal_system.Monoclinic(0.5, 0.6, 0.7, 1.9).name)
+        self.assertEqual("rhombohedral", crystal_system.Rhombohedral(0.4, 0.3).name)
+        self.assertEqual("cubic", crystal_system.Cubic(0.4).name)
 
         # self.fail("Test if the testcase is working.")
         self.assert_(True)
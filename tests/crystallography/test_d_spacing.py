@@ -0,0 +1,145 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. py:currentmodule:: test_d_spacing
+   :synopsis: Tests for the module :py:mod:`d_spacing`
+
+.. moduleauthor:: Hendrix Demers <hendrix.demers@mail.mcgill.ca>
+
+Tests for the module :py:mod:`d_spacing`.
+"""
+
+###############################################################################
+# Copyright 2017 Hendrix Demers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###############################################################################
+
+# Standard library modules.
+import unittest
+
+# Third party modules.
+import numpy as np
+
+# Local modules.
+
+# Project modules.
+import electrondiffraction.crystallography.d_spacing as d_spacing
+import electrondiffraction.crystallography.crystal_system as crystal_system
+
+
+# Globals and constants variables.
+
+class Test_d_spacing(unittest.TestCase):
+    """
+    TestCase class for the module `${moduleName}`.
+    """
+
+    def setUp(self):
+        """
+        Setup method.
+        """
+
+        unittest.TestCase.setUp(self)
+
+    def tearDown(self):
+        """
+        Teardown method.
+        """
+
+        unittest.TestCase.tearDown(self)
+
+    def testSkeleton(self):
+        """
+        First test to check if the testcase is working with the testing framework.
+        """
+
+        #self.fail("Test if the testcase is working.")
+        self.assertTrue(True)
+
+    def test_d_spacings_nm(self):
+        """
+        Test the d-spacings against the direct computation with the crystal system.
+        """
+
+        crystal = crystal_system.Triclinic(0.5, 0.6, 0.7, 1.2, 1.4, 1.7)
+        hkls = np.array([[1, 0, 0], [1, 1, 0], [1, -2, 3], [0, 0, 0]])
+
+        d_nm = d_spacing.d_spacings_nm(crystal, hkls)
+        g_1_nm = d_spacing.g_lengths_1_nm(crystal, hkls)
+        for hkl, value_d_nm, value_g_1_nm in zip(hkls[:3], d_nm, g_1_nm):
+            g_ref_1_nm = np.sqrt(np.dot(hkl, np.dot(np.linalg.inv(crystal.gij_nm2), hkl)))
+            self.assertAlmostEqual(g_ref_1_nm, value_g_1_nm, 10)
+            self.assertAlmostEqual(1.0/g_ref_1_nm, value_d_nm, 10)
+        self.assertTrue(np.isinf(d_nm[3]))
+
+        crystal = crystal_system.Cubic(0.4)
+        self.assertAlmostEqual(0.4/np.sqrt(3.0), d_spacing.d_spacings_nm(crystal, [1, 1, 1]), 10)
+
+        #self.fail("Test if the testcase is working.")
+
+    def test_hkl_grid(self):
+        """
+        Test the grid of reflections matches a brute force search.
+        """
+
+        crystals = [crystal_system.Triclinic(0.5, 0.6, 0.7, 1.2, 1.4, 1.7),
+                    crystal_system.Rhombohedral(0.4, 0.5),
+                    crystal_system.Hexagonal(0.3, 0.5)]
+        g_max_1_nm = 10.0
+
+        for crystal in crystals:
+            hkls = d_spacing.hkl_grid(crystal, g_max_1_nm)
+
+            indices = np.arange(-30, 31)
+            hs, ks, ls = np.meshgrid(indices, indices, indices, indexing="ij")
+            hkls_ref = np.stack([hs.ravel(), ks.ravel(), ls.ravel()], axis=-1)
+            g_1_nm = d_spacing.g_lengths_1_nm(crystal, hkls_ref)
+            hkls_ref = hkls_ref[(g_1_nm <= g_max_1_nm) & np.any(hkls_ref != 0, axis=-1)]
+
+            self.assertEqual(set(map(tuple, hkls_ref)), set(map(tuple, hkls)))
+            self.assertEqual(len(hkls_ref), len(hkls))
+
+        #self.fail("Test if the testcase is working.")
+
+    def test_compute_d_spacings(self):
+        """
+        Test the sorted order and the families of the d-spacing table.
+        """
+
+        crystal = crystal_system.Cubic(0.4)
+        table = d_spacing.compute_d_spacings(crystal, g_max_1_nm=np.sqrt(3.0)/0.4)
+
+        self.assertEqual(6 + 12 + 8, len(table))
+        self.assertEqual(3, table.number_families)
+        np.testing.assert_array_equal([6, 12, 8], table.multiplicities)
+        np.testing.assert_allclose([0.4, 0.4/np.sqrt(2.0), 0.4/np.sqrt(3.0)], table.family_d_nm)
+        self.assertTrue(np.all(np.diff(table.d_nm[table.order]) <= 0.0))
+        for hkl in table.hkls[table.family(2)]:
+            self.assertEqual(3, np.sum(np.abs(hkl)))
+
+        table = d_spacing.compute_d_spacings(crystal, hkls=[[2, 0, 0], [1, 0, 0], [0, 2, 0]])
+        np.testing.assert_array_equal([1, 0, 2], table.order)
+        np.testing.assert_array_equal([1, 0, 1], table.family_ids)
+
+        self.assertRaises(ValueError, d_spacing.compute_d_spacings, crystal)
+        self.assertRaises(ValueError, d_spacing.compute_d_spacings, crystal, [[1, 0, 0]], 1.0)
+
+        #self.fail("Test if the testcase is working.")
+
+
+if __name__ == '__main__':  # pragma: no cover
+    import nose
+
+    nose.runmodule()
@@ -30,11 +30,13 @@ Tests for the module :py:mod:`direct_metric_tensor`.
 import unittest
 
 # Third party modules.
+import numpy as np
 
 # Local modules.
 
 # Project modules.
 import electrondiffraction.crystallography.direct_metric_tensor as direct_metric_tensor
+import electrondiffraction.crystallography.crystal_system as crystal_system
 
 
 # Globals and constants variables.
@@ -67,6 +69,83 @@ class Test_direct_metric_tensor(unittest.TestCase):
         self.assert_(True)
 
 
+    def test_crystal_system(self):
+        """
+        Test each closed form against the general direct metric tensor of the crystal system.
+        """
+
+        tensors = [(direct_metric_tensor.gc_nm2(0.4), crystal_system.Cubic(0.4)),
+                   (direct_metric_tensor.gt_nm2(0.5, 1.0), crystal_system.Tetragonal(0.5, 1.0)),
+                   (direct_metric_tensor.go_nm2(0.5, 0.6, 0.7), crystal_system.Orthorhombic(0.5, 0.6, 0.7)),
+                   (direct_metric_tensor.gh_nm2(0.3, 0.5), crystal_system.Hexagonal(0.3, 0.5)),
+                   (direct_metric_tensor.gr_nm2(0.4, 1.2), crystal_system.Rhombohedral(0.4, 1.2)),
+                   (direct_metric_tensor.gm_nm2(0.5, 0.6, 0.7, 1.8), crystal_system.Monoclinic(0.5, 0.6, 0.7, 1.8)),
+                   (direct_metric_tensor.ga_nm2(0.5, 0.6, 0.7, 1.2, 1.4, 1.7),
+                    crystal_system.Triclinic(0.5, 0.6, 0.7, 1.2, 1.4, 1.7))]
+
+        for tensor_nm2, crystal in tensors:
+            self.assertEqual((3, 3), tensor_nm2.shape)
+            np.testing.assert_allclose(crystal.gij_nm2, tensor_nm2, atol=1.0e-12)
+
+        #self.fail("Test if the testcase is working.")
+
+    def test_batch(self):
+        """
+        Test the tensors of arrays of lattice parameters match the scalar tensors.
+        """
+
+        a_nm = np.linspace(0.3, 0.6, 5)
+        b_nm = np.linspace(0.4, 0.7, 5)
+        c_nm = np.linspace(0.5, 0.9, 5)
+        alpha_rad = np.linspace(1.1, 1.3, 5)
+        beta_rad = np.linspace(1.4, 1.9, 5)
+        gamma_rad = np.linspace(1.5, 2.0, 5)
+
+        functions = [(direct_metric_tensor.gc_nm2, (a_nm,)),
+                     (direct_metric_tensor.gt_nm2, (a_nm, c_nm)),
+                     (direct_metric_tensor.go_nm2, (a_nm, b_nm, c_nm)),
+                     (direct_metric_tensor.gh_nm2, (a_nm, c_nm)),
+                     (direct_metric_tensor.gr_nm2, (a_nm, alpha_rad)),
+                     (direct_metric_tensor.gm_nm2, (a_nm, b_nm, c_nm, beta_rad)),
+                     (direct_metric_tensor.ga_nm2, (a_nm, b_nm, c_nm, alpha_rad, beta_rad, gamma_rad))]
+
+        for function, parameters in functions:
+            tensors_nm2 = function(*parameters)
+            self.assertEqual((5, 3, 3), tensors_nm2.shape)
+            for index in range(5):
+                tensor_nm2 = function(*[parameter[index] for parameter in parameters])
+                np.testing.assert_allclose(tensor_nm2, tensors_nm2[index])
+
+        tensors_nm2 = direct_metric_tensor.gt_nm2(a_nm, 1.0)
+        self.assertEqual((5, 3, 3), tensors_nm2.shape)
+        np.testing.assert_allclose(1.0, tensors_nm2[:, 2, 2])
+
+        tensors_nm2 = direct_metric_tensor.gt_nm2(a_nm[:, np.newaxis], c_nm[np.newaxis, :3])
+        self.assertEqual((5, 3, 3, 3), tensors_nm2.shape)
+
+        #self.fail("Test if the testcase is working.")
+
+    def test_ga_derivatives(self):
+        """
+        Test the analytic derivatives against central finite differences.
+        """
+
+        parameters = np.array([[0.5, 0.6, 0.7, 1.4, 1.5, 1.7],
+                               [0.3, 0.3, 0.5, np.pi/2.0, np.pi/2.0, 2.0*np.pi/3.0]])
+
+        derivatives = direct_metric_tensor.ga_derivatives(*parameters.T)
+        self.assertEqual((2, 6, 3, 3), derivatives.shape)
+
+        step = 1.0e-6
+        for index in range(6):
+            delta = np.zeros(6)
+            delta[index] = step
+            plus_nm2 = direct_metric_tensor.ga_nm2(*(parameters + delta).T)
+            minus_nm2 = direct_metric_tensor.ga_nm2(*(parameters - delta).T)
+            np.testing.assert_allclose((plus_nm2 - minus_nm2) / (2.0 * step), derivatives[:, index], atol=1.0e-8)
+
+        #self.fail("Test if the testcase is working.")
+
 if __name__ == '__main__':  # pragma: no cover
     import nose
 
@@ -0,0 +1,134 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. py:currentmodule:: test_neighbour_list
+   :synopsis: Tests for the module :py:mod:`neighbour_list`
+
+.. moduleauthor:: Hendrix Demers <hendrix.demers@mail.mcgill.ca>
+
+Tests for the module :py:mod:`neighbour_list`.
+"""
+
+###############################################################################
+# Copyright 2017 Hendrix Demers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###############################################################################
+
+# Standard library modules.
+import itertools
+import unittest
+
+# Third party modules.
+import numpy as np
+
+# Local modules.
+
+# Project modules.
+import electrondiffraction.crystallography.neighbour_list as neighbour_list
+import electrondiffraction.crystallography.crystal_system as crystal_system
+
+
+# Globals and constants variables.
+
+def _brute_force_pairs(crystal, positions, cutoff_nm):
+    pairs = set()
+    # The positions are within [-0.5, 1.5), two more cells cover their fractional differences.
+    maximum_shifts = np.ceil(cutoff_nm * np.sqrt(np.diagonal(np.linalg.inv(crystal.gij_nm2)))).astype(int) + 2
+    shifts = np.array(list(itertools.product(*[range(-maximum_shift, maximum_shift + 1)
+                                               for maximum_shift in maximum_shifts])))
+    for index_i, index_j in itertools.product(range(len(positions)), repeat=2):
+        vectors = positions[index_j] + shifts - positions[index_i]
+        distances_nm = np.sqrt(np.einsum("ni,ij,nj->n", vectors, crystal.gij_nm2, vectors))
+        for shift, distance_nm in zip(shifts, distances_nm):
+            if distance_nm <= cutoff_nm and (index_i != index_j or np.any(shift != 0)):
+                pairs.add((index_i, index_j) + tuple(shift))
+
+    return pairs
+
+
+class Test_neighbour_list(unittest.TestCase):
+    """
+    TestCase class for the module `${moduleName}`.
+    """
+
+    def setUp(self):
+        """
+        Setup method.
+        """
+
+        unittest.TestCase.setUp(self)
+
+    def tearDown(self):
+        """
+        Teardown method.
+        """
+
+        unittest.TestCase.tearDown(self)
+
+    def testSkeleton(self):
+        """
+        First test to check if the testcase is working with the testing framework.
+        """
+
+        #self.fail("Test if the testcase is working.")
+        self.assertTrue(True)
+
+    def test_neighbour_list(self):
+        """
+        Test the pairs match a brute force search, for oblique cells and for a cutoff larger than the cell.
+        """
+
+        random_state = np.random.RandomState(0)
+        cases = [(crystal_system.Triclinic(0.5, 0.6, 0.7, 0.6, 0.8, 1.0), 0.45),
+                 (crystal_system.Hexagonal(0.3, 0.5), 0.35),
+                 (crystal_system.Cubic(0.3), 0.5),
+                 (crystal_system.Cubic(2.0), 0.3),
+                 (crystal_system.Triclinic(0.3, 0.9, 0.7, 1.28, 1.57, 0.32), 0.35)]
+
+        for crystal, cutoff_nm in cases:
+            positions = random_state.uniform(-0.5, 1.5, (8, 3))
+            pairs_ref = _brute_force_pairs(crystal, positions, cutoff_nm)
+
+            indices_i, indices_j, shifts, distances_nm = neighbour_list.neighbour_list(crystal, positions, cutoff_nm,
+                                                                                       full=True)
+            pairs = set((index_i, index_j) + tuple(shift) for index_i, index_j, shift in
+                        zip(indices_i, indices_j, shifts))
+            self.assertEqual(len(pairs_ref), len(indices_i))
+            self.assertEqual(pairs_ref, pairs)
+
+            vectors = positions[indices_j] + shifts - positions[indices_i]
+            np.testing.assert_allclose(np.sqrt(np.einsum("ni,ij,nj->n", vectors, crystal.gij_nm2, vectors)),
+                                       distances_nm)
+
+            indices_i, indices_j, shifts, _distances_nm = neighbour_list.neighbour_list(crystal, positions, cutoff_nm,
+                                                                                        full=True, reduce_cell=False)
+            self.assertEqual(pairs_ref, set((index_i, index_j) + tuple(shift) for index_i, index_j, shift in
+                                            zip(indices_i, indices_j, shifts)))
+
+            indices_i, indices_j, shifts, distances_nm = neighbour_list.neighbour_list(crystal, positions, cutoff_nm)
+            self.assertEqual(len(pairs_ref), 2 * len(indices_i))
+            self.assertTrue(all(pair in pairs_ref for pair in
+                                zip(indices_i, indices_j, *shifts.T)))
+
+        self.assertRaises(ValueError, neighbour_list.neighbour_list, crystal_system.Cubic(0.3), np.zeros((2, 2)), 0.1)
+        self.assertRaises(ValueError, neighbour_list.neighbour_list, crystal_system.Cubic(0.3), np.zeros((2, 3)), 0.0)
+
+        #self.fail("Test if the testcase is working.")
+
+
+if __name__ == '__main__':  # pragma: no cover
+    import nose
+
+    nose.runmodule()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. py:currentmodule:: test_point_group
+   :synopsis: Tests for the module :py:mod:`point_group`
+
+.. moduleauthor:: Hendrix Demers <hendrix.demers@mail.mcgill.ca>
+
+Tests for the module :py:mod:`point_group`.
+"""
+
+###############################################################################
+# Copyright 2017 Hendrix Demers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###############################################################################
+
+# Standard library modules.
+import unittest
+
+# Third party modules.
+import numpy as np
+
+# Local modules.
+
+# Project modules.
+import electrondiffraction.crystallography.point_group as point_group
+import electrondiffraction.crystallography.crystal_system as crystal_system
+import electrondiffraction.crystallography.reflection as reflection
+
+
+# Globals and constants variables.
+
+class Test_point_group(unittest.TestCase):
+    """
+    TestCase class for the module `${moduleName}`.
+    """
+
+    def setUp(self):
+        """
+        Setup method.
+        """
+
+        unittest.TestCase.setUp(self)
+
+        self.crystals = [crystal_system.Triclinic(0.5, 0.6, 0.7, 1.2, 1.4, 1.7),
+                         crystal_system.Monoclinic(0.5, 0.6, 0.7, 1.9),
+                         crystal_system.Orthorhombic(0.3, 0.4, 0.5),
+                         crystal_system.Tetragonal(0.3, 0.5),
+                         crystal_system.Rhombohedral(0.4, 0.3),
+                         crystal_system.Hexagonal(0.3, 0.5),
+                         crystal_system.Cubic(0.4)]
+
+    def tearDown(self):
+        """
+        Teardown method.
+        """
+
+        unittest.TestCase.tearDown(self)
+
+    def testSkeleton(self):
+        """
+        First test to check if the testcase is working with the testing framework.
+        """
+
+        #self.fail("Test if the testcase is working.")
+        self.assertTrue(True)
+
+    def test_laue_classes(self):
+        """
+        Test the orders of the Laue classes and that their operations preserve the metric of the crystal system.
+        """
+
+        orders = {"-1": 2, "2/m": 4, "mmm": 8, "4/m": 8, "4/mmm": 16, "-3": 6, "-3m": 12, "-3m1": 12, "-31m": 12,
+                  "6/m": 12, "6/mmm": 24, "m-3": 24, "m-3m": 48}
+
+        for crystal in self.crystals:
+            for laue_class in point_group.LAUE_CLASS_GENERATORS[crystal.name]:
+                group = point_group.get_laue_class(crystal, laue_class)
+                self.assertEqual(orders[laue_class], group.order)
+                np.testing.assert_array_equal(np.eye(3), group.operations[0])
+
+                g_star_1_nm2 = crystal.g_star_1_nm2
+                for operation in group.operations:
+                    np.testing.assert_allclose(g_star_1_nm2, np.dot(np.dot(operation, g_star_1_nm2), operation.T),
+                                               atol=1.0e-12)
+
+        self.assertEqual("m-3m", point_group.get_laue_class(crystal_system.Cubic(0.4)).symbol)
+        self.assertIs(point_group.get_laue_class(crystal_system.Cubic(0.4)),
+                      point_group.get_laue_class(crystal_system.Cubic(0.5)))
+        self.assertRaises(ValueError, point_group.get_laue_class, crystal_system.Cubic(0.4), "6/mmm")
+
+        #self.fail("Test if the testcase is working.")
+
+    def test_canonicalize(self):
+        """
+        Test the family representatives and multiplicities.
+        """
+
+        group = point_group.get_laue_class(crystal_system.Cubic(0.4))
+        hkls = [[0, 0, 2], [1, -1, 1], [1, 2, 3], [1, 1, 0], [-5, 1, 1], [3, -3, 3], [0, 0, 0]]
+        representatives, multiplicities = group.canonicalize(hkls)
+        np.testing.assert_array_equal([[2, 0, 0], [1, 1, 1], [3, 2, 1], [1, 1, 0], [5, 1, 1], [3, 3, 3], [0, 0, 0]],
+                                      representatives)
+        np.testing.assert_array_equal([6, 8, 48, 12, 24, 8, 1], multiplicities)
+        self.assertEqual(6, len(group.family([0, 0, 1])))
+
+        group = point_group.get_laue_class(crystal_system.Cubic(0.4), "m-3")
+        _representatives, multiplicities = group.canonicalize([[1, 2, 3], [1, 1, 0]])
+        np.testing.assert_array_equal([24, 12], multiplicities)
+
+        group = point_group.get_laue_class(crystal_system.Hexagonal(0.3, 0.5))
+        _representatives, multiplicities = group.canonicalize([[1, 0, 0], [1, 1, 0], [1, 0, 1], [0, 0, 2],
+                                                               [2, 1, 0], [2, 1, 1]])
+        np.testing.assert_array_equal([6, 6, 12, 2, 12, 24], multiplicities)
+
+        #self.fail("Test if the testcase is working.")
+
+    def test_families(self):
+        """
+        Test the families of the reflections of a sphere add up to all the reflections with the same lengths.
+        """
+
+        for crystal in self.crystals:
+            reflections = reflection.enumerate_reflections(crystal, 10.0)
+            hkls = reflections["hkl"]
+            group = point_group.get_laue_class(crystal)
+
+            representatives, multiplicities, family_ids = group.families(hkls)
+            self.assertEqual(len(hkls), np.sum(multiplicities))
+            np.testing.assert_array_equal(multiplicities, np.bincount(family_ids))
+            np.testing.assert_array_equal(representatives[family_ids], group.canonicalize(hkls)[0])
+
+            np.testing.assert_allclose(reflections["g_1_nm"], np.sqrt(np.einsum("ni,ij,nj->n", representatives, crystal.g_star_1_nm2,
+                                                                 representatives))[family_ids])
+
+        #self.fail("Test if the testcase is working.")
+
+
+if __name__ == '__main__':  # pragma: no cover
+    import nose
+
+    nose.runmodule()
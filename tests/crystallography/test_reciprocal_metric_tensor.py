@@ -30,11 +30,13 @@ Tests for the module :py:mod:`reciprocal_metric_tensor`.
 import unittest
 
 # Third party modules.
+import numpy as np
 
 # Local modules.
 
 # Project modules.
 import electrondiffraction.crystallography.reciprocal_metric_tensor as reciprocal_metric_tensor
+import electrondiffraction.crystallography.direct_metric_tensor as direct_metric_tensor
 
 
 # Globals and constants variables.
@@ -67,6 +69,100 @@ class Test_reciprocal_metric_tensor(unittest.TestCase):
         self.assert_(True)
 
 
+    def test_inverse_direct_metric_tensor(self):
+        """
+        Test each closed form is the inverse of the corresponding direct metric tensor.
+        """
+
+        a_nm, b_nm, c_nm = 0.5, 0.6, 0.7
+        alpha_rad, beta_rad, gamma_rad = 1.2, 1.4, 1.7
+
+        tensors = [(reciprocal_metric_tensor.grc_1_nm2(a_nm), direct_metric_tensor.gc_nm2(a_nm)),
+                   (reciprocal_metric_tensor.grt_1_nm2(a_nm, c_nm), direct_metric_tensor.gt_nm2(a_nm, c_nm)),
+                   (reciprocal_metric_tensor.gro_1_nm2(a_nm, b_nm, c_nm), direct_metric_tensor.go_nm2(a_nm, b_nm, c_nm)),
+                   (reciprocal_metric_tensor.grh_1_nm2(a_nm, c_nm), direct_metric_tensor.gh_nm2(a_nm, c_nm)),
+                   (reciprocal_metric_tensor.grr_1_nm2(a_nm, alpha_rad), direct_metric_tensor.gr_nm2(a_nm, alpha_rad)),
+                   (reciprocal_metric_tensor.grm_1_nm2(a_nm, b_nm, c_nm, beta_rad),
+                    direct_metric_tensor.gm_nm2(a_nm, b_nm, c_nm, beta_rad)),
+                   (reciprocal_metric_tensor.gra_1_nm2(a_nm, b_nm, c_nm, alpha_rad, beta_rad, gamma_rad),
+                    direct_metric_tensor.ga_nm2(a_nm, b_nm, c_nm, alpha_rad, beta_rad, gamma_rad))]
+
+        for tensor_1_nm2, tensor_nm2 in tensors:
+            np.testing.assert_allclose(np.eye(3), np.dot(tensor_1_nm2, tensor_nm2), atol=1.0e-10)
+
+        #self.fail("Test if the testcase is working.")
+
+    def test_compute_omega(self):
+        """
+        Test omega is the determinant of the direct metric tensor.
+        """
+
+        omega_nm6 = reciprocal_metric_tensor._compute_omega(0.5, 0.6, 0.7, 1.2, 1.4, 1.7)
+        omega_ref_nm6 = np.linalg.det(direct_metric_tensor.ga_nm2(0.5, 0.6, 0.7, 1.2, 1.4, 1.7))
+        self.assertAlmostEqual(omega_ref_nm6, omega_nm6, 10)
+
+        #self.fail("Test if the testcase is working.")
+
+    def test_batch(self):
+        """
+        Test the tensors and volumes of arrays of lattice parameters match the scalar values.
+        """
+
+        a_nm = np.linspace(0.3, 0.6, 5)
+        b_nm = np.linspace(0.4, 0.7, 5)
+        c_nm = np.linspace(0.5, 0.9, 5)
+        alpha_rad = np.linspace(1.1, 1.3, 5)
+        beta_rad = np.linspace(1.4, 1.9, 5)
+        gamma_rad = np.linspace(1.5, 2.0, 5)
+
+        functions = [(reciprocal_metric_tensor.grc_1_nm2, (a_nm,)),
+                     (reciprocal_metric_tensor.grt_1_nm2, (a_nm, c_nm)),
+                     (reciprocal_metric_tensor.gro_1_nm2, (a_nm, b_nm, c_nm)),
+                     (reciprocal_metric_tensor.grh_1_nm2, (a_nm, c_nm)),
+                     (reciprocal_metric_tensor.grr_1_nm2, (a_nm, alpha_rad)),
+                     (reciprocal_metric_tensor.grm_1_nm2, (a_nm, b_nm, c_nm, beta_rad)),
+                     (reciprocal_metric_tensor.gra_1_nm2, (a_nm, b_nm, c_nm, alpha_rad, beta_rad, gamma_rad))]
+
+        for function, parameters in functions:
+            tensors_1_nm2 = function(*parameters)
+            self.assertEqual((5, 3, 3), tensors_1_nm2.shape)
+            for index in range(5):
+                tensor_1_nm2 = function(*[parameter[index] for parameter in parameters])
+                self.assertEqual((3, 3), tensor_1_nm2.shape)
+                np.testing.assert_allclose(tensor_1_nm2, tensors_1_nm2[index])
+
+        tensors_nm2 = direct_metric_tensor.ga_nm2(a_nm, b_nm, c_nm, alpha_rad, beta_rad, gamma_rad)
+        volumes_nm3 = reciprocal_metric_tensor.volume_nm3(a_nm, b_nm, c_nm, alpha_rad, beta_rad, gamma_rad)
+        self.assertEqual((5,), volumes_nm3.shape)
+        np.testing.assert_allclose(np.sqrt(np.linalg.det(tensors_nm2)), volumes_nm3)
+
+        tensors_1_nm2 = reciprocal_metric_tensor.gra_1_nm2(a_nm, b_nm, c_nm, alpha_rad, beta_rad, gamma_rad)
+        np.testing.assert_allclose(np.linalg.inv(tensors_nm2), tensors_1_nm2, atol=1.0e-10)
+
+        #self.fail("Test if the testcase is working.")
+
+    def test_gra_derivatives(self):
+        """
+        Test the analytic derivatives against central finite differences.
+        """
+
+        parameters = np.array([[0.5, 0.6, 0.7, 1.4, 1.5, 1.7],
+                               [0.3, 0.3, 0.5, np.pi/2.0, np.pi/2.0, 2.0*np.pi/3.0]])
+
+        derivatives = reciprocal_metric_tensor.gra_derivatives(*parameters.T)
+        self.assertEqual((2, 6, 3, 3), derivatives.shape)
+
+        step = 1.0e-6
+        for index in range(6):
+            delta = np.zeros(6)
+            delta[index] = step
+            plus_1_nm2 = reciprocal_metric_tensor.gra_1_nm2(*(parameters + delta).T)
+            minus_1_nm2 = reciprocal_metric_tensor.gra_1_nm2(*(parameters - delta).T)
+            np.testing.assert_allclose((plus_1_nm2 - minus_1_nm2) / (2.0 * step), derivatives[:, index],
+                                       rtol=1.0e-6, atol=1.0e-6)
+
+        #self.fail("Test if the testcase is working.")
+
 if __name__ == '__main__':  # pragma: no cover
     import nose
 
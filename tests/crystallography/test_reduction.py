@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. py:currentmodule:: test_reduction
+   :synopsis: Tests for the module :py:mod:`reduction`
+
+.. moduleauthor:: Hendrix Demers <hendrix.demers@mail.mcgill.ca>
+
+Tests for the module :py:mod:`reduction`.
+"""
+
+###############################################################################
+# Copyright 2017 Hendrix Demers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###############################################################################
+
+# Standard library modules.
+import unittest
+
+# Third party modules.
+import numpy as np
+
+# Local modules.
+
+# Project modules.
+import electrondiffraction.crystallography.reduction as reduction
+import electrondiffraction.crystallography.crystal_system as crystal_system
+import electrondiffraction.crystallography.reflection as reflection
+
+
+# Globals and constants variables.
+
+def _skew(crystal, transformation):
+    g_nm2 = np.dot(np.dot(np.transpose(transformation), crystal.gij_nm2), transformation)
+    a_nm, b_nm, c_nm = np.sqrt(np.diagonal(g_nm2))
+
+    return crystal_system.Triclinic(a_nm, b_nm, c_nm, np.arccos(g_nm2[1, 2] / (b_nm * c_nm)),
+                                    np.arccos(g_nm2[0, 2] / (a_nm * c_nm)), np.arccos(g_nm2[0, 1] / (a_nm * b_nm)))
+
+
+class Test_reduction(unittest.TestCase):
+    """
+    TestCase class for the module `${moduleName}`.
+    """
+
+    def setUp(self):
+        """
+        Setup method.
+        """
+
+        unittest.TestCase.setUp(self)
+
+        self.transformations = [np.eye(3, dtype=np.int64),
+                                np.array([[1, 3, 0], [0, 1, 2], [0, 0, 1]]),
+                                np.array([[0, 1, 0], [1, 0, 0], [-2, 1, -1]]),
+                                np.array([[2, 1, 1], [1, 1, 0], [-1, -1, 1]])]
+
+    def tearDown(self):
+        """
+        Teardown method.
+        """
+
+        unittest.TestCase.tearDown(self)
+
+    def testSkeleton(self):
+        """
+        First test to check if the testcase is working with the testing framework.
+        """
+
+        #self.fail("Test if the testcase is working.")
+        self.assertTrue(True)
+
+    def test_niggli_reduce(self):
+        """
+        Test the reduced cell is unique for all the settings of a lattice and the transformations are consistent.
+        """
+
+        crystals = [crystal_system.Triclinic(0.5, 0.6, 0.7, 1.4, 1.5, 1.7),
+                    crystal_system.Monoclinic(0.5, 0.6, 0.7, 1.9),
+                    crystal_system.Hexagonal(0.3, 0.5),
+                    crystal_system.Rhombohedral(0.4, 1.2),
+                    crystal_system.Cubic(0.4)]
+
+        for crystal in crystals:
+            reduced_crystal_ref, _transformation, _inverse_transformation = reduction.niggli_reduce(crystal)
+            self.assertTrue(reduction.is_niggli_reduced(reduced_crystal_ref))
+            self.assertAlmostEqual(crystal.volume_nm3, reduced_crystal_ref.volume_nm3, 12)
+
+            for transformation_ref in self.transformations:
+                skewed_crystal = _skew(crystal, transformation_ref)
+                reduced_crystal, transformation, inverse_transformation = reduction.niggli_reduce(skewed_crystal)
+
+                np.testing.assert_allclose(reduced_crystal_ref.lattice_parameters.astuple(),
+                                           reduced_crystal.lattice_parameters.astuple(), atol=1.0e-9)
+                np.testing.assert_allclose(reduced_crystal.gij_nm2,
+                                           np.dot(np.dot(transformation.T, skewed_crystal.gij_nm2), transformation),
+                                           atol=1.0e-12)
+                np.testing.assert_array_equal(np.eye(3), np.dot(transformation, inverse_transformation))
+                self.assertAlmostEqual(1.0, np.linalg.det(transformation), 10)
+
+        self.assertFalse(reduction.is_niggli_reduced(_skew(crystal_system.Cubic(0.4), self.transformations[1])))
+
+        #self.fail("Test if the testcase is working.")
+
+    def test_reflections(self):
+        """
+        Test the Miller indices of the reflections map between the input and the reduced cells.
+        """
+
+        skewed_crystal = _skew(crystal_system.Orthorhombic(0.3, 0.4, 0.5), self.transformations[3])
+        reduced_crystal, transformation, inverse_transformation = reduction.niggli_reduce(skewed_crystal)
+
+        reflections = reflection.enumerate_reflections(skewed_crystal, 8.0)
+        reflections_reduced = reflection.enumerate_reflections(reduced_crystal, 8.0)
+        self.assertEqual(len(reflections), len(reflections_reduced))
+
+        hkls_reduced = np.dot(reflections["hkl"], transformation)
+        self.assertEqual(set(map(tuple, reflections_reduced["hkl"])), set(map(tuple, hkls_reduced)))
+        np.testing.assert_array_equal(reflections["hkl"], np.dot(hkls_reduced, inverse_transformation))
+
+        #self.fail("Test if the testcase is working.")
+
+
+if __name__ == '__main__':  # pragma: no cover
+    import nose
+
+    nose.runmodule()
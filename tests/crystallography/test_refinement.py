@@ -0,0 +1,202 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. py:currentmodule:: test_refinement
+   :synopsis: Tests for the module :py:mod:`refinement`
+
+.. moduleauthor:: Hendrix Demers <hendrix.demers@mail.mcgill.ca>
+
+Tests for the module :py:mod:`refinement`.
+"""
+
+###############################################################################
+# Copyright 2017 Hendrix Demers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###############################################################################
+
+# Standard library modules.
+import unittest
+
+# Third party modules.
+import numpy as np
+
+# Local modules.
+
+# Project modules.
+import electrondiffraction.crystallography.refinement as refinement
+import electrondiffraction.crystallography.crystal_system as crystal_system
+import electrondiffraction.crystallography.d_spacing as d_spacing
+
+
+# Globals and constants variables.
+
+def _angles_rad(crystal, angle_hkls):
+    g_star_1_nm2 = crystal.g_star_1_nm2
+    hkls1 = angle_hkls[:, 0]
+    hkls2 = angle_hkls[:, 1]
+    p_1_nm2 = np.einsum("ni,ij,nj->n", hkls1, g_star_1_nm2, hkls2)
+    q1_1_nm2 = np.einsum("ni,ij,nj->n", hkls1, g_star_1_nm2, hkls1)
+    q2_1_nm2 = np.einsum("ni,ij,nj->n", hkls2, g_star_1_nm2, hkls2)
+
+    return np.arccos(p_1_nm2 / np.sqrt(q1_1_nm2 * q2_1_nm2))
+
+
+class Test_refinement(unittest.TestCase):
+    """
+    TestCase class for the module `${moduleName}`.
+    """
+
+    def setUp(self):
+        """
+        Setup method.
+        """
+
+        unittest.TestCase.setUp(self)
+
+        self.hkls = np.array([[1, 0, 0], [0, 1, 0], [0, 0, 1], [1, 1, 0], [1, 0, 1], [1, 0, -1], [0, 1, 1],
+                              [1, 1, 1], [2, 0, 1], [1, 1, -2]])
+        self.angle_hkls = np.array([[[1, 0, 0], [0, 0, 1]], [[1, 1, 0], [0, 1, 1]], [[1, 0, 1], [1, 1, -2]]])
+
+    def tearDown(self):
+        """
+        Teardown method.
+        """
+
+        unittest.TestCase.tearDown(self)
+
+    def testSkeleton(self):
+        """
+        First test to check if the testcase is working with the testing framework.
+        """
+
+        #self.fail("Test if the testcase is working.")
+        self.assertTrue(True)
+
+    def test_get_constraint_matrix(self):
+        """
+        Test the free parameters of the crystal systems.
+        """
+
+        self.assertEqual(("a_nm", "c_nm"), refinement.get_free_parameter_names(crystal_system.Hexagonal(0.3, 0.5)))
+        self.assertEqual(("a_nm", "b_nm", "c_nm", "beta_rad"),
+                         refinement.get_free_parameter_names(crystal_system.Monoclinic(0.3, 0.4, 0.5, 1.8)))
+
+        matrix = refinement.get_constraint_matrix(crystal_system.Rhombohedral(0.3, 1.2))
+        np.testing.assert_array_equal([[1, 1, 1, 0, 0, 0], [0, 0, 0, 1, 1, 1]], matrix.T)
+
+        #self.fail("Test if the testcase is working.")
+
+    def test_compute_residuals(self):
+        """
+        Test the analytic Jacobian against central finite differences.
+        """
+
+        parameters = np.array([0.5, 0.6, 0.7, 1.4, 1.5, 1.7])
+        crystal = crystal_system.Triclinic(*parameters)
+        d_nm = d_spacing.d_spacings_nm(crystal, self.hkls) * 1.01
+        angles_rad = _angles_rad(crystal, self.angle_hkls) + 0.01
+
+        residuals, jacobian = refinement.compute_residuals(parameters, self.hkls, d_nm, self.angle_hkls, angles_rad)
+        self.assertEqual((13,), residuals.shape)
+        self.assertEqual((13, 6), jacobian.shape)
+        np.testing.assert_allclose(1.0 / 1.01 - 1.0, residuals[:10])
+        np.testing.assert_allclose(-0.01, residuals[10:])
+
+        step = 1.0e-6
+        for index in range(6):
+            delta = np.zeros(6)
+            delta[index] = step
+            plus, _jacobian = refinement.compute_residuals(parameters + delta, self.hkls, d_nm, self.angle_hkls,
+                                                           angles_rad)
+            minus, _jacobian = refinement.compute_residuals(parameters - delta, self.hkls, d_nm, self.angle_hkls,
+                                                            angles_rad)
+            np.testing.assert_allclose((plus - minus) / (2.0 * step), jacobian[:, index], atol=1.0e-7)
+
+        #self.fail("Test if the testcase is working.")
+
+    def test_refine_hexagonal(self):
+        """
+        Test the recovery of a and c of a hexagonal crystal.
+        """
+
+        expected_crystal = crystal_system.Hexagonal(0.321, 0.521)
+        d_nm = d_spacing.d_spacings_nm(expected_crystal, self.hkls)
+        angles_rad = _angles_rad(expected_crystal, self.angle_hkls)
+
+        result = refinement.refine_lattice_parameters(crystal_system.Hexagonal(0.30, 0.55), self.hkls, d_nm,
+                                                      self.angle_hkls, angles_rad)
+        self.assertTrue(result.converged)
+        np.testing.assert_allclose([0.321, 0.521], result.free_parameters)
+        np.testing.assert_allclose([0.321, 0.321, 0.521, np.pi/2.0, np.pi/2.0, 2.0*np.pi/3.0],
+                                   result.lattice_parameters)
+        np.testing.assert_allclose(0.0, result.residuals, atol=1.0e-12)
+
+        crystal = result.get_crystal()
+        self.assertIsInstance(crystal, crystal_system.Hexagonal)
+        np.testing.assert_allclose(expected_crystal.gij_nm2, crystal.gij_nm2)
+
+        #self.fail("Test if the testcase is working.")
+
+    def test_refine_monoclinic(self):
+        """
+        Test the recovery of a, b, c and beta of a monoclinic crystal from the d-spacings only.
+        """
+
+        expected_crystal = crystal_system.Monoclinic(0.52, 0.61, 0.73, np.deg2rad(104.0))
+        d_nm = d_spacing.d_spacings_nm(expected_crystal, self.hkls)
+
+        crystal = crystal_system.Monoclinic(0.5, 0.6, 0.75, np.deg2rad(100.0))
+        result = refinement.refine_lattice_parameters(crystal, self.hkls, d_nm)
+        self.assertTrue(result.converged)
+        np.testing.assert_allclose([0.52, 0.61, 0.73, np.deg2rad(104.0)], result.free_parameters)
+
+        #self.fail("Test if the testcase is working.")
+
+    def test_batch(self):
+        """
+        Test the refinement of many scan positions at once.
+        """
+
+        crystal = crystal_system.Tetragonal(0.40, 0.60)
+        strains = np.array([[0.0, 0.0], [0.01, -0.005], [-0.02, 0.003]])
+        d_nm = np.array([d_spacing.d_spacings_nm(crystal_system.Tetragonal(0.40 * (1.0 + strain_a),
+                                                                          0.60 * (1.0 + strain_c)), self.hkls)
+                         for strain_a, strain_c in strains])
+        d_nm = np.stack([d_nm, d_nm])
+        noise = np.random.RandomState(0).normal(0.0, 1.0e-4, d_nm.shape)
+
+        result = refinement.refine_lattice_parameters(crystal, self.hkls, d_nm * (1.0 + noise))
+        self.assertEqual((2, 3, 2), result.free_parameters.shape)
+        self.assertEqual((2, 3, 6), result.lattice_parameters.shape)
+        self.assertEqual((2, 3, 2), result.uncertainties.shape)
+        self.assertEqual((2, 3, 10), result.residuals.shape)
+        self.assertTrue(np.all(result.converged))
+
+        np.testing.assert_allclose(np.array([0.40, 0.60]) * (1.0 + strains), result.free_parameters[0], rtol=5.0e-4)
+        np.testing.assert_allclose(np.array([0.40, 0.60]) * (1.0 + strains), result.free_parameters[1], rtol=5.0e-4)
+        self.assertTrue(np.all(result.uncertainties > 0.0))
+        self.assertTrue(np.all(result.uncertainties < 1.0e-4))
+
+        for index in [(0, 0), (1, 2)]:
+            single_result = refinement.refine_lattice_parameters(crystal, self.hkls, d_nm[index] * (1.0 + noise[index]))
+            np.testing.assert_allclose(single_result.free_parameters, result.free_parameters[index])
+
+        #self.fail("Test if the testcase is working.")
+
+
+if __name__ == '__main__':  # pragma: no cover
+    import nose
+
+    nose.runmodule()
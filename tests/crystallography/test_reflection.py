@@ -0,0 +1,155 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. py:currentmodule:: test_reflection
+   :synopsis: Tests for the module :py:mod:`reflection`
+
+.. moduleauthor:: Hendrix Demers <hendrix.demers@mail.mcgill.ca>
+
+Tests for the module :py:mod:`reflection`.
+"""
+
+###############################################################################
+# Copyright 2017 Hendrix Demers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###############################################################################
+
+# Standard library modules.
+import unittest
+
+# Third party modules.
+import numpy as np
+
+# Local modules.
+
+# Project modules.
+import electrondiffraction.crystallography.reflection as reflection
+import electrondiffraction.crystallography.crystal_system as crystal_system
+import electrondiffraction.crystallography.d_spacing as d_spacing
+
+
+# Globals and constants variables.
+
+class Test_reflection(unittest.TestCase):
+    """
+    TestCase class for the module `${moduleName}`.
+    """
+
+    def setUp(self):
+        """
+        Setup method.
+        """
+
+        unittest.TestCase.setUp(self)
+
+    def tearDown(self):
+        """
+        Teardown method.
+        """
+
+        unittest.TestCase.tearDown(self)
+
+    def testSkeleton(self):
+        """
+        First test to check if the testcase is working with the testing framework.
+        """
+
+        #self.fail("Test if the testcase is working.")
+        self.assertTrue(True)
+
+    def test_enumerate_reflections(self):
+        """
+        Test the enumeration matches a brute force search, also for strongly oblique cells.
+        """
+
+        crystals = [crystal_system.Triclinic(0.5, 0.6, 0.7, 0.4, 0.5, 0.6),
+                    crystal_system.Rhombohedral(0.4, 0.3),
+                    crystal_system.Monoclinic(0.5, 0.6, 0.7, 2.5),
+                    crystal_system.Cubic(0.4)]
+        g_max_1_nm = 12.0
+
+        for crystal in crystals:
+            reflections = reflection.enumerate_reflections(crystal, g_max_1_nm)
+
+            indices = np.arange(-30, 31)
+            hs, ks, ls = np.meshgrid(indices, indices, indices, indexing="ij")
+            hkls_ref = np.stack([hs.ravel(), ks.ravel(), ls.ravel()], axis=-1)
+            g_1_nm = d_spacing.g_lengths_1_nm(crystal, hkls_ref)
+            hkls_ref = hkls_ref[(g_1_nm <= g_max_1_nm) & np.any(hkls_ref != 0, axis=-1)]
+
+            self.assertEqual(len(hkls_ref), len(reflections))
+            self.assertEqual(set(map(tuple, hkls_ref)), set(map(tuple, reflections["hkl"])))
+            np.testing.assert_allclose(d_spacing.g_lengths_1_nm(crystal, reflections["hkl"]), reflections["g_1_nm"])
+            np.testing.assert_allclose(1.0 / reflections["g_1_nm"], reflections["d_nm"])
+
+        reflections = reflection.enumerate_reflections(crystal_system.Cubic(0.4), 1.0, include_origin=True)
+        self.assertEqual(1, len(reflections))
+        self.assertEqual((0, 0, 0), tuple(reflections["hkl"][0]))
+
+        #self.fail("Test if the testcase is working.")
+
+    def test_iter_reflections(self):
+        """
+        Test the chunks are bounded in size and cover all the reflections in order.
+        """
+
+        crystal = crystal_system.Hexagonal(0.3, 0.5)
+        reflections = reflection.enumerate_reflections(crystal, 15.0)
+
+        chunks = list(reflection.iter_reflections(crystal, 15.0, chunk_size=100))
+        self.assertTrue(all(len(chunk) <= 100 for chunk in chunks))
+        self.assertTrue(all(len(chunk) == 100 for chunk in chunks[:-1]))
+        self.assertEqual(reflection.REFLECTION_DTYPE, chunks[0].dtype)
+        np.testing.assert_array_equal(reflections["hkl"], np.concatenate(chunks)["hkl"])
+
+        self.assertRaises(ValueError, list, reflection.iter_reflections(crystal, 15.0, chunk_size=0))
+
+        #self.fail("Test if the testcase is working.")
+
+    def test_space_group(self):
+        """
+        Test the systematically absent reflections are dropped, also for the rhombohedral axes.
+        """
+
+        crystal = crystal_system.Cubic(0.4)
+        reflections = reflection.enumerate_reflections(crystal, 10.0)
+        reflections_fcc = reflection.enumerate_reflections(crystal, 10.0, space_group=225)
+        hkls = reflections["hkl"]
+        is_fcc = np.all(hkls % 2 == hkls[:, :1] % 2, axis=-1)
+        np.testing.assert_array_equal(hkls[is_fcc], reflections_fcc["hkl"])
+
+        chunks = list(reflection.iter_reflections(crystal, 10.0, chunk_size=50, space_group=225))
+        self.assertTrue(all(len(chunk) == 50 for chunk in chunks[:-1]))
+
+        # The same lattice on rhombohedral and hexagonal axes has the same allowed reflections.
+        a_nm = 0.5
+        alpha_rad = 0.9
+        rhombohedral = crystal_system.Rhombohedral(a_nm, alpha_rad)
+        hexagonal = crystal_system.Hexagonal(a_nm * np.sqrt(2.0 * (1.0 - np.cos(alpha_rad))),
+                                             a_nm * np.sqrt(3.0 * (1.0 + 2.0 * np.cos(alpha_rad))))
+        for number in [146, 167]:
+            reflections_rhombohedral = reflection.enumerate_reflections(rhombohedral, 12.0, space_group=number)
+            reflections_hexagonal = reflection.enumerate_reflections(hexagonal, 12.0, space_group=number)
+            self.assertEqual(len(reflections_hexagonal), len(reflections_rhombohedral))
+            np.testing.assert_allclose(np.sort(reflections_hexagonal["g_1_nm"]),
+                                       np.sort(reflections_rhombohedral["g_1_nm"]))
+
+        #self.fail("Test if the testcase is working.")
+
+
+if __name__ == '__main__':  # pragma: no cover
+    import nose
+
+    nose.runmodule()
@@ -0,0 +1,198 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. py:currentmodule:: test_reflection_table
+   :synopsis: Tests for the module :py:mod:`reflection_table`
+
+.. moduleauthor:: Hendrix Demers <hendrix.demers@mail.mcgill.ca>
+
+Tests for the module :py:mod:`reflection_table`.
+"""
+
+###############################################################################
+# Copyright 2017 Hendrix Demers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###############################################################################
+
+# Standard library modules.
+import os
+import shutil
+import tempfile
+import unittest
+
+# Third party modules.
+import numpy as np
+
+# Local modules.
+
+# Project modules.
+import electrondiffraction.crystallography.reflection_table as reflection_table
+import electrondiffraction.crystallography.structure_factor as structure_factor
+import electrondiffraction.crystallography.structure as structure
+import electrondiffraction.crystallography.crystal_system as crystal_system
+
+
+# Globals and constants variables.
+
+class Test_reflection_table(unittest.TestCase):
+    """
+    TestCase class for the module `${moduleName}`.
+    """
+
+    def setUp(self):
+        """
+        Setup method.
+        """
+
+        unittest.TestCase.setUp(self)
+
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """
+        Teardown method.
+        """
+
+        unittest.TestCase.tearDown(self)
+
+        shutil.rmtree(self.directory)
+
+    def testSkeleton(self):
+        """
+        First test to check if the testcase is working with the testing framework.
+        """
+
+        #self.fail("Test if the testcase is working.")
+        self.assertTrue(True)
+
+    def test_compute_reflection_table(self):
+        """
+        Test the multiplicities and structure factors of a face centered cubic table.
+        """
+
+        crystal = crystal_system.Cubic(0.4078)
+        positions = [[0.0, 0.0, 0.0], [0.5, 0.5, 0.0], [0.5, 0.0, 0.5], [0.0, 0.5, 0.5]]
+        gold = structure.Structure(crystal, ["Au"] * 4, positions)
+
+        table = reflection_table.compute_reflection_table(gold, 5.0)
+        self.assertEqual(reflection_table.REFLECTION_TABLE_DTYPE, table.dtype)
+        # Families {100}, {110}, {111} and {200}.
+        self.assertEqual(6 + 12 + 8 + 6, len(table))
+        self.assertEqual([6, 8, 12], sorted(set(table["multiplicity"])))
+        np.testing.assert_allclose(structure_factor.compute_structure_factors(gold, table["hkl"]),
+                                   table["structure_factor_nm"])
+
+        table = reflection_table.compute_reflection_table(crystal, 5.0)
+        np.testing.assert_array_equal(1.0, table["structure_factor_nm"])
+
+        #self.fail("Test if the testcase is working.")
+
+    def test_compute_key(self):
+        """
+        Test the key depends on the crystal system, the lattice parameters, the atoms and the cutoff.
+        """
+
+        crystal = crystal_system.Cubic(0.4)
+        key = reflection_table.compute_key(crystal, 10.0)
+
+        self.assertEqual(key, reflection_table.compute_key(crystal_system.Cubic(0.4 + 1.0e-14), 10.0))
+        self.assertNotEqual(key, reflection_table.compute_key(crystal_system.Cubic(0.41), 10.0))
+        self.assertNotEqual(key, reflection_table.compute_key(crystal, 11.0))
+        self.assertNotEqual(key, reflection_table.compute_key(crystal_system.Tetragonal(0.4, 0.4), 10.0))
+
+        iron = structure.Structure(crystal, ["Fe"], [[0.0, 0.0, 0.0]])
+        nickel = structure.Structure(crystal, ["Ni"], [[0.0, 0.0, 0.0]])
+        self.assertNotEqual(key, reflection_table.compute_key(iron, 10.0))
+        self.assertNotEqual(reflection_table.compute_key(iron, 10.0), reflection_table.compute_key(nickel, 10.0))
+
+        version = reflection_table.CACHE_FORMAT_VERSION
+        try:
+            reflection_table.CACHE_FORMAT_VERSION = version + 1
+            self.assertNotEqual(key, reflection_table.compute_key(crystal, 10.0))
+        finally:
+            reflection_table.CACHE_FORMAT_VERSION = version
+
+        #self.fail("Test if the testcase is working.")
+
+    def test_cache(self):
+        """
+        Test the tables are stored, reopened memory-mapped and evicted least recently used first.
+        """
+
+        cache = reflection_table.ReflectionTableCache(self.directory)
+        crystal = crystal_system.Cubic(0.4)
+
+        table = cache.get(crystal, 10.0)
+        self.assertIsInstance(table, np.memmap)
+        self.assertEqual(1, len(cache))
+        self.assertIn(reflection_table.compute_key(crystal, 10.0), cache)
+        np.testing.assert_array_equal(reflection_table.compute_reflection_table(crystal, 10.0), table)
+        self.assertFalse(table.flags.writeable)
+
+        table = cache.get(crystal_system.Cubic(0.4), 10.0)
+        self.assertEqual(1, len(cache))
+        size_bytes = cache.size_bytes
+
+        cache = reflection_table.ReflectionTableCache(self.directory, maximum_size_bytes=int(2.5 * size_bytes))
+        crystal_other = crystal_system.Cubic(0.41)
+        cache.get(crystal_other, 10.0)
+        self.assertEqual(2, len(cache))
+
+        key = reflection_table.compute_key(crystal, 10.0)
+        key_other = reflection_table.compute_key(crystal_other, 10.0)
+        os.utime(os.path.join(self.directory, key + ".npy"), (1000.0, 1000.0))
+        os.utime(os.path.join(self.directory, key_other + ".npy"), (2000.0, 2000.0))
+
+        cache.get(crystal_system.Cubic(0.42), 10.0)
+        self.assertEqual(2, len(cache))
+        self.assertNotIn(key, cache)
+        self.assertIn(key_other, cache)
+
+        cache.clear()
+        self.assertEqual(0, len(cache))
+
+        #self.fail("Test if the testcase is working.")
+
+
+    def test_cache_removed_files(self):
+        """
+        Test the files removed by another process are skipped.
+        """
+
+        cache = reflection_table.ReflectionTableCache(self.directory, maximum_size_bytes=0)
+        crystal = crystal_system.Cubic(0.4)
+        table = cache.get(crystal, 10.0)
+        size_bytes = cache.size_bytes
+
+        list_files = cache._list_files
+        missing_path = os.path.join(self.directory, "missing.npy")
+        cache._list_files = lambda: list_files() + [missing_path]
+
+        self.assertEqual(size_bytes, cache.size_bytes)
+        cache.evict()
+        cache.clear()
+        self.assertEqual(0, cache.size_bytes)
+
+        # The table is evicted as soon as it is written, it is reopened or computed again.
+        np.testing.assert_array_equal(table, cache.get(crystal, 10.0))
+        np.testing.assert_array_equal(table, cache.get(crystal_system.Cubic(0.4), 10.0))
+
+        #self.fail("Test if the testcase is working.")
+
+
+if __name__ == '__main__':  # pragma: no cover
+    import nose
+
+    nose.runmodule()
@@ -0,0 +1,178 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. py:currentmodule:: test_space_group
+   :synopsis: Tests for the module :py:mod:`space_group`
+
+.. moduleauthor:: Hendrix Demers <hendrix.demers@mail.mcgill.ca>
+
+Tests for the module :py:mod:`space_group`.
+"""
+
+###############################################################################
+# Copyright 2017 Hendrix Demers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###############################################################################
+
+# Standard library modules.
+import unittest
+
+# Third party modules.
+import numpy as np
+
+# Local modules.
+
+# Project modules.
+import electrondiffraction.crystallography.point_group as point_group
+import electrondiffraction.crystallography.space_group as space_group
+
+
+# Globals and constants variables.
+
+_IDENTITY = np.eye(3, dtype=np.int64)
+
+# Generators of the general positions from the International Tables, with the translations in twelfths.
+_GENERATORS = {
+    14: [([[-1, 0, 0], [0, 1, 0], [0, 0, -1]], [0, 6, 6]), (-_IDENTITY, [0, 0, 0])],
+    62: [([[-1, 0, 0], [0, -1, 0], [0, 0, 1]], [6, 0, 6]), ([[-1, 0, 0], [0, 1, 0], [0, 0, -1]], [0, 6, 0]),
+         (-_IDENTITY, [0, 0, 0])],
+    64: [(_IDENTITY, [6, 6, 0]), ([[-1, 0, 0], [0, -1, 0], [0, 0, 1]], [0, 6, 6]),
+         ([[-1, 0, 0], [0, 1, 0], [0, 0, -1]], [0, 6, 6]), (-_IDENTITY, [0, 0, 0])],
+    88: [(_IDENTITY, [6, 6, 6]), ([[-1, 0, 0], [0, -1, 0], [0, 0, 1]], [6, 0, 6]),
+         ([[0, -1, 0], [1, 0, 0], [0, 0, 1]], [9, 3, 3]), (-_IDENTITY, [0, 0, 0])],
+    167: [(_IDENTITY, [8, 4, 4]), ([[0, -1, 0], [1, -1, 0], [0, 0, 1]], [0, 0, 0]),
+          ([[0, 1, 0], [1, 0, 0], [0, 0, -1]], [0, 0, 6]), (-_IDENTITY, [0, 0, 0])],
+    194: [([[0, -1, 0], [1, -1, 0], [0, 0, 1]], [0, 0, 0]), ([[-1, 0, 0], [0, -1, 0], [0, 0, 1]], [0, 0, 6]),
+          ([[0, 1, 0], [1, 0, 0], [0, 0, -1]], [0, 0, 0]), (-_IDENTITY, [0, 0, 0])],
+    227: [(_IDENTITY, [0, 6, 6]), (_IDENTITY, [6, 0, 6]), ([[-1, 0, 0], [0, -1, 0], [0, 0, 1]], [0, 0, 0]),
+          ([[-1, 0, 0], [0, 1, 0], [0, 0, -1]], [0, 0, 0]), ([[0, 0, 1], [1, 0, 0], [0, 1, 0]], [0, 0, 0]),
+          ([[0, 1, 0], [1, 0, 0], [0, 0, -1]], [9, 3, 9]), (-_IDENTITY, [3, 3, 3])],
+    230: [(_IDENTITY, [6, 6, 6]), ([[-1, 0, 0], [0, -1, 0], [0, 0, 1]], [6, 0, 6]),
+          ([[-1, 0, 0], [0, 1, 0], [0, 0, -1]], [0, 6, 6]), ([[0, 0, 1], [1, 0, 0], [0, 1, 0]], [0, 0, 0]),
+          ([[0, 1, 0], [1, 0, 0], [0, 0, -1]], [9, 3, 3]), (-_IDENTITY, [0, 0, 0])],
+}
+
+
+def _generate_operations(generators):
+    generators = [(np.asarray(operation), np.asarray(translation)) for operation, translation in generators]
+    operations = {(_IDENTITY.tobytes(), (0, 0, 0)): (_IDENTITY, np.zeros(3, dtype=np.int64))}
+
+    pending = list(operations.values())
+    while pending:
+        operation1, translation1 = pending.pop()
+        for operation2, translation2 in generators:
+            operation = np.dot(operation1, operation2)
+            translation = (np.dot(operation1, translation2) + translation1) % 12
+            key = (operation.tobytes(), tuple(translation))
+            if key not in operations:
+                operations[key] = (operation, translation)
+                pending.append((operation, translation))
+
+    return list(operations.values())
+
+
+def _is_absent_brute_force(operations, hkls):
+    is_absent = np.zeros(len(hkls), dtype=bool)
+    for operation, translation in operations:
+        is_invariant = np.all(np.dot(hkls, operation) == hkls, axis=-1)
+        is_absent |= is_invariant & (np.dot(hkls, translation) % 12 != 0)
+
+    return is_absent
+
+
+class Test_space_group(unittest.TestCase):
+    """
+    TestCase class for the module `${moduleName}`.
+    """
+
+    def setUp(self):
+        """
+        Setup method.
+        """
+
+        unittest.TestCase.setUp(self)
+
+        indices = np.arange(-8, 9)
+        hs, ks, ls = np.meshgrid(indices, indices, indices, indexing="ij")
+        self.hkls = np.stack([hs.ravel(), ks.ravel(), ls.ravel()], axis=-1)
+
+    def tearDown(self):
+        """
+        Teardown method.
+        """
+
+        unittest.TestCase.tearDown(self)
+
+    def testSkeleton(self):
+        """
+        First test to check if the testcase is working with the testing framework.
+        """
+
+        #self.fail("Test if the testcase is working.")
+        self.assertTrue(True)
+
+    def test_space_groups(self):
+        """
+        Test all the space groups are defined and their absences are invariant under their Laue class.
+        """
+
+        self.assertEqual(230, len(space_group.SPACE_GROUP_SYMBOLS))
+
+        hkls = self.hkls[np.all(np.abs(self.hkls) <= 4, axis=-1)]
+        for number in range(1, 231):
+            group = space_group.get_space_group(number)
+            self.assertEqual(number, group.number)
+
+            is_allowed = group.is_allowed(hkls)
+            self.assertTrue(np.all(is_allowed[np.all(hkls == 0, axis=-1)]))
+            laue_class = point_group.LAUE_CLASS_GENERATORS[group.system_name][group.laue_class]
+            for operation in point_group.generate_group(laue_class):
+                np.testing.assert_array_equal(is_allowed, group.is_allowed(np.dot(hkls, operation)))
+
+        self.assertEqual("P21/c", space_group.get_space_group(14).short_symbol)
+        self.assertEqual("Fd-3m", space_group.get_space_group(227).short_symbol)
+        self.assertIs(space_group.get_space_group(225), space_group.get_space_group(225))
+        self.assertRaises(ValueError, space_group.get_space_group, 0)
+        self.assertRaises(ValueError, space_group.get_space_group, 231)
+
+        #self.fail("Test if the testcase is working.")
+
+    def test_is_allowed(self):
+        """
+        Test the absences match the ones of the general positions of the International Tables.
+        """
+
+        for number, generators in sorted(_GENERATORS.items()):
+            is_absent_ref = _is_absent_brute_force(_generate_operations(generators), self.hkls)
+            is_allowed = space_group.get_space_group(number).is_allowed(self.hkls)
+            np.testing.assert_array_equal(~is_absent_ref, is_allowed, err_msg="Space group {}".format(number))
+
+        group = space_group.get_space_group(227)
+        np.testing.assert_array_equal([True, False, True, True, False, True],
+                                      group.is_allowed([[1, 1, 1], [2, 0, 0], [2, 2, 0], [3, 1, 1], [4, 2, 0],
+                                                        [4, 0, 0]]))
+        np.testing.assert_array_equal([[1, 1, 1], [2, 2, 0]], group.filter([[1, 1, 1], [2, 0, 0], [2, 2, 0]]))
+
+        group = space_group.get_space_group(194)
+        np.testing.assert_array_equal([False, True, True, False],
+                                      group.is_allowed([[0, 0, 1], [0, 0, 2], [1, 0, 1], [1, 1, 1]]))
+
+        #self.fail("Test if the testcase is working.")
+
+
+if __name__ == '__main__':  # pragma: no cover
+    import nose
+
+    nose.runmodule()
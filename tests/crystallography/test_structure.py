@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. py:currentmodule:: test_structure
+   :synopsis: Tests for the module :py:mod:`structure`
+
+.. moduleauthor:: Hendrix Demers <hendrix.demers@mail.mcgill.ca>
+
+Tests for the module :py:mod:`structure`.
+"""
+
+###############################################################################
+# Copyright 2017 Hendrix Demers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###############################################################################
+
+# Standard library modules.
+import unittest
+
+# Third party modules.
+import numpy as np
+
+# Local modules.
+
+# Project modules.
+import electrondiffraction.crystallography.structure as structure
+import electrondiffraction.crystallography.crystal_system as crystal_system
+
+
+# Globals and constants variables.
+
+class Test_structure(unittest.TestCase):
+    """
+    TestCase class for the module `${moduleName}`.
+    """
+
+    def setUp(self):
+        """
+        Setup method.
+        """
+
+        unittest.TestCase.setUp(self)
+
+    def tearDown(self):
+        """
+        Teardown method.
+        """
+
+        unittest.TestCase.tearDown(self)
+
+    def testSkeleton(self):
+        """
+        First test to check if the testcase is working with the testing framework.
+        """
+
+        #self.fail("Test if the testcase is working.")
+        self.assertTrue(True)
+
+    def test_init(self):
+        """
+        Test the default occupancies and Debye-Waller factors and the unique elements.
+        """
+
+        crystal = crystal_system.Cubic(0.564)
+        rock_salt = structure.Structure(crystal, ["Mg", "O"], [[0.0, 0.0, 0.0], [0.5, 0.5, 0.5]],
+                                        debye_waller_B_nm2=0.005)
+
+        self.assertEqual(2, len(rock_salt))
+        np.testing.assert_array_equal([1.0, 1.0], rock_salt.occupancies)
+        np.testing.assert_array_equal([0.005, 0.005], rock_salt.debye_waller_B_nm2)
+        elements, element_ids = rock_salt.elements
+        self.assertEqual(["Mg", "O"], elements)
+        np.testing.assert_array_equal([0, 1], element_ids)
+
+        self.assertRaises(ValueError, structure.Structure, crystal, ["Mg", "O"], [[0.0, 0.0, 0.0]])
+
+        #self.fail("Test if the testcase is working.")
+
+
+if __name__ == '__main__':  # pragma: no cover
+    import nose
+
+    nose.runmodule()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. py:currentmodule:: test_structure_factor
+   :synopsis: Tests for the module :py:mod:`structure_factor`
+
+.. moduleauthor:: Hendrix Demers <hendrix.demers@mail.mcgill.ca>
+
+Tests for the module :py:mod:`structure_factor`.
+"""
+
+###############################################################################
+# Copyright 2017 Hendrix Demers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###############################################################################
+
+# Standard library modules.
+import unittest
+
+# Third party modules.
+import numpy as np
+
+# Local modules.
+
+# Project modules.
+import electrondiffraction.crystallography.structure_factor as structure_factor
+import electrondiffraction.crystallography.scattering_factor as scattering_factor
+import electrondiffraction.crystallography.structure as structure
+import electrondiffraction.crystallography.crystal_system as crystal_system
+
+
+# Globals and constants variables.
+
+class Test_structure_factor(unittest.TestCase):
+    """
+    TestCase class for the module `${moduleName}`.
+    """
+
+    def setUp(self):
+        """
+        Setup method.
+        """
+
+        unittest.TestCase.setUp(self)
+
+    def tearDown(self):
+        """
+        Teardown method.
+        """
+
+        unittest.TestCase.tearDown(self)
+
+    def testSkeleton(self):
+        """
+        First test to check if the testcase is working with the testing framework.
+        """
+
+        #self.fail("Test if the testcase is working.")
+        self.assertTrue(True)
+
+    def test_compute_structure_factors(self):
+        """
+        Test the face centered cubic selection rule and the structure factor of the allowed reflections.
+        """
+
+        crystal = crystal_system.Cubic(0.4078)
+        positions = [[0.0, 0.0, 0.0], [0.5, 0.5, 0.0], [0.5, 0.0, 0.5], [0.0, 0.5, 0.5]]
+        gold = structure.Structure(crystal, ["Au"] * 4, positions)
+        hkls = np.array([[1, 1, 1], [1, 0, 0], [2, 0, 0], [2, 1, 0], [2, 2, 0], [0, 0, 0]])
+
+        factors_nm = structure_factor.compute_structure_factors(gold, hkls)
+        np.testing.assert_allclose(0.0, factors_nm[[1, 3]], atol=1.0e-12)
+
+        g_1_nm = np.sqrt(np.sum(hkls**2, axis=-1)) / 0.4078
+        f_nm = scattering_factor.electron_scattering_factors_nm(["Au"], g_1_nm)[:, 0]
+        np.testing.assert_allclose(4.0 * f_nm[[0, 2, 4, 5]], factors_nm[[0, 2, 4, 5]].real)
+        np.testing.assert_allclose(0.0, factors_nm.imag, atol=1.0e-12)
+
+        np.testing.assert_allclose(factors_nm, gold.structure_factors(hkls))
+
+        #self.fail("Test if the testcase is working.")
+
+    def test_chunks_debye_waller(self):
+        """
+        Test the chunked computation and the Debye-Waller factor against a direct sum over atoms.
+        """
+
+        crystal = crystal_system.Hexagonal(0.3209, 0.5211)
+        magnesium = structure.Structure(crystal, ["Mg", "Mg"], [[1.0/3.0, 2.0/3.0, 0.25], [2.0/3.0, 1.0/3.0, 0.75]],
+                                        occupancies=[1.0, 0.8], debye_waller_B_nm2=[0.01, 0.02])
+        hkls = np.array([[h, k, l] for h in range(-2, 3) for k in range(-2, 3) for l in range(-2, 3)])
+
+        factors_nm = structure_factor.compute_structure_factors(magnesium, hkls, chunk_size=7)
+
+        g_1_nm = np.sqrt(np.einsum("ni,ij,nj->n", hkls, crystal.g_star_1_nm2, hkls))
+        f_nm = scattering_factor.electron_scattering_factors_nm(["Mg"], g_1_nm)[:, 0]
+        factors_ref_nm = np.zeros(len(hkls), dtype=complex)
+        for position, occupancy, b_nm2 in zip(magnesium.positions, magnesium.occupancies,
+                                             magnesium.debye_waller_B_nm2):
+            factors_ref_nm += occupancy * f_nm * np.exp(-b_nm2 * g_1_nm**2 / 4.0) * \
+                np.exp(2.0j * np.pi * np.dot(hkls, position))
+        np.testing.assert_allclose(factors_ref_nm, factors_nm, atol=1.0e-12)
+
+        self.assertRaises(ValueError, structure_factor.compute_structure_factors, magnesium, hkls, 0)
+        self.assertRaises(ValueError, structure_factor.compute_structure_factors, magnesium, hkls[:, :2])
+
+        #self.fail("Test if the testcase is working.")
+
+
+if __name__ == '__main__':  # pragma: no cover
+    import nose
+
+    nose.runmodule()
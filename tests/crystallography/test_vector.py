@@ -189,6 +189,179 @@ class Test_vector(unittest.TestCase):
         #self.fail("Test if the testcase is working.")
 
 
+    def test_dot_products(self):
+        """
+        Test the batched dot products against the single vector function.
+        """
+
+        crystal = crystal_system.Triclinic(0.5, 0.6, 0.7, 1.2, 1.4, 1.7)
+        vectors_p = np.array([[1.0, 2.0, 0.0], [3.0, 1.0, 1.0], [-1.0, 0.0, 2.0]])
+        vectors_q = np.array([[3.0, 1.0, 1.0], [0.0, 0.0, 1.0], [1.0, 1.0, 1.0]])
+
+        magnitudes_nm = vector.dot_products(crystal, vectors_p, vectors_q)
+        self.assertEqual((3,), magnitudes_nm.shape)
+        for vector_p, vector_q, magnitude_nm in zip(vectors_p, vectors_q, magnitudes_nm):
+            self.assertAlmostEqual(vector.dot_product(crystal, vector_p, vector_q), magnitude_nm, 10)
+
+        magnitudes_nm = vector.dot_products(crystal, vectors_p, vectors_q[0])
+        for vector_p, magnitude_nm in zip(vectors_p, magnitudes_nm):
+            self.assertAlmostEqual(vector.dot_product(crystal, vector_p, vectors_q[0]), magnitude_nm, 10)
+
+        magnitudes_nm = vector.dot_products_pairwise(crystal, vectors_p, vectors_q[:2])
+        self.assertEqual((3, 2), magnitudes_nm.shape)
+        for i, vector_p in enumerate(vectors_p):
+            for j, vector_q in enumerate(vectors_q[:2]):
+                self.assertAlmostEqual(vector.dot_product(crystal, vector_p, vector_q), magnitudes_nm[i, j], 10)
+
+        self.assertRaises(ValueError, vector.dot_products, crystal, vectors_p[:, :2], vectors_q)
+
+        #self.fail("Test if the testcase is working.")
+
+    def test_lengths_distances(self):
+        """
+        Test the batched lengths and distances against the single vector functions.
+        """
+
+        crystal = crystal_system.Tetragonal(0.5, 1.0)
+        points_p = np.array([[0.5, 0.0, 0.5], [1.0, 2.0, 0.0], [0.0, 0.0, 0.0]])
+        points_q = np.array([[0.5, 0.5, 0.0], [3.0, 1.0, 1.0]])
+
+        lengths_nm = vector.lengths(crystal, points_p - points_q[0])
+        self.assertAlmostEqual(np.sqrt(5.0)/4.0, lengths_nm[0], 5)
+        for point_p, length_nm in zip(points_p, lengths_nm):
+            self.assertAlmostEqual(vector.length(crystal, point_p - points_q[0]), length_nm, 10)
+
+        distances_nm = vector.distances(crystal, points_p, points_p)
+        np.testing.assert_allclose(vector.lengths(crystal, points_p), distances_nm)
+
+        distances_nm = vector.distances_points(crystal, points_p[:2], points_q)
+        for point_p, point_q, distance_nm in zip(points_p, points_q, distances_nm):
+            self.assertAlmostEqual(vector.distance_points(crystal, point_p, point_q), distance_nm, 10)
+
+        distances_nm = vector.distances_points_pairwise(crystal, points_p, points_q)
+        self.assertEqual((3, 2), distances_nm.shape)
+        for i, point_p in enumerate(points_p):
+            for j, point_q in enumerate(points_q):
+                self.assertAlmostEqual(vector.distance_points(crystal, point_p, point_q), distances_nm[i, j], 10)
+
+        crystal = crystal_system.Cubic(0.4)
+        points_p = np.array([[10.0, 10.0, 10.0]])
+        points_q = points_p + 1.0e-6
+        distances_nm = vector.distances_points_pairwise(crystal, points_p, points_q)
+        self.assertAlmostEqual(1.0, distances_nm[0, 0] / vector.distances_points(crystal, points_p, points_q)[0], 6)
+        self.assertAlmostEqual(0.4 * np.sqrt(3.0) * (points_q - points_p)[0, 0], distances_nm[0, 0], 15)
+
+        distances_nm = vector.distances_points_pairwise(crystal, np.zeros((0, 3)), points_q)
+        self.assertEqual((0, 1), distances_nm.shape)
+
+        #self.fail("Test if the testcase is working.")
+
+    def test_angles(self):
+        """
+        Test the batched angles against the single vector functions.
+        """
+
+        crystal = crystal_system.Tetragonal(0.5, 1.0)
+        vectors_p = np.array([[1.0, 2.0, 0.0], [3.0, 1.0, 1.0], [1.0, 1.0, 1.0]])
+        vectors_q = np.array([[3.0, 1.0, 1.0], [1.0, 2.0, 0.0], [2.0, 2.0, 2.0]])
+        angle_ref_deg = 53.300774799510123
+
+        angles_deg = np.degrees(vector.angles_rad(crystal, vectors_p, vectors_q))
+        self.assertAlmostEqual(angle_ref_deg, angles_deg[0], 6)
+        self.assertAlmostEqual(angle_ref_deg, angles_deg[1], 6)
+        self.assertAlmostEqual(0.0, angles_deg[2], 6)
+
+        angles_rad = vector.angles_rad_pairwise(crystal, vectors_p, vectors_q)
+        self.assertEqual((3, 3), angles_rad.shape)
+        self.assertFalse(np.any(np.isnan(angles_rad)))
+        for i, vector_p in enumerate(vectors_p):
+            for j, vector_q in enumerate(vectors_q[:2]):
+                self.assertAlmostEqual(vector.angle_rad(crystal, vector_p, vector_q), angles_rad[i, j], 6)
+
+        #self.fail("Test if the testcase is working.")
+
+    def test_gram_matrix(self):
+        """
+        Test the dot products, lengths and angles of all the pairs of vectors.
+        """
+
+        crystal = crystal_system.Triclinic(0.5, 0.6, 0.7, 1.2, 1.4, 1.7)
+        vectors = np.array([[1.0, 2.0, 0.0], [3.0, 1.0, 1.0], [-1.0, 0.0, 2.0], [2.0, 4.0, 0.0]])
+
+        products, lengths, angles_rad = vector.gram_matrix(crystal, vectors)
+        self.assertEqual((4, 4), products.shape)
+        self.assertEqual((4,), lengths.shape)
+        np.testing.assert_allclose(vector.dot_products_pairwise(crystal, vectors, vectors), products)
+        np.testing.assert_allclose(vector.lengths(crystal, vectors), lengths)
+        np.testing.assert_allclose(vector.angles_rad_pairwise(crystal, vectors, vectors), angles_rad)
+        self.assertAlmostEqual(0.0, angles_rad[0, 3], 6)
+        self.assertAlmostEqual(vector.angle_rad(crystal, vectors[1], vectors[2]), angles_rad[1, 2], 10)
+
+        products, lengths, angles_rad = vector.gram_matrix(crystal, vectors, reciprocal=True)
+        g_star_1_nm2 = np.linalg.inv(crystal.gij_nm2)
+        np.testing.assert_allclose(np.dot(np.dot(vectors, g_star_1_nm2), vectors.T), products)
+        self.assertAlmostEqual(np.sqrt(np.dot(vectors[2], np.dot(g_star_1_nm2, vectors[2]))), lengths[2], 10)
+
+        #self.fail("Test if the testcase is working.")
+
+    def test_cartesian_conversions(self):
+        """
+        Test the conversions between crystal and Cartesian coordinates preserve lengths and dot products.
+        """
+
+        crystal = crystal_system.Monoclinic(0.5, 0.6, 0.7, 1.9)
+        positions = np.array([[0.1, 0.2, 0.3], [1.0, -2.0, 0.5], [0.0, 0.0, 1.0]])
+
+        positions_nm = vector.fractional_to_cartesian_nm(crystal, positions)
+        self.assertEqual((3, 3), positions_nm.shape)
+        np.testing.assert_allclose(vector.lengths(crystal, positions), np.sqrt(np.sum(positions_nm**2, axis=-1)))
+        np.testing.assert_allclose(positions, vector.cartesian_to_fractional(crystal, positions_nm), atol=1.0e-12)
+        np.testing.assert_allclose(positions[1], vector.cartesian_to_fractional(crystal, positions_nm[1]))
+
+        hkls = np.array([[1, 0, 0], [1, 1, 1], [2, -1, 3]])
+        g_1_nm = vector.miller_to_cartesian_1_nm(crystal, hkls)
+        g_star_1_nm2 = np.linalg.inv(crystal.gij_nm2)
+        np.testing.assert_allclose(np.dot(np.dot(hkls, g_star_1_nm2), hkls.T), np.dot(g_1_nm, g_1_nm.T))
+        np.testing.assert_allclose(hkls, vector.cartesian_to_miller(crystal, g_1_nm), atol=1.0e-12)
+
+        # A reciprocal vector (hkl) is perpendicular to the directions [uvw] in its plane, hu + kv + lw = 0.
+        self.assertAlmostEqual(0.0, np.dot(g_1_nm[1], vector.fractional_to_cartesian_nm(crystal, [1, -1, 0])), 12)
+
+        self.assertRaises(ValueError, vector.fractional_to_cartesian_nm, crystal, [1.0, 2.0])
+
+        #self.fail("Test if the testcase is working.")
+
+    def test_scalar_fast_path(self):
+        """
+        Test the scalar fast path of single 3-vectors agrees with the NumPy path.
+        """
+
+        crystal = crystal_system.Triclinic(0.5, 0.6, 0.7, 1.2, 1.4, 1.7)
+        random_state = np.random.RandomState(0)
+
+        for vector_p, vector_q in random_state.uniform(-5.0, 5.0, (20, 2, 3)):
+            dot_product_ref = np.dot(vector_p, np.dot(crystal.gij_nm2, vector_q))
+            dot_product = vector.dot_product(crystal, vector_p, vector_q)
+            self.assertIsInstance(dot_product, float)
+            self.assertAlmostEqual(dot_product_ref, dot_product, delta=1.0e-13 * abs(dot_product_ref) + 1.0e-15)
+            self.assertAlmostEqual(vector.dot_product(crystal, list(vector_p), tuple(vector_q)), dot_product, 14)
+
+            angle_ref_rad = vector.angles_rad(crystal, vector_p, vector_q)
+            self.assertAlmostEqual(angle_ref_rad, vector.angle_rad(crystal, vector_p, vector_q), 12)
+            self.assertAlmostEqual(np.degrees(angle_ref_rad), crystal.angle_deg(vector_p, vector_q), 10)
+            self.assertAlmostEqual(vector.lengths(crystal, vector_p), crystal.length_nm(vector_p), 12)
+
+        # Rounding must not give a cosine above one, a NaN or a math domain error for parallel vectors.
+        self.assertAlmostEqual(0.0, vector.angle_rad(crystal, [1, 1, 1], [2, 2, 2]), 6)
+        self.assertAlmostEqual(0.0, crystal.angle_deg([1, 1, 1], [1, 1, 1]), 5)
+
+        # Other shapes use the NumPy path.
+        vectors = np.array([[1.0, 2.0, 0.0], [3.0, 1.0, 1.0]])
+        np.testing.assert_allclose(vector.dot_products(crystal, vectors, vectors),
+                                   np.diagonal(vector.dot_product(crystal, vectors, vectors)))
+
+        #self.fail("Test if the testcase is working.")
+
 if __name__ == '__main__':  # pragma: no cover
     import nose
 
@@ -0,0 +1,127 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. py:currentmodule:: test_batch
+   :synopsis: Tests for the module :py:mod:`batch`
+
+.. moduleauthor:: Hendrix Demers <hendrix.demers@mail.mcgill.ca>
+
+Tests for the module :py:mod:`batch`.
+"""
+
+###############################################################################
+# Copyright 2017 Hendrix Demers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###############################################################################
+
+# Standard library modules.
+import unittest
+
+# Third party modules.
+import numpy as np
+
+# Local modules.
+
+# Project modules.
+import electrondiffraction.indexing.batch as batch
+import electrondiffraction.indexing.spot_pair_index as spot_pair_index
+import electrondiffraction.crystallography.crystal_system as crystal_system
+import electrondiffraction.simulation.zone_axis as zone_axis
+
+
+# Globals and constants variables.
+
+class Test_batch(unittest.TestCase):
+    """
+    TestCase class for the module `${moduleName}`.
+    """
+
+    def setUp(self):
+        """
+        Setup method.
+        """
+
+        unittest.TestCase.setUp(self)
+
+    def tearDown(self):
+        """
+        Teardown method.
+        """
+
+        unittest.TestCase.tearDown(self)
+
+    def testSkeleton(self):
+        """
+        First test to check if the testcase is working with the testing framework.
+        """
+
+        #self.fail("Test if the testcase is working.")
+        self.assertTrue(True)
+
+    def _create_patterns(self):
+        crystal = crystal_system.Cubic(0.4)
+        simulator = zone_axis.ZoneAxisSimulator(crystal, 12.0)
+        zone_axes = [[0, 0, 1], [1, 1, 0], [1, 1, 1], [1, 1, 2], [0, 1, 2]] * 3
+        patterns = [simulator.simulate(zone_axis_ref, 200.0e3, 50.0).positions_1_nm for zone_axis_ref in zone_axes]
+
+        return crystal, zone_axes, patterns
+
+    def test_index_patterns_serial(self):
+        """
+        Test the indexing of a list of patterns in this process with two phases.
+        """
+
+        crystal, zone_axes, patterns = self._create_patterns()
+        other_phase = spot_pair_index.SpotPairIndex(crystal_system.Hexagonal(0.3, 0.5), 12.0)
+
+        results = list(batch.index_patterns(iter(patterns), [crystal, other_phase], g_max_1_nm=12.0, max_workers=1))
+
+        self.assertEqual(list(range(len(patterns))), [pattern_id for pattern_id, _solutions in results])
+        for (pattern_id, solutions), zone_axis_ref, spots_1_nm in zip(results, zone_axes, patterns):
+            self.assertEqual(0, solutions["phase"][0])
+            self.assertEqual(len(spots_1_nm), solutions["number_matched"][0])
+            np.testing.assert_array_equal(sorted(zone_axis_ref), sorted(np.abs(solutions["zone_axis"][0])))
+
+        self.assertRaises(ValueError, list, batch.index_patterns(patterns, crystal))
+
+        #self.fail("Test if the testcase is working.")
+
+    def test_index_patterns_pool(self):
+        """
+        Test the process pool gives the same results as the serial indexing, in order or as completed.
+        """
+
+        crystal, _zone_axes, patterns = self._create_patterns()
+        index = spot_pair_index.SpotPairIndex(crystal, 12.0)
+
+        results_ref = dict(batch.index_patterns(patterns, index, max_workers=1))
+
+        results = list(batch.index_patterns(patterns, index, max_workers=2, chunk_size=2))
+        self.assertEqual(list(range(len(patterns))), [pattern_id for pattern_id, _solutions in results])
+        for pattern_id, solutions in results:
+            np.testing.assert_array_equal(results_ref[pattern_id], solutions)
+
+        results = dict(batch.index_patterns(patterns, index, max_workers=2, ordered=False, chunk_size=3))
+        self.assertEqual(set(results_ref), set(results))
+        for pattern_id, solutions in results.items():
+            np.testing.assert_array_equal(results_ref[pattern_id], solutions)
+
+        #self.fail("Test if the testcase is working.")
+
+
+if __name__ == '__main__':  # pragma: no cover
+    import nose
+
+    nose.runmodule()
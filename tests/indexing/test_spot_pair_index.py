@@ -0,0 +1,206 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. py:currentmodule:: test_spot_pair_index
+   :synopsis: Tests for the module :py:mod:`spot_pair_index`
+
+.. moduleauthor:: Hendrix Demers <hendrix.demers@mail.mcgill.ca>
+
+Tests for the module :py:mod:`spot_pair_index`.
+"""
+
+###############################################################################
+# Copyright 2017 Hendrix Demers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###############################################################################
+
+# Standard library modules.
+import unittest
+
+# Third party modules.
+import numpy as np
+
+# Local modules.
+
+# Project modules.
+import electrondiffraction.indexing.spot_pair_index as spot_pair_index
+import electrondiffraction.crystallography.crystal_system as crystal_system
+import electrondiffraction.simulation.zone_axis as zone_axis
+
+
+# Globals and constants variables.
+
+class Test_spot_pair_index(unittest.TestCase):
+    """
+    TestCase class for the module `${moduleName}`.
+    """
+
+    def setUp(self):
+        """
+        Setup method.
+        """
+
+        unittest.TestCase.setUp(self)
+
+    def tearDown(self):
+        """
+        Teardown method.
+        """
+
+        unittest.TestCase.tearDown(self)
+
+    def testSkeleton(self):
+        """
+        First test to check if the testcase is working with the testing framework.
+        """
+
+        #self.fail("Test if the testcase is working.")
+        self.assertTrue(True)
+
+    def test_zone_axes(self):
+        """
+        Test the zone axis common to two reflections.
+        """
+
+        np.testing.assert_array_equal([0, 0, 1], spot_pair_index.zone_axes([1, 0, 0], [0, 1, 0]))
+        np.testing.assert_array_equal([[1, -1, 1], [0, 0, 1]],
+                                      spot_pair_index.zone_axes([[2, 2, 0], [2, 0, 0]], [[0, 2, 2], [0, 2, 0]]))
+
+        #self.fail("Test if the testcase is working.")
+
+    def test_index_spots(self):
+        """
+        Test the indexing of a pair of spots of a cubic [001] zone axis pattern.
+        """
+
+        crystal = crystal_system.Cubic(0.4)
+        index = spot_pair_index.SpotPairIndex(crystal, 12.0)
+
+        # Spots (200) and (020) of the [001] zone axis.
+        solutions = index.index_spots([5.0, 0.0], [0.0, 5.0])
+        self.assertEqual(24, len(solutions))
+        for solution in solutions:
+            self.assertEqual(2, np.sum(np.abs(solution["hkl1"])))
+            self.assertEqual(2, np.sum(np.abs(solution["hkl2"])))
+            self.assertEqual(0, np.dot(solution["hkl1"], solution["hkl2"]))
+            self.assertEqual(1, np.sum(np.abs(solution["zone_axis"])))
+        self.assertAlmostEqual(0.0, solutions["error"][0], 10)
+
+        # Spots (200) and (220), the first spot is the longest.
+        solutions = index.index_spots([5.0*np.sqrt(2.0), 0.0], [3.54, 3.54])
+        self.assertTrue(len(solutions) > 0)
+        for solution in solutions:
+            self.assertEqual(4, np.sum(np.abs(solution["hkl1"])))
+            self.assertEqual(2, np.sum(np.abs(solution["hkl2"])))
+        self.assertTrue(np.all(np.diff(solutions["error"]) >= 0.0))
+
+        solutions = index.index_spots([5.0, 0.0], [0.0, 6.0])
+        self.assertEqual(0, len(solutions))
+
+        #self.fail("Test if the testcase is working.")
+
+    def test_query(self):
+        """
+        Test the query against the angles computed with the crystal system.
+        """
+
+        crystal = crystal_system.Hexagonal(0.3, 0.5)
+        index = spot_pair_index.SpotPairIndex(crystal, 10.0)
+        self.assertTrue(np.all(np.diff(index.g1_1_nm) >= 0.0))
+        self.assertTrue(np.all(index.g1_1_nm <= index.g2_1_nm))
+
+        g1_1_nm = crystal.a_star_1_nm
+        g2_1_nm = 2.0
+        angle_rad = np.pi/2.0
+        solutions = index.query(g2_1_nm, g1_1_nm, angle_rad, length_tolerance=1.0e-6, angle_tolerance_rad=1.0e-6)
+        self.assertTrue(len(solutions) > 0)
+        for solution in solutions:
+            self.assertEqual(1, abs(solution["hkl1"][2]))
+            self.assertEqual(0, solution["hkl2"][2])
+            self.assertEqual(0, solution["zone_axis"][2])
+
+        #self.fail("Test if the testcase is working.")
+
+
+    def test_index_pattern(self):
+        """
+        Test the indexing of simulated patterns recovers the zone axis and matches all the spots.
+        """
+
+        crystal = crystal_system.Tetragonal(0.3, 0.5)
+        index = spot_pair_index.SpotPairIndex(crystal, 12.0)
+        simulator = zone_axis.ZoneAxisSimulator(crystal, 12.0)
+
+        for zone_axis_ref in ([0, 0, 1], [1, 0, 0], [1, 1, 0], [1, 0, 1]):
+            pattern = simulator.simulate(zone_axis_ref, 200.0e3, 50.0)
+            solutions = index.index_pattern(pattern.positions_1_nm)
+
+            self.assertTrue(len(solutions) > 0)
+            best = solutions[0]
+            self.assertEqual(len(pattern), best["number_matched"])
+            self.assertEqual(0, np.dot(best["zone_axis"], best["hkl1"]))
+            self.assertEqual(0, np.dot(best["zone_axis"], best["hkl2"]))
+            # [uvw] and [vuw] are equivalent in the tetragonal system.
+            self.assertEqual(zone_axis_ref[2], abs(best["zone_axis"][2]))
+            self.assertEqual(sorted(zone_axis_ref[:2]), sorted(np.abs(best["zone_axis"][:2])))
+
+        self.assertEqual(0, len(index.index_pattern([[5.0, 0.0]])))
+        self.assertEqual(0, len(index.index_pattern([[5.0, 0.0], [10.0, 0.0]])))
+
+        #self.fail("Test if the testcase is working.")
+
+    def test_query_equal_lengths(self):
+        """
+        Test both assignments of a measured pair of nearly equal lengths are found.
+        """
+
+        crystal = crystal_system.Orthorhombic(0.300, 0.302, 0.5)
+        index = spot_pair_index.SpotPairIndex(crystal, 8.0)
+
+        g_1_nm = 0.5 * (crystal.a_star_1_nm + crystal.b_star_1_nm)
+        for g1_1_nm, g2_1_nm in [(g_1_nm, g_1_nm), (g_1_nm * 1.001, g_1_nm), (g_1_nm, g_1_nm * 1.001)]:
+            solutions = index.query(g1_1_nm, g2_1_nm, np.pi/2.0)
+            assignments = set((tuple(np.abs(solution["hkl1"])), tuple(np.abs(solution["hkl2"])))
+                              for solution in solutions)
+            self.assertEqual({((1, 0, 0), (0, 1, 0)), ((0, 1, 0), (1, 0, 0))}, assignments)
+            self.assertEqual(8, len(solutions))
+
+        #self.fail("Test if the testcase is working.")
+
+    def test_chunk_size(self):
+        """
+        Test the index built in small chunks is the same.
+        """
+
+        crystal = crystal_system.Hexagonal(0.3, 0.5)
+        index = spot_pair_index.SpotPairIndex(crystal, 8.0)
+        chunked_index = spot_pair_index.SpotPairIndex(crystal, 8.0, chunk_size=7)
+
+        self.assertEqual(len(index), len(chunked_index))
+        number_reflections = len(index.hkls)
+        self.assertTrue(len(index) < number_reflections * (number_reflections - 1) // 2 + 1)
+        np.testing.assert_array_equal(index.g1_1_nm, chunked_index.g1_1_nm)
+        np.testing.assert_array_equal(index.g2_1_nm, chunked_index.g2_1_nm)
+        np.testing.assert_allclose(index.angles_rad, chunked_index.angles_rad)
+
+        self.assertRaises(ValueError, spot_pair_index.SpotPairIndex, crystal, 8.0, 0)
+
+        #self.fail("Test if the testcase is working.")
+
+
+if __name__ == '__main__':  # pragma: no cover
+    import nose
+
+    nose.runmodule()
@@ -0,0 +1,234 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. py:currentmodule:: test_ring_pattern
+   :synopsis: Tests for the module :py:mod:`ring_pattern`
+
+.. moduleauthor:: Hendrix Demers <hendrix.demers@mail.mcgill.ca>
+
+Tests for the module :py:mod:`ring_pattern`.
+"""
+
+###############################################################################
+# Copyright 2017 Hendrix Demers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###############################################################################
+
+# Standard library modules.
+import unittest
+
+# Third party modules.
+import numpy as np
+
+# Local modules.
+
+# Project modules.
+import electrondiffraction.simulation.ring_pattern as ring_pattern
+import electrondiffraction.crystallography.crystal_system as crystal_system
+import electrondiffraction.crystallography.structure as structure
+import electrondiffraction.crystallography.reflection as reflection
+
+
+# Globals and constants variables.
+
+class Test_ring_pattern(unittest.TestCase):
+    """
+    TestCase class for the module `${moduleName}`.
+    """
+
+    def setUp(self):
+        """
+        Setup method.
+        """
+
+        unittest.TestCase.setUp(self)
+
+        crystal = crystal_system.Cubic(0.40786)
+        gold = structure.Structure(crystal, ["Au"] * 4, [[0.0, 0.0, 0.0], [0.5, 0.5, 0.0], [0.5, 0.0, 0.5],
+                                                         [0.0, 0.5, 0.5]])
+        self.gold = ring_pattern.PowderPhase(crystal, 12.0, gold.structure_factors, space_group=225, name="Au")
+        self.magnesium = ring_pattern.PowderPhase(crystal_system.Hexagonal(0.3209, 0.5211), 12.0, space_group=194)
+
+        self.q_1_nm = np.linspace(1.0, 11.0, 2001)
+
+    def tearDown(self):
+        """
+        Teardown method.
+        """
+
+        unittest.TestCase.tearDown(self)
+
+    def testSkeleton(self):
+        """
+        First test to check if the testcase is working with the testing framework.
+        """
+
+        #self.fail("Test if the testcase is working.")
+        self.assertTrue(True)
+
+    def test_powder_phase(self):
+        """
+        Test the ring families of a face centered cubic phase.
+        """
+
+        np.testing.assert_array_equal([[1, 1, 1], [2, 0, 0], [2, 2, 0], [3, 1, 1]], self.gold.hkls[:4])
+        np.testing.assert_array_equal([8, 6, 12, 24], self.gold.multiplicities[:4])
+        np.testing.assert_allclose(np.sqrt(3.0) / 0.40786, self.gold.g_1_nm[0])
+        np.testing.assert_allclose(self.gold.multiplicities * self.gold.structure_factors2 / self.gold.g_1_nm,
+                                   self.gold.intensities)
+
+        #self.fail("Test if the testcase is working.")
+
+    def test_powder_phase_laue_class(self):
+        """
+        Test the rings of a structure of the m-3 Laue class, FeSi in P2_13, sum the intensities of its reflections.
+        """
+
+        crystal = crystal_system.Cubic(0.4489)
+
+        def positions(x):
+            return [[x, x, x], [0.5 - x, -x, 0.5 + x], [-x, 0.5 + x, 0.5 - x], [0.5 + x, 0.5 - x, -x]]
+
+        iron_silicide = structure.Structure(crystal, ["Fe"] * 4 + ["Si"] * 4, positions(0.1358) + positions(0.844))
+        phase = ring_pattern.PowderPhase(crystal, 8.0, iron_silicide.structure_factors, space_group=198)
+
+        reflections = reflection.enumerate_reflections(crystal, 8.0, space_group=198)
+        intensities = np.abs(iron_silicide.structure_factors(reflections["hkl"]))**2 / reflections["g_1_nm"]
+        g_keys = np.round(reflections["g_1_nm"], 6)
+        family_g_keys = np.round(phase.g_1_nm, 6)
+        for g_key in np.unique(g_keys):
+            self.assertAlmostEqual(np.sum(intensities[g_keys == g_key]),
+                                   np.sum(phase.intensities[family_g_keys == g_key]), 8)
+
+        # {210} and {120} are different families of m-3 with different structure factors.
+        index_210 = np.flatnonzero(np.all(phase.hkls == [2, 1, 0], axis=-1))
+        index_120 = np.flatnonzero(np.all(phase.hkls == [2, 0, 1], axis=-1))
+        self.assertEqual(1, len(index_210))
+        self.assertEqual(1, len(index_120))
+        self.assertEqual(12, phase.multiplicities[index_210[0]])
+        self.assertEqual(12, phase.multiplicities[index_120[0]])
+        self.assertTrue(abs(phase.structure_factors2[index_210[0]] - phase.structure_factors2[index_120[0]]) >
+                        0.1 * phase.structure_factors2[index_210[0]])
+
+        holohedral_phase = ring_pattern.PowderPhase(crystal, 8.0, iron_silicide.structure_factors, space_group=198,
+                                                    laue_class="m-3m")
+        self.assertTrue(len(holohedral_phase) < len(phase))
+
+        #self.fail("Test if the testcase is working.")
+
+    def test_simulate_basis(self):
+        """
+        Test the profiles against the sum of the peak shapes of every ring.
+        """
+
+        simulator = ring_pattern.RingPatternSimulator([self.gold, self.magnesium])
+        fwhm_1_nm = 0.08
+        profiles = simulator.simulate_basis(self.q_1_nm, fwhm_1_nm, eta=0.4)
+        self.assertEqual((2, len(self.q_1_nm)), profiles.shape)
+
+        for phase, profile in zip(simulator.phases, profiles):
+            expected = np.sum(phase.intensities[:, np.newaxis] *
+                              ring_pattern.peak_shape(self.q_1_nm - phase.g_1_nm[:, np.newaxis], fwhm_1_nm, 0.4),
+                              axis=0)
+            np.testing.assert_allclose(expected, profile, atol=5.0e-3 * expected.max())
+
+        index = np.argmin(np.abs(self.q_1_nm - self.gold.g_1_nm[0]))
+        self.assertEqual(index, np.argmax(profiles[0, :index + 50]))
+
+        #self.fail("Test if the testcase is working.")
+
+    def test_scales(self):
+        """
+        Test the rings move with the lattice dilation of each phase.
+        """
+
+        simulator = ring_pattern.RingPatternSimulator([self.gold, self.magnesium])
+        profiles = simulator.simulate_basis(self.q_1_nm, 0.05, scales=[1.02, 1.0])
+
+        strained = ring_pattern.RingPatternSimulator(ring_pattern.PowderPhase(
+            crystal_system.Cubic(0.40786 * 1.02), 12.0, lambda hkls: np.sqrt(
+                self.gold.structure_factors2[0]) * np.ones(len(hkls)), space_group=225))
+        q_111_1_nm = np.sqrt(3.0) / (0.40786 * 1.02)
+        index = np.argmin(np.abs(self.q_1_nm - q_111_1_nm))
+        self.assertEqual(index, np.argmax(profiles[0, :index + 50]))
+        self.assertEqual(index, np.argmax(strained.simulate_basis(self.q_1_nm, 0.05)[0, :index + 50]))
+
+        unstrained = simulator.simulate_basis(self.q_1_nm, 0.05)
+        np.testing.assert_allclose(unstrained[1], profiles[1])
+
+        #self.fail("Test if the testcase is working.")
+
+    def test_non_uniform_grid(self):
+        """
+        Test a non-uniform grid is sampled from the uniform profile.
+        """
+
+        simulator = ring_pattern.RingPatternSimulator(self.gold)
+        q_1_nm = np.sort(np.random.RandomState(0).uniform(1.0, 11.0, 500))
+        q_1_nm = np.concatenate([q_1_nm, self.q_1_nm])
+        q_1_nm = np.unique(q_1_nm)
+
+        profile = simulator.simulate(q_1_nm, 0.08)
+        expected = np.sum(self.gold.intensities[:, np.newaxis] *
+                          ring_pattern.peak_shape(q_1_nm - self.gold.g_1_nm[:, np.newaxis], 0.08), axis=0)
+        np.testing.assert_allclose(expected, profile, atol=5.0e-3 * expected.max())
+
+        # One tiny step does not refine the uniform grid of the profiles.
+        q_1_nm = np.sort(np.concatenate([self.q_1_nm, [5.0 + 1.0e-9]]))
+        self.assertAlmostEqual(0.08 / ring_pattern.SAMPLES_PER_FWHM, ring_pattern._get_grid_step(q_1_nm, 0.08))
+        self.assertAlmostEqual(self.q_1_nm[1] - self.q_1_nm[0], ring_pattern._get_grid_step(self.q_1_nm, 0.08))
+        profile = simulator.simulate(q_1_nm, 0.08)
+        expected = np.sum(self.gold.intensities[:, np.newaxis] *
+                          ring_pattern.peak_shape(q_1_nm - self.gold.g_1_nm[:, np.newaxis], 0.08), axis=0)
+        np.testing.assert_allclose(expected, profile, atol=5.0e-3 * expected.max())
+
+        self.assertRaises(ValueError, simulator.simulate, q_1_nm[::-1], 0.08)
+        self.assertRaises(ValueError, simulator.simulate, q_1_nm, 0.0)
+
+        #self.fail("Test if the testcase is working.")
+
+    def test_fit_phase_fractions(self):
+        """
+        Test the phase fractions of a mixture are recovered.
+        """
+
+        simulator = ring_pattern.RingPatternSimulator([self.gold, self.magnesium])
+        profile = simulator.simulate(self.q_1_nm, 0.06, fractions=[0.25, 0.75], eta=0.2)
+        np.testing.assert_allclose(0.5 * np.sum(simulator.simulate_basis(self.q_1_nm, 0.06), axis=0),
+                                   simulator.simulate(self.q_1_nm, 0.06))
+
+        fractions, scale = simulator.fit_phase_fractions(self.q_1_nm, 3.0 * profile, 0.06, eta=0.2)
+        np.testing.assert_allclose([0.25, 0.75], fractions)
+        self.assertAlmostEqual(3.0, scale)
+
+        # The unconstrained least-squares solution has a negative magnesium fraction.
+        basis = simulator.simulate_basis(self.q_1_nm, 0.06)
+        profile = basis[0] - 0.2 * basis[1]
+        self.assertTrue(np.linalg.lstsq(basis.T, profile, rcond=None)[0][1] < 0.0)
+        fractions, scale = simulator.fit_phase_fractions(self.q_1_nm, profile, 0.06)
+        np.testing.assert_allclose([1.0, 0.0], fractions)
+        self.assertTrue(scale > 0.0)
+
+        fractions, scale = simulator.fit_phase_fractions(self.q_1_nm, -profile, 0.06)
+        np.testing.assert_array_equal([0.0, 0.0], fractions)
+        self.assertEqual(0.0, scale)
+
+        #self.fail("Test if the testcase is working.")
+
+
+if __name__ == '__main__':  # pragma: no cover
+    import nose
+
+    nose.runmodule()
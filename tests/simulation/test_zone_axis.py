@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. py:currentmodule:: test_zone_axis
+   :synopsis: Tests for the module :py:mod:`zone_axis`
+
+.. moduleauthor:: Hendrix Demers <hendrix.demers@mail.mcgill.ca>
+
+Tests for the module :py:mod:`zone_axis`.
+"""
+
+###############################################################################
+# Copyright 2017 Hendrix Demers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###############################################################################
+
+# Standard library modules.
+import unittest
+
+# Third party modules.
+import numpy as np
+
+# Local modules.
+
+# Project modules.
+import electrondiffraction.simulation.zone_axis as zone_axis
+import electrondiffraction.crystallography.crystal_system as crystal_system
+
+
+# Globals and constants variables.
+
+class Test_zone_axis(unittest.TestCase):
+    """
+    TestCase class for the module `${moduleName}`.
+    """
+
+    def setUp(self):
+        """
+        Setup method.
+        """
+
+        unittest.TestCase.setUp(self)
+
+    def tearDown(self):
+        """
+        Teardown method.
+        """
+
+        unittest.TestCase.tearDown(self)
+
+    def testSkeleton(self):
+        """
+        First test to check if the testcase is working with the testing framework.
+        """
+
+        #self.fail("Test if the testcase is working.")
+        self.assertTrue(True)
+
+    def test_simulate(self):
+        """
+        Test the spots of cubic zone axis patterns lie in the zero order Laue zone.
+        """
+
+        crystal = crystal_system.Cubic(0.4)
+        simulator = zone_axis.ZoneAxisSimulator(crystal, 15.0)
+
+        pattern = simulator.simulate([0, 0, 1], 200.0e3, 50.0)
+        self.assertTrue(len(pattern) > 0)
+        np.testing.assert_array_equal(0, pattern.hkls[:, 2])
+        lengths_1_nm = np.sqrt(np.sum(pattern.positions_1_nm**2, axis=-1))
+        np.testing.assert_allclose(np.sqrt(np.sum(pattern.hkls**2, axis=-1)) / 0.4, lengths_1_nm)
+        self.assertTrue(np.all(np.abs(pattern.excitation_errors_1_nm) <= 2.0 / 50.0))
+
+        strongest = pattern.hkls[np.argmax(pattern.intensities)]
+        self.assertEqual(1, np.sum(np.abs(strongest)))
+
+        pattern = simulator.simulate([1, 1, 1], 200.0e3, 50.0)
+        np.testing.assert_array_equal(0, np.sum(pattern.hkls, axis=-1))
+
+        #self.fail("Test if the testcase is working.")
+
+    def test_intensities(self):
+        """
+        Test the kinematical intensity of one reflection with the shape factor of the foil.
+        """
+
+        crystal = crystal_system.Tetragonal(0.5, 1.0)
+        simulator = zone_axis.ZoneAxisSimulator(crystal, 10.0, structure_factors=lambda hkls: 2.0 * np.ones(len(hkls)))
+        thickness_nm = 30.0
+
+        pattern = simulator.simulate([0, 0, 1], 300.0e3, thickness_nm, excitation_error_max_1_nm=1.0)
+        index = np.flatnonzero(np.all(pattern.hkls == [2, 0, 0], axis=-1))[0]
+
+        k_1_nm = 1.0 / 0.00196875
+        g_1_nm = 2.0 / 0.5
+        s_1_nm = -g_1_nm**2 / (2.0 * k_1_nm)
+        self.assertAlmostEqual(s_1_nm, pattern.excitation_errors_1_nm[index], 6)
+
+        intensity_ref = 4.0 * (np.sin(np.pi * thickness_nm * s_1_nm) / (np.pi * s_1_nm))**2
+        self.assertAlmostEqual(1.0, pattern.intensities[index] / intensity_ref, 4)
+
+        #self.fail("Test if the testcase is working.")
+
+
+if __name__ == '__main__':  # pragma: no cover
+    import nose
+
+    nose.runmodule()
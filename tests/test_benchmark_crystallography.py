@@ -0,0 +1,156 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. py:currentmodule:: test_benchmark_crystallography
+   :synopsis: Tests for the module :py:mod:`benchmark_crystallography`
+
+.. moduleauthor:: Hendrix Demers <hendrix.demers@mail.mcgill.ca>
+
+Tests for the module :py:mod:`benchmark_crystallography`.
+"""
+
+###############################################################################
+# Copyright 2017 Hendrix Demers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###############################################################################
+
+# Standard library modules.
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+# Third party modules.
+
+# Local modules.
+
+# Project modules.
+import benchmarks.benchmark_crystallography as benchmark_crystallography
+
+
+# Globals and constants variables.
+
+class Test_benchmark_crystallography(unittest.TestCase):
+    """
+    TestCase class for the module `${moduleName}`.
+    """
+
+    def setUp(self):
+        """
+        Setup method.
+        """
+
+        unittest.TestCase.setUp(self)
+
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """
+        Teardown method.
+        """
+
+        unittest.TestCase.tearDown(self)
+
+        shutil.rmtree(self.directory)
+
+    def testSkeleton(self):
+        """
+        First test to check if the testcase is working with the testing framework.
+        """
+
+        #self.fail("Test if the testcase is working.")
+        self.assertTrue(True)
+
+    def test_compare_results(self):
+        """
+        Test the regressions are the benchmarks slower than the baseline by more than the threshold.
+        """
+
+        baseline_results = [{"name": "a", "crystal": "cubic", "size": 10, "time_s": 1.0},
+                            {"name": "b", "crystal": "cubic", "size": 10, "time_s": 1.0},
+                            {"name": "c", "crystal": "cubic", "size": 10, "time_s": 0.0}]
+        results = [{"name": "a", "crystal": "cubic", "size": 10, "time_s": 1.2},
+                   {"name": "b", "crystal": "cubic", "size": 10, "time_s": 1.3},
+                   {"name": "b", "crystal": "cubic", "size": 100, "time_s": 9.0},
+                   {"name": "c", "crystal": "cubic", "size": 10, "time_s": 1.0}]
+
+        regressions = benchmark_crystallography.compare_results(results, baseline_results, threshold=0.25)
+        self.assertEqual(1, len(regressions))
+        result, ratio = regressions[0]
+        self.assertIs(results[1], result)
+        self.assertAlmostEqual(1.3, ratio)
+
+        self.assertEqual(2, len(benchmark_crystallography.compare_results(results, baseline_results, threshold=0.1)))
+
+        #self.fail("Test if the testcase is working.")
+
+    def test_baseline(self):
+        """
+        Test the script saves a baseline and fails when slower than the baseline.
+        """
+
+        baseline_path = os.path.join(self.directory, "baseline.json")
+        arguments = ["--crystal", "cubic", "--max-size", "10", "--filter", "gram_matrix", "--repeat", "1"]
+
+        self.assertEqual(0, benchmark_crystallography.main(arguments + ["--save-baseline", baseline_path]))
+        with open(baseline_path) as json_file:
+            results = json.load(json_file)["results"]
+        self.assertEqual([1, 10], [result["size"] for result in results])
+        self.assertEqual([1, 100], [result["items"] for result in results])
+        for result in results:
+            self.assertAlmostEqual(result["time_s"] / result["items"], result["time_per_item_s"])
+
+        for result in results:
+            result["time_s"] *= 1000.0
+        with open(baseline_path, "w") as json_file:
+            json.dump({"results": results}, json_file)
+        self.assertEqual(0, benchmark_crystallography.main(arguments + ["--baseline", baseline_path]))
+
+        for result in results:
+            result["time_s"] *= 1.0e-9
+        with open(baseline_path, "w") as json_file:
+            json.dump({"results": results}, json_file)
+        self.assertEqual(1, benchmark_crystallography.main(arguments + ["--baseline", baseline_path]))
+
+        #self.fail("Test if the testcase is working.")
+
+    def test_bounded_sizes(self):
+        """
+        Test the pairwise and Gram benchmarks are not run above their maximum size.
+        """
+
+        random_state = benchmark_crystallography.np.random.RandomState(0)
+        crystal = benchmark_crystallography.CRYSTALS["cubic"]()
+
+        size = benchmark_crystallography.GRAM_MAXIMUM_SIZE
+        benchmarks = benchmark_crystallography._batch_benchmarks(crystal, size, random_state)
+        self.assertEqual(size * size, benchmarks["vector.gram_matrix"][1])
+        self.assertEqual(size * benchmark_crystallography.PAIRWISE_COLUMNS,
+                         benchmarks["vector.dot_products_pairwise"][1])
+
+        benchmarks = benchmark_crystallography._batch_benchmarks(
+            crystal, benchmark_crystallography.PAIRWISE_MAXIMUM_SIZE + 1, random_state)
+        self.assertNotIn("vector.gram_matrix", benchmarks)
+        self.assertNotIn("vector.dot_products_pairwise", benchmarks)
+        self.assertIn("vector.dot_products", benchmarks)
+
+        #self.fail("Test if the testcase is working.")
+
+
+if __name__ == '__main__':  # pragma: no cover
+    import nose
+
+    nose.runmodule()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. py:currentmodule:: test_electron_optics
+   :synopsis: Tests for the module :py:mod:`electron_optics`
+
+.. moduleauthor:: Hendrix Demers <hendrix.demers@mail.mcgill.ca>
+
+Tests for the module :py:mod:`electron_optics`.
+"""
+
+###############################################################################
+# Copyright 2017 Hendrix Demers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###############################################################################
+
+# Standard library modules.
+import unittest
+
+# Third party modules.
+import numpy as np
+
+# Local modules.
+
+# Project modules.
+import electrondiffraction.electron_optics as electron_optics
+import electrondiffraction.crystallography.crystal_system as crystal_system
+
+
+# Globals and constants variables.
+
+class Test_electron_optics(unittest.TestCase):
+    """
+    TestCase class for the module `${moduleName}`.
+    """
+
+    def setUp(self):
+        """
+        Setup method.
+        """
+
+        unittest.TestCase.setUp(self)
+
+    def tearDown(self):
+        """
+        Teardown method.
+        """
+
+        unittest.TestCase.tearDown(self)
+
+    def testSkeleton(self):
+        """
+        First test to check if the testcase is working with the testing framework.
+        """
+
+        #self.fail("Test if the testcase is working.")
+        self.assertTrue(True)
+
+    def test_relativistic_wavelength_nm(self):
+        """
+        Test the relativistic wavelength against the values of Williams and Carter (2009), table 1.1.
+        """
+
+        self.assertAlmostEqual(0.00370, electron_optics.relativistic_wavelength_nm(100.0e3), 5)
+        self.assertAlmostEqual(0.00251, electron_optics.relativistic_wavelength_nm(200.0e3), 5)
+        self.assertAlmostEqual(0.00197, electron_optics.relativistic_wavelength_nm(300.0e3), 5)
+
+        wavelengths_nm = electron_optics.relativistic_wavelength_nm([100.0e3, 200.0e3, 300.0e3])
+        self.assertEqual((3,), wavelengths_nm.shape)
+        self.assertAlmostEqual(0.00251, wavelengths_nm[1], 5)
+
+        #self.fail("Test if the testcase is working.")
+
+    def test_interaction_constant_rad_V_nm(self):
+        """
+        Test the interaction constant against the values of Kirkland (2010), table 5.1.
+        """
+
+        self.assertAlmostEqual(1.0 + 200.0 / 511.0, electron_optics.relativistic_factor(200.0e3), 3)
+
+        sigmas_rad_V_nm = electron_optics.interaction_constant_rad_V_nm([100.0e3, 200.0e3, 300.0e3])
+        np.testing.assert_allclose([0.00924, 0.00729, 0.00653], sigmas_rad_V_nm, rtol=1.0e-3)
+
+        #self.fail("Test if the testcase is working.")
+
+    def test_compute_bragg_table(self):
+        """
+        Test the scattering angles follow Bragg's law and the tables are cached per cell.
+        """
+
+        electron_optics.clear_bragg_table_cache()
+        crystal = crystal_system.Cubic(0.40782)
+        voltages_V = [80.0e3, 200.0e3, 300.0e3]
+
+        reflections, two_thetas_rad = electron_optics.compute_bragg_table(crystal, 10.0, voltages_V, space_group=225)
+        self.assertEqual((3, len(reflections)), two_thetas_rad.shape)
+        self.assertFalse(reflections.flags.writeable)
+
+        wavelengths_nm = electron_optics.relativistic_wavelength_nm(voltages_V)
+        np.testing.assert_allclose(np.broadcast_to(wavelengths_nm[:, np.newaxis], two_thetas_rad.shape),
+                                   2.0 * reflections["d_nm"] * np.sin(two_thetas_rad / 2.0))
+        np.testing.assert_allclose(two_thetas_rad, electron_optics.two_theta_rad(reflections["g_1_nm"], voltages_V))
+
+        reflections_cached, two_theta_rad = electron_optics.compute_bragg_table(crystal_system.Cubic(0.40782), 10.0,
+                                                                                200.0e3, space_group=225)
+        self.assertIs(reflections, reflections_cached)
+        np.testing.assert_array_equal(two_thetas_rad[1], two_theta_rad)
+        self.assertEqual(1, electron_optics._get_reflections.cache_info().currsize)
+        self.assertEqual(3, electron_optics._get_wavelength_nm.cache_info().currsize)
+        self.assertEqual(1, electron_optics._get_wavelength_nm.cache_info().hits)
+
+        reflections_other, _two_theta_rad = electron_optics.compute_bragg_table(crystal_system.Cubic(0.5), 10.0,
+                                                                                200.0e3, space_group=225)
+        self.assertIsNot(reflections, reflections_other)
+
+        for index in range(electron_optics.BRAGG_TABLE_CACHE_SIZE + 2):
+            electron_optics.compute_bragg_table(crystal_system.Cubic(0.4 + 0.01 * index), 5.0, 200.0e3)
+        self.assertEqual(electron_optics.BRAGG_TABLE_CACHE_SIZE, electron_optics._get_reflections.cache_info().currsize)
+
+        #self.fail("Test if the testcase is working.")
+
+
+if __name__ == '__main__':  # pragma: no cover
+    import nose
+
+    nose.runmodule()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. py:currentmodule:: test_instrumentation
+   :synopsis: Tests for the module :py:mod:`instrumentation`
+
+.. moduleauthor:: Hendrix Demers <hendrix.demers@mail.mcgill.ca>
+
+Tests for the module :py:mod:`instrumentation`.
+"""
+
+###############################################################################
+# Copyright 2017 Hendrix Demers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###############################################################################
+
+# Standard library modules.
+import time
+import unittest
+
+# Third party modules.
+import numpy as np
+
+# Local modules.
+
+# Project modules.
+import electrondiffraction.instrumentation as instrumentation
+import electrondiffraction.crystallography.crystal_system as crystal_system
+import electrondiffraction.crystallography.vector as vector
+
+
+# Globals and constants variables.
+
+class Test_instrumentation(unittest.TestCase):
+    """
+    TestCase class for the module `${moduleName}`.
+    """
+
+    def setUp(self):
+        """
+        Setup method.
+        """
+
+        unittest.TestCase.setUp(self)
+
+    def tearDown(self):
+        """
+        Teardown method.
+        """
+
+        unittest.TestCase.tearDown(self)
+
+    def testSkeleton(self):
+        """
+        First test to check if the testcase is working with the testing framework.
+        """
+
+        #self.fail("Test if the testcase is working.")
+        self.assertTrue(True)
+
+    def test_instrument(self):
+        """
+        Test the counts of the tensor constructions, angle evaluations and vector calls per crystal.
+        """
+
+        crystal = crystal_system.Tetragonal(0.5, 1.0)
+        other_crystal = crystal_system.Cubic(0.4)
+        vector_p = np.array([1.0, 2.0, 0.0])
+        vector_q = np.array([3.0, 1.0, 1.0])
+
+        crystal.angle_deg(vector_p, vector_q)
+        self.assertFalse(instrumentation.is_enabled())
+
+        events = []
+        with instrumentation.instrument(callback=lambda *event: events.append(event)) as statistics:
+            self.assertTrue(instrumentation.is_enabled())
+            crystal.update_lattice_parameters(c_nm=2.0)
+            crystal.angle_deg(vector_p, vector_q)
+            vector.angle_rad(crystal, vector_p, vector_q)
+            vector.lengths(other_crystal, [vector_p, vector_q])
+
+        self.assertFalse(instrumentation.is_enabled())
+        self.assertEqual(1, statistics.count(name="CrystalSystem.gij_nm2", crystal=crystal))
+        self.assertEqual(1, statistics.count(category=instrumentation.CATEGORY_TENSOR, crystal=crystal))
+        self.assertEqual(1, statistics.count(name="CrystalSystem.angle_deg"))
+        self.assertEqual(2, statistics.count(category=instrumentation.CATEGORY_ANGLE))
+        self.assertEqual(1, statistics.count(name="angle_rad"))
+        self.assertEqual(2, statistics.count(name="length"))
+        self.assertEqual(1, statistics.count(name="dot_products", crystal=other_crystal))
+        self.assertEqual(0, statistics.count(name="dot_products", crystal=crystal))
+        self.assertEqual(sum(statistics.counts.values()), len(events))
+        self.assertTrue(all(time_s >= 0.0 for time_s in statistics.times_s.values()))
+
+        summary = statistics.summary()
+        self.assertIn("CrystalSystem.angle_deg", summary)
+        self.assertIn("Tetragonal@", summary)
+
+        statistics.reset()
+        self.assertEqual(0, statistics.count())
+
+        #self.fail("Test if the testcase is working.")
+
+
+    def test_disabled_functions(self):
+        """
+        Test the plain functions are called while the instrumentation is disabled and the times are self times.
+        """
+
+        crystal = crystal_system.Tetragonal(0.5, 1.0)
+        vectors = np.array([[1.0, 2.0, 0.0], [3.0, 1.0, 1.0]])
+
+        plain_functions = (vector.angle2_rad, vector.gram_matrix, crystal_system.CrystalSystem.angle_deg)
+        for function in plain_functions:
+            self.assertFalse(hasattr(function, "__wrapped__"))
+
+        with instrumentation.instrument() as statistics:
+            self.assertIs(vector.gram_matrix, vector.angle2_rad.__wrapped__.__globals__["gram_matrix"])
+            self.assertTrue(hasattr(vector.gram_matrix, "__wrapped__"))
+            self.assertTrue(hasattr(crystal_system.CrystalSystem.angle_deg, "__wrapped__"))
+
+            start_s = time.perf_counter()
+            for _index in range(100):
+                vector.angle2_rad(crystal, vectors[0], vectors[1])
+            elapsed_s = time.perf_counter() - start_s
+
+        self.assertEqual(100, statistics.count(name="angle2_rad"))
+        self.assertEqual(100, statistics.count(name="gram_matrix"))
+        self.assertLessEqual(sum(statistics.times_s.values()), elapsed_s)
+
+        self.assertEqual(plain_functions,
+                         (vector.angle2_rad, vector.gram_matrix, crystal_system.CrystalSystem.angle_deg))
+
+        #self.fail("Test if the testcase is working.")
+
+
+if __name__ == '__main__':  # pragma: no cover
+    import nose
+
+    nose.runmodule()